@@ -0,0 +1,82 @@
+"""Benchmark of the bytes written per edit of a composer draft
+
+Usage:
+    python benchmarks/bench_draft_storage.py [number of elements] [number of edits]
+
+Compares the size written per edit when the full schema is stored (session), when the full schema is compressed,
+and when only the operations are written with a compressed checkpoint every COMPOSER_DRAFT_CHECKPOINT_INTERVAL
+edits (ComposeDraft).
+"""
+import pickle
+import sys
+import zlib
+
+from bson import BSON
+
+from core_composer_app.settings import COMPOSER_DRAFT_CHECKPOINT_INTERVAL, COMPOSER_DRAFT_COMPRESSION_LEVEL
+from core_composer_app.utils import compression as compression_utils
+from core_composer_app.utils import operations as operations_utils
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+SEQUENCE_XPATH = 'xs:element/xs:complexType/xs:sequence'
+
+
+def _build_schema(nb_elements):
+    """Return a schema with a sequence of elements.
+
+    Args:
+        nb_elements:
+
+    Returns:
+
+    """
+    elements = ''.join("<xs:element name='element{0}' type='xs:string' minOccurs='0'>"
+                       "<xs:annotation><xs:documentation>Element {0} of the schema</xs:documentation>"
+                       "</xs:annotation></xs:element>".format(index) for index in range(nb_elements))
+    return "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'><xs:element name='root'><xs:complexType>" \
+           "<xs:sequence>{}</xs:sequence></xs:complexType></xs:element></xs:schema>".format(elements)
+
+
+def run(nb_elements=1000, nb_edits=100):
+    """Run the benchmark.
+
+    Args:
+        nb_elements:
+        nb_edits:
+
+    Returns:
+
+    """
+    xsd_tree = XSDTree.build_tree(_build_schema(nb_elements))
+    session_bytes = 0
+    compressed_bytes = 0
+    operation_log_bytes = 0
+
+    for edit in range(nb_edits):
+        operation = {'action': operations_utils.RENAME,
+                     'xpath': '{}/xs:element[{}]'.format(SEQUENCE_XPATH, edit % nb_elements + 1),
+                     'newName': 'renamed{}'.format(edit)}
+        xsd_tree = operations_utils.apply_operation(xsd_tree, operation)
+        xsd_string = XSDTree.tostring(xsd_tree)
+
+        # full schema pickled in the session
+        session_bytes += len(pickle.dumps({'newXmlTemplateCompose': xsd_string}, pickle.HIGHEST_PROTOCOL))
+        # full schema compressed
+        compressed_bytes += len(compression_utils.compress(xsd_string))
+        # operation pushed to the log, checkpoint every COMPOSER_DRAFT_CHECKPOINT_INTERVAL edits
+        operation_log_bytes += len(BSON.encode({'$push': {'operations': [operation]}}))
+        if (edit + 1) % COMPOSER_DRAFT_CHECKPOINT_INTERVAL == 0:
+            operation_log_bytes += len(compression_utils.compress(xsd_string))
+
+    xsd_size = len(XSDTree.tostring(xsd_tree))
+    print('Schema: {} elements, {} bytes, zlib level {} ratio {:.1f}x'.format(
+        nb_elements, xsd_size, COMPOSER_DRAFT_COMPRESSION_LEVEL,
+        float(xsd_size) / len(zlib.compress(XSDTree.tostring(xsd_tree), COMPOSER_DRAFT_COMPRESSION_LEVEL or 6))))
+    print('Bytes written per edit, over {} edits:'.format(nb_edits))
+    print('  full schema in session:         {:>10.0f}'.format(float(session_bytes) / nb_edits))
+    print('  compressed full schema:         {:>10.0f}'.format(float(compressed_bytes) / nb_edits))
+    print('  operation log and checkpoints:  {:>10.0f}'.format(float(operation_log_bytes) / nb_edits))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,92 @@
+"""Benchmark of the listing of the types that are not in a bucket
+
+Usage:
+    python benchmarks/bench_no_buckets_types.py [number of buckets] [number of types] [mongodb uri]
+
+Requires a MongoDB server: the benchmark database is created, then dropped. Compares the previous listing
+(dereferencing the types of every bucket, then testing the membership of each global type in a list) with
+get_no_buckets_types (indexed query on the buckets stored in the type version managers).
+"""
+import random
+import sys
+import timeit
+
+from mongoengine import connect
+from mongoengine.connection import get_db
+
+from core_composer_app.components.bucket.models import Bucket
+from core_composer_app.components.type_version_manager import api as type_version_manager_api
+from core_composer_app.components.type_version_manager.models import TypeVersionManager
+
+TYPES_PER_BUCKET = 20
+
+
+def _get_no_buckets_types_by_dereference():
+    """Previous implementation of get_no_buckets_types.
+
+    Returns:
+
+    """
+    bucket_types = []
+    for bucket in Bucket.get_all():
+        bucket_types += bucket.types
+
+    return [type_version_manager for type_version_manager in TypeVersionManager.get_global_version_managers()
+            if type_version_manager not in bucket_types]
+
+
+def _populate(nb_buckets, nb_types):
+    """Insert the types and the buckets.
+
+    Args:
+        nb_buckets:
+        nb_types:
+
+    Returns:
+
+    """
+    version_managers = TypeVersionManager.objects.insert([
+        TypeVersionManager(title='type{}'.format(index), user=None, versions=[], disabled_versions=[],
+                           current=None, is_disabled=False)
+        for index in range(nb_types)
+    ])
+    buckets = Bucket.objects.insert([
+        Bucket(label='bucket{}'.format(index), color='#{:06X}'.format(index),
+               types=random.sample(version_managers, min(TYPES_PER_BUCKET, nb_types)))
+        for index in range(nb_buckets)
+    ])
+    # reverse index, maintained by the bucket api
+    TypeVersionManager.set_bucket_types(dict((bucket.id, [version_manager.id for version_manager in bucket.types])
+                                             for bucket in buckets))
+
+
+def run(nb_buckets=500, nb_types=5000, uri='mongodb://localhost/composer_benchmark'):
+    """Run the benchmark.
+
+    Args:
+        nb_buckets:
+        nb_types:
+        uri:
+
+    Returns:
+
+    """
+    connect(host=uri)
+    db = get_db()
+    try:
+        _populate(nb_buckets, nb_types)
+
+        previous_time = timeit.timeit(_get_no_buckets_types_by_dereference, number=1)
+        current_time = timeit.timeit(lambda: list(type_version_manager_api.get_no_buckets_types()), number=1)
+
+        print('{} buckets of {} types, {} types'.format(nb_buckets, TYPES_PER_BUCKET, nb_types))
+        print('Time to list the types without bucket (ms):')
+        print('  dereference buckets, list membership:  {:>10.1f}'.format(previous_time * 1000))
+        print('  indexed buckets, projected query:      {:>10.1f}'.format(current_time * 1000))
+    finally:
+        db.client.drop_database(db.name)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run(*([int(arg) for arg in args[:2]] + args[2:3]))
@@ -0,0 +1,91 @@
+"""Benchmark of the renderers of the composer tree
+
+Usage:
+    python benchmarks/bench_renderers.py [width] [depth]
+
+Compares the time to render a wide schema (a sequence of `width` elements) and a deep schema (`depth` nested
+sequences) with the xsd2html stylesheet and with the Python renderer.
+"""
+import sys
+import timeit
+from os.path import join, dirname, abspath
+
+from core_composer_app.utils import rendering as rendering_utils
+from core_composer_app.utils import resources as resources_utils
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+STATIC_PATH = join(dirname(dirname(abspath(__file__))), 'core_composer_app', 'static')
+
+
+def _build_wide_schema(width):
+    """Return a schema with a sequence of elements.
+
+    Args:
+        width:
+
+    Returns:
+
+    """
+    elements = ''.join("<xs:element name='element{0}' type='xs:string'/>".format(index) for index in range(width))
+    return "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'><xs:element name='root'><xs:complexType>" \
+           "<xs:sequence>{}</xs:sequence></xs:complexType></xs:element></xs:schema>".format(elements)
+
+
+def _build_deep_schema(depth):
+    """Return a schema with nested elements.
+
+    Args:
+        depth:
+
+    Returns:
+
+    """
+    opening = ''.join("<xs:element name='element{}'><xs:complexType><xs:sequence>".format(index)
+                      for index in range(depth))
+    closing = "</xs:sequence></xs:complexType></xs:element>" * depth
+    return "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>{}<xs:element name='leaf' type='xs:string'/>" \
+           "{}</xs:schema>".format(opening, closing)
+
+
+def _time_renderer(renderer, xsd_tree, number):
+    """Return the average time to render the tree.
+
+    Args:
+        renderer:
+        xsd_tree:
+        number:
+
+    Returns:
+
+    """
+    rendering_utils.COMPOSER_RENDERER = renderer
+    # compile the stylesheet before timing
+    rendering_utils.render_xsd_tree(xsd_tree)
+    return timeit.timeit(lambda: rendering_utils.render_xsd_tree(xsd_tree), number=number) / number
+
+
+def run(width=2000, depth=200, number=5):
+    """Run the benchmark.
+
+    Args:
+        width:
+        depth:
+        number:
+
+    Returns:
+
+    """
+    resources_utils.finders.find = lambda path: join(STATIC_PATH, path)
+
+    print('Time to render the tree (ms), average of {} renderings:'.format(number))
+    print('  {:<30} {:>10} {:>10}'.format('schema', 'xslt', 'python'))
+    for label, xsd_string in [('wide ({} elements)'.format(width), _build_wide_schema(width)),
+                              ('deep ({} levels)'.format(depth), _build_deep_schema(depth))]:
+        xsd_tree = XSDTree.build_tree(xsd_string)
+        xslt_time = _time_renderer(rendering_utils.XSLT_RENDERER, xsd_tree, number)
+        python_time = _time_renderer(rendering_utils.PYTHON_RENDERER, xsd_tree, number)
+        print('  {:<30} {:>10.1f} {:>10.1f}'.format(label, xslt_time * 1000, python_time * 1000))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,73 @@
+"""Benchmark of the rendering of the composer tree
+
+Usage:
+    python benchmarks/bench_rendering.py [number of elements] [number of requests]
+
+Compares the time per request when the xsd2html stylesheet and the base template are located, read and compiled
+on each request, and when the compiled stylesheet and the base template are loaded once per process.
+"""
+import sys
+import timeit
+from os.path import join, dirname, abspath
+
+from lxml import etree
+
+from core_composer_app.utils import resources as resources_utils
+from core_main_app.utils.file import read_file_content
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+STATIC_PATH = join(dirname(dirname(abspath(__file__))), 'core_composer_app', 'static')
+XSLT_PATH = join(STATIC_PATH, resources_utils.XSD2HTML_XSL)
+BASE_TEMPLATE_PATH = join(STATIC_PATH, resources_utils.NEW_BASE_TEMPLATE_XSD)
+
+
+def _build_schema(nb_elements):
+    """Return a schema with a sequence of elements.
+
+    Args:
+        nb_elements:
+
+    Returns:
+
+    """
+    elements = ''.join("<xs:element name='element{0}' type='xs:string'/>".format(index)
+                       for index in range(nb_elements))
+    return "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'><xs:element name='root'><xs:complexType>" \
+           "<xs:sequence>{}</xs:sequence></xs:complexType></xs:element></xs:schema>".format(elements)
+
+
+def run(nb_elements=100, nb_requests=200):
+    """Run the benchmark.
+
+    Args:
+        nb_elements:
+        nb_requests:
+
+    Returns:
+
+    """
+    xsd_tree = XSDTree.build_tree(_build_schema(nb_elements))
+    xslt = resources_utils._load_xslt(XSLT_PATH)
+    base_template = read_file_content(BASE_TEMPLATE_PATH)
+
+    def uncached():
+        read_file_content(BASE_TEMPLATE_PATH)
+        xslt_string = read_file_content(XSLT_PATH)
+        str(etree.XSLT(etree.XML(xslt_string))(xsd_tree))
+
+    def cached():
+        len(base_template)
+        str(xslt(xsd_tree))
+
+    uncached_time = timeit.timeit(uncached, number=nb_requests) / nb_requests
+    cached_time = timeit.timeit(cached, number=nb_requests) / nb_requests
+
+    print('Schema: {} elements, {} requests'.format(nb_elements, nb_requests))
+    print('Time per request (ms):')
+    print('  stylesheet compiled on each request:  {:>8.3f}'.format(uncached_time * 1000))
+    print('  stylesheet compiled once:             {:>8.3f}'.format(cached_time * 1000))
+    print('  saving per request:                   {:>8.3f}'.format((uncached_time - cached_time) * 1000))
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:3]])
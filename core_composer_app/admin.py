@@ -43,6 +43,8 @@ admin_urls = [
         name='core_composer_app_delete_bucket'),
     url(r'^type/resolve-dependencies', admin_ajax.resolve_dependencies,
         name='core_composer_app_resolve_dependencies'),
+    url(r'^type/job-status$', admin_ajax.get_job_status,
+        name='core_composer_app_job_status'),
     url(r'^bucket/(?P<pk>[\w-]+)/edit/$',
         EditBucketView.as_view(),
         name='core_composer_app_edit_bucket'),
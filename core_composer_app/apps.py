@@ -16,3 +16,7 @@ class ComposerAppConfig(AppConfig):
         """
         import core_composer_app.permissions.discover as discover
         discover.init_permissions()
+        import core_composer_app.utils.catalog as catalog_utils
+        catalog_utils.init_signals()
+        import core_composer_app.components.bucket.api as bucket_api
+        bucket_api.init_type_buckets()
@@ -0,0 +1,12 @@
+"""Composer exceptions
+"""
+from core_main_app.commons.exceptions import CoreError
+
+
+class DraftConflictError(CoreError):
+    """Error raised when a draft was modified by another request since it was loaded.
+    """
+    def __init__(self, message, revision=None):
+        super(DraftConflictError, self).__init__(message)
+        self.message = message
+        self.revision = revision
@@ -1,9 +1,23 @@
 """Bucket api
 """
+from bson.errors import InvalidId
+from bson.objectid import ObjectId
+
 from core_composer_app.components.bucket.models import Bucket
-from core_main_app.commons.exceptions import ApiError
+from core_composer_app.components.type_version_manager.models import TypeVersionManager
+from core_composer_app.utils import colors as colors_utils
+from core_main_app.commons.exceptions import ApiError, NotUniqueError
+
+import logging
+import re
+
+# number of colors tried when saving a new bucket, if the colors are taken by other processes
+MAX_COLOR_ATTEMPTS = 10
 
-import random
+# hexadecimal color string of a bucket
+COLOR_PATTERN = re.compile(r'^#[0-9A-Fa-f]{6}$')
+
+logger = logging.getLogger(__name__)
 
 
 def get_by_id(bucket_id):
@@ -27,18 +41,19 @@ def upsert(bucket):
     Returns:
 
     """
-    # get list of colors already present
-    existing_colors = Bucket.get_colors()
     # set a color if not set
     if bucket.color is None:
-        # get a unique color
-        color = _get_random_hex_color()
-        while color in existing_colors:
-            color = _get_random_hex_color()
-
-        bucket.color = color
+        bucket = _save_with_new_color(bucket)
+    else:
+        bucket = bucket.save_object()
 
-    return bucket.save_object()
+    # update the buckets of the types, the types of the bucket may have changed
+    type_ids = [version_manager.id for version_manager in bucket.types]
+    TypeVersionManager.remove_bucket(bucket.id, excluded_ids=type_ids)
+    TypeVersionManager.add_bucket(type_ids, bucket.id)
+    # the catalog cleared when the bucket was saved may have been built again before the types were updated
+    _invalidate_catalog()
+    return bucket
 
 
 def get_all():
@@ -50,6 +65,104 @@ def get_all():
     return Bucket.get_all()
 
 
+def get_all_summaries():
+    """Return all buckets, without their types.
+
+    Returns:
+
+    """
+    return Bucket.get_all_summaries()
+
+
+def get_all_descriptions():
+    """Return the label, color and ids of the types of all buckets, without dereferencing the types.
+
+    Returns:
+
+    """
+    return Bucket.get_all_descriptions()
+
+
+def get_by_type_version_manager(version_manager):
+    """Return the buckets containing a type version manager.
+
+    Args:
+        version_manager:
+
+    Returns:
+
+    """
+    # the buckets are not set on the type version managers saved before they were stored (see init_type_buckets)
+    return Bucket.get_by_ids(version_manager.buckets or [])
+
+
+def import_buckets(buckets_data):
+    """Create or update buckets from their descriptions, with a single bulk write. Buckets are identified by
+    their label.
+
+    Args:
+        buckets_data: list of dicts with the label, the color (optional, a color of the palette is set on new
+        buckets), and the types (optional, ids or titles of global types) of each bucket
+
+    Returns:
+        dict: labels of the created and of the updated buckets
+
+    """
+    labels = [bucket_data['label'] for bucket_data in buckets_data]
+    if len(set(labels)) != len(labels):
+        raise ApiError("The labels of the buckets are not unique.")
+
+    existing_ids = dict((bucket.label, bucket.id) for bucket in Bucket.get_by_labels(labels))
+    type_ids = _get_import_type_ids([type_ref for bucket_data in buckets_data
+                                     for type_ref in bucket_data.get('types') or []])
+    requested_colors = set(bucket_data['color'].upper() for bucket_data in buckets_data if bucket_data.get('color'))
+
+    buckets_fields = []
+    for bucket_data in buckets_data:
+        bucket_fields = {'label': bucket_data['label']}
+        if bucket_data.get('color'):
+            if not COLOR_PATTERN.match(bucket_data['color']):
+                raise ApiError(u"{} is not a valid color.".format(bucket_data['color']))
+            bucket_fields['color'] = bucket_data['color']
+        elif bucket_data['label'] not in existing_ids:
+            bucket_fields['color'] = _allocate_color(requested_colors)
+        if bucket_data.get('types') is not None:
+            bucket_fields['types'] = _unique([type_ids[type_ref] for type_ref in bucket_data['types']])
+        buckets_fields.append(bucket_fields)
+
+    try:
+        created_ids = Bucket.upsert_by_label(buckets_fields)
+    except NotUniqueError:
+        # colors may have been taken by other processes
+        colors_utils.clear()
+        raise
+
+    # update the buckets of the types
+    bucket_ids = dict(existing_ids, **created_ids)
+    TypeVersionManager.set_bucket_types(dict((bucket_ids[bucket_fields['label']], bucket_fields['types'])
+                                             for bucket_fields in buckets_fields if 'types' in bucket_fields))
+    _invalidate_catalog()
+
+    return {'created': [label for label in labels if label in created_ids],
+            'updated': [label for label in labels if label in existing_ids]}
+
+
+def export_buckets():
+    """Return the descriptions of all buckets, as accepted by import_buckets. Types are identified by their title.
+
+    Returns:
+        list of dicts with the label, the color and the types of each bucket
+
+    """
+    descriptions = get_all_descriptions()
+    titles = TypeVersionManager.get_titles(list(set(type_id for description in descriptions
+                                                    for type_id in description.get('types', []))))
+    return [{'label': description['label'],
+             'color': description.get('color'),
+             'types': [titles[type_id] for type_id in description.get('types', []) if type_id in titles]}
+            for description in descriptions]
+
+
 def delete(bucket):
     """Delete a bucket.
 
@@ -60,15 +173,94 @@ def delete(bucket):
 
     """
     bucket.delete()
+    TypeVersionManager.remove_bucket(bucket.id)
+    _invalidate_catalog()
+    colors_utils.release_color(bucket.color)
+
+
+def _allocate_color(excluded_colors):
+    """Return the next color of the palette, except the given colors.
+
+    Args:
+        excluded_colors: set of upper case colors
+
+    Returns:
+
+    """
+    color = colors_utils.allocate_color(Bucket.get_colors)
+    while color in excluded_colors:
+        color = colors_utils.allocate_color(Bucket.get_colors)
+    return color
+
 
+def _get_import_type_ids(type_refs):
+    """Return the ids of global types given by id or by title, raise an ApiError if some types do not exist.
 
-def _get_random_hex_color():
-    """Return a random hexa color string.
+    Args:
+        type_refs: ids or titles of types
+
+    Returns:
+        dict: ids of the types by id or title
+
+    """
+    type_refs = set(type_refs)
+    if len(type_refs) == 0:
+        return {}
+
+    version_managers = TypeVersionManager.get_global_version_managers_by_ids_or_titles(
+        [ObjectId(type_ref) for type_ref in type_refs if ObjectId.is_valid(type_ref)], list(type_refs))
+
+    type_ids = {}
+    for version_manager in version_managers:
+        type_ids[str(version_manager.id)] = version_manager.id
+        if version_manager.title in type_ids and version_manager.title in type_refs:
+            raise ApiError(u"More than one type with the given title: {}.".format(version_manager.title))
+        type_ids[version_manager.title] = version_manager.id
+
+    missing_refs = type_refs - set(type_ids)
+    if len(missing_refs) > 0:
+        raise ApiError(u"No type found with the given id or title: {}.".format(u', '.join(sorted(missing_refs))))
+    return dict((type_ref, type_ids[type_ref]) for type_ref in type_refs)
+
+
+def _unique(values):
+    """Return the values without duplicates, in the same order.
+
+    Args:
+        values:
 
     Returns:
 
     """
-    return '#' + ''.join([random.choice('0123456789ABCDEF') for x in range(6)])
+    unique_values = []
+    for value in values:
+        if value not in unique_values:
+            unique_values.append(value)
+    return unique_values
+
+
+def _save_with_new_color(bucket):
+    """Save a bucket with the next color of the palette. Another color is tried if the color was taken in the
+    meantime (unique index on the color).
+
+    Args:
+        bucket:
+
+    Returns:
+
+    """
+    for attempt in range(MAX_COLOR_ATTEMPTS):
+        bucket.color = colors_utils.allocate_color(Bucket.get_colors)
+        try:
+            return bucket.save_object()
+        except NotUniqueError:
+            color = bucket.color
+            bucket.color = None
+            # the label is not unique, or the color was taken by another process
+            if not colors_utils.is_used(color, Bucket.get_colors):
+                raise
+
+    raise ApiError("Unable to find a unique color for the bucket.")
 
 
 def add_type_to_buckets(version_manager, list_bucket_ids):
@@ -81,21 +273,14 @@ def add_type_to_buckets(version_manager, list_bucket_ids):
     Returns:
 
     """
-    if list_bucket_ids is None:
+    if not list_bucket_ids:
         return
 
-    # Iterate through list of bucket ids
-    for bucket_id in list_bucket_ids:
-        try:
-            # get the bucket using its id
-            bucket = get_by_id(bucket_id)
-        except:
-            raise ApiError("No bucket found with the given id.")
-
-        # add type to bucket
-        bucket.types.append(version_manager)
-        # update bucket
-        upsert(bucket)
+    # add the type to all the buckets at once
+    bucket_ids = _get_bucket_ids(list_bucket_ids)
+    Bucket.add_type(version_manager, bucket_ids)
+    TypeVersionManager.add_buckets(version_manager.id, bucket_ids)
+    _invalidate_catalog()
 
 
 def update_type_buckets(version_manager, list_bucket_ids):
@@ -108,10 +293,12 @@ def update_type_buckets(version_manager, list_bucket_ids):
     Returns:
 
     """
-    # remove types from current buckets
-    remove_type_from_buckets(version_manager)
-    # add types to new list of buckets
-    add_type_to_buckets(version_manager, list_bucket_ids)
+    # remove the type from its current buckets and add it to the new ones in one write
+    bucket_ids = _get_bucket_ids(list_bucket_ids or [])
+    Bucket.set_type_buckets(version_manager, bucket_ids)
+    TypeVersionManager.set_buckets(version_manager.id, bucket_ids)
+    version_manager.buckets = bucket_ids
+    _invalidate_catalog()
 
 
 def remove_type_from_buckets(version_manager):
@@ -123,13 +310,61 @@ def remove_type_from_buckets(version_manager):
     Returns:
 
     """
-    buckets = get_all()
+    updated_count = Bucket.remove_type(version_manager)
+    TypeVersionManager.set_buckets(version_manager.id, [])
+    version_manager.buckets = []
+    if updated_count > 0:
+        _invalidate_catalog()
+
+
+def init_type_buckets():
+    """Set the buckets of the type version managers saved before the buckets were stored in the type version
+    managers.
+
+    Returns:
+
+    """
+    try:
+        version_manager_ids = TypeVersionManager.get_ids_without_buckets_field()
+        if len(version_manager_ids) == 0:
+            return
+
+        TypeVersionManager.reset_buckets(version_manager_ids)
+        for bucket_id, type_ids in Bucket.get_type_ids_by_bucket(version_manager_ids).items():
+            TypeVersionManager.add_bucket(type_ids, bucket_id)
+        _invalidate_catalog()
+    except Exception, e:
+        logger.error('Impossible to init the buckets of the types: {}'.format(e.message))
+
 
-    # Iterate through all buckets
-    for bucket in buckets:
-        # if type in bucket
-        if version_manager in bucket.types:
-            # remove type from the bucket
-            bucket.types.remove(version_manager)
-            # update bucket
-            upsert(bucket)
+def _get_bucket_ids(list_bucket_ids):
+    """Return the ObjectIds of the buckets, raise an ApiError if some buckets do not exist.
+
+    Args:
+        list_bucket_ids:
+
+    Returns:
+
+    """
+    try:
+        bucket_ids = list(set(ObjectId(str(bucket_id)) for bucket_id in list_bucket_ids))
+    except InvalidId:
+        raise ApiError("No bucket found with the given id.")
+
+    missing_ids = set(bucket_ids) - set(Bucket.get_existing_ids(bucket_ids))
+    if len(missing_ids) > 0:
+        raise ApiError("No bucket found with the given id: {}.".format(
+            ', '.join(sorted(str(bucket_id) for bucket_id in missing_ids))))
+    return bucket_ids
+
+
+def _invalidate_catalog():
+    """Invalidate the catalog of types of the composer, after buckets or the buckets of the types were updated
+    without being saved (no signal is sent).
+
+    Returns:
+
+    """
+    # the catalog depends on the bucket api
+    from core_composer_app.utils import catalog as catalog_utils
+    catalog_utils.invalidate()
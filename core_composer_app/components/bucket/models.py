@@ -2,6 +2,8 @@
 """
 from django_mongoengine import fields, Document
 from mongoengine import errors as mongoengine_errors
+from pymongo import UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from core_composer_app.components.type_version_manager.models import TypeVersionManager
 from core_main_app.commons import exceptions
@@ -14,6 +16,8 @@ class Bucket(Document):
     color = fields.StringField(unique=True)
     types = fields.ListField(fields.ReferenceField(TypeVersionManager), blank=True)
 
+    meta = {'indexes': ['types']}
+
     @staticmethod
     def get_by_id(bucket_id):
         """Return a bucket given its id.
@@ -40,6 +44,92 @@ class Bucket(Document):
         """
         return Bucket.objects().all()
 
+    @staticmethod
+    def get_all_summaries():
+        """Return all buckets, without their types.
+
+        Returns:
+
+        """
+        return Bucket.objects().exclude('types').all()
+
+    @staticmethod
+    def get_by_ids(bucket_ids):
+        """Return the buckets with the given ids.
+
+        Args:
+            bucket_ids:
+
+        Returns:
+
+        """
+        return Bucket.objects(id__in=bucket_ids).all()
+
+    @staticmethod
+    def get_by_labels(labels):
+        """Return the buckets with the given labels, without their types.
+
+        Args:
+            labels:
+
+        Returns:
+
+        """
+        return Bucket.objects(label__in=labels).only('label', 'color').all()
+
+    @staticmethod
+    def get_all_descriptions():
+        """Return the label, color and ids of the types of all buckets, without dereferencing the types.
+
+        Returns:
+            list of dicts
+
+        """
+        return list(Bucket._get_collection().find({}, {'_id': False, 'label': True, 'color': True, 'types': True}))
+
+    @staticmethod
+    def upsert_by_label(buckets_fields):
+        """Create or update buckets identified by their label, with a single bulk write.
+
+        Args:
+            buckets_fields: list of dicts of the fields set on each bucket, with at least the label (types as
+            list of ObjectId)
+
+        Returns:
+            dict: ids of the created buckets by label
+
+        """
+        try:
+            result = Bucket._get_collection().bulk_write([UpdateOne({'label': bucket_fields['label']},
+                                                                    {'$set': bucket_fields},
+                                                                    upsert=True)
+                                                          for bucket_fields in buckets_fields])
+            return dict((buckets_fields[index]['label'], bucket_id)
+                        for index, bucket_id in result.upserted_ids.items())
+        except BulkWriteError as e:
+            # duplicate key error on the unique color
+            if any(error.get('code') == 11000 for error in e.details.get('writeErrors', [])):
+                raise exceptions.NotUniqueError(e.message)
+            raise exceptions.ModelError(e.message)
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def get_type_ids_by_bucket(version_manager_ids):
+        """Return the ids of the given type version managers present in each bucket.
+
+        Args:
+            version_manager_ids: list of ObjectId
+
+        Returns:
+            dict: ids of the type version managers by bucket id
+
+        """
+        # read the ids of the references, without dereferencing them
+        cursor = Bucket._get_collection().find({'types': {'$in': version_manager_ids}}, {'types': True})
+        return dict((bucket['_id'], [type_id for type_id in bucket['types'] if type_id in version_manager_ids])
+                    for bucket in cursor)
+
     @staticmethod
     def get_colors():
         """Return all colors.
@@ -49,6 +139,84 @@ class Bucket(Document):
         """
         return Bucket.objects.values_list('color')
 
+    @staticmethod
+    def remove_type(version_manager):
+        """Remove a type version manager from all the buckets, with a single atomic update.
+
+        Args:
+            version_manager:
+
+        Returns:
+            the number of updated buckets.
+
+        """
+        try:
+            # raw update: the query transform of the ReferenceField rejects the id of the type version manager
+            result = Bucket._get_collection().update_many({'types': version_manager.id},
+                                                          {'$pull': {'types': version_manager.id}})
+            return result.modified_count
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def get_existing_ids(bucket_ids):
+        """Return the ids of the buckets that exist among the given ids.
+
+        Args:
+            bucket_ids: list of ObjectId
+
+        Returns:
+
+        """
+        try:
+            return Bucket.objects(id__in=bucket_ids).scalar('id')
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def add_type(version_manager, bucket_ids):
+        """Add a type version manager to buckets, with a single update. The type is not duplicated in the buckets
+        already containing it.
+
+        Args:
+            version_manager:
+            bucket_ids: list of ObjectId
+
+        Returns:
+            the number of matched buckets.
+
+        """
+        try:
+            # raw update, as in remove_type
+            result = Bucket._get_collection().update_many({'_id': {'$in': bucket_ids}},
+                                                          {'$addToSet': {'types': version_manager.id}})
+            return result.matched_count
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def set_type_buckets(version_manager, bucket_ids):
+        """Set the buckets containing a type version manager: remove it from the other buckets and add it to the
+        given buckets, in a single bulk write.
+
+        Args:
+            version_manager:
+            bucket_ids: list of ObjectId
+
+        Returns:
+
+        """
+        try:
+            Bucket._get_collection().bulk_write([
+                # buckets keeping the type are not modified, so the type keeps its position
+                UpdateMany({'types': version_manager.id, '_id': {'$nin': bucket_ids}},
+                           {'$pull': {'types': version_manager.id}}),
+                UpdateMany({'_id': {'$in': bucket_ids}},
+                           {'$addToSet': {'types': version_manager.id}}),
+            ])
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
     def save_object(self):
         """Custom save
 
@@ -0,0 +1,76 @@
+"""Compose Draft api
+"""
+from datetime import datetime
+
+from core_composer_app.commons.exceptions import DraftConflictError
+from core_composer_app.components.compose_draft.models import ComposeDraft
+
+
+def insert(compose_draft):
+    """Save a new draft.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    return compose_draft.save_object()
+
+
+def get_by_id(draft_id, user_id):
+    """Return a draft of the user given its id, without the contents of the checkpoints.
+
+    Args:
+        draft_id:
+        user_id:
+
+    Returns:
+
+    """
+    return ComposeDraft.get_by_id_and_user(draft_id, user_id)
+
+
+def load_contents(compose_draft):
+    """Load the contents of the checkpoints of a draft.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    contents = ComposeDraft.get_contents(compose_draft.id)
+    compose_draft.content = contents.content
+    compose_draft.checkpoint_contents = contents.checkpoint_contents
+    return compose_draft
+
+
+def update(compose_draft, update_document):
+    """Apply a raw update to a draft, if it was not modified since it was loaded.
+
+    Args:
+        compose_draft:
+        update_document: MongoDB update document, the values of the draft have to be set by the caller
+
+    Returns:
+
+    """
+    update_document.setdefault('$set', {})['last_modified'] = datetime.utcnow()
+    update_document.setdefault('$inc', {})['version'] = 1
+
+    if ComposeDraft.update_version(compose_draft.id, compose_draft.version, update_document) == 0:
+        raise DraftConflictError("The draft was modified by another request. Please reload the page.")
+    compose_draft.version += 1
+
+
+def delete(compose_draft):
+    """Delete a draft.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    compose_draft.delete()
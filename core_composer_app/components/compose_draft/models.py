@@ -0,0 +1,125 @@
+"""Compose Draft model
+"""
+from datetime import datetime
+
+from bson.binary import Binary
+from django_mongoengine import fields, Document
+from mongoengine import errors as mongoengine_errors
+
+from core_composer_app.settings import COMPOSER_DRAFT_EXPIRY
+from core_composer_app.utils import compression as compression_utils
+from core_main_app.commons import exceptions
+
+
+class ComposeDraft(Document):
+    """Schema being composed by a user: content of the last checkpoint and edits applied since.
+    """
+    user = fields.StringField()
+    # stored content of the last checkpoint (see utils.compression)
+    content = fields.BinaryField()
+    # edits applied since the last checkpoint, each edit being a list of operations
+    operations = fields.ListField(blank=True)
+    # stored contents and edits of the previous checkpoints
+    checkpoint_contents = fields.ListField(fields.BinaryField(), blank=True)
+    checkpoint_operations = fields.ListField(blank=True)
+    # undone edits
+    redo = fields.ListField(blank=True)
+    includes = fields.ListField(fields.StringField(), blank=True)
+    validated = fields.BooleanField(default=True)
+    version = fields.IntField(default=0)
+    # version from which the xpaths of the elements are valid
+    structure_version = fields.IntField(default=0)
+    last_modified = fields.DateTimeField(default=datetime.utcnow)
+
+    meta = {'indexes': ['user',
+                        {'fields': ['last_modified'], 'expireAfterSeconds': COMPOSER_DRAFT_EXPIRY}]}
+
+    @staticmethod
+    def get_by_id_and_user(draft_id, user_id):
+        """Return a draft of the user given its id, without the contents of the checkpoints.
+
+        Args:
+            draft_id:
+            user_id:
+
+        Returns:
+
+        """
+        try:
+            return ComposeDraft.objects(pk=str(draft_id), user=str(user_id))\
+                .exclude('content', 'checkpoint_contents').get()
+        except mongoengine_errors.DoesNotExist as e:
+            raise exceptions.DoesNotExist(e.message)
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def get_contents(draft_id):
+        """Return the contents of the checkpoints of a draft.
+
+        Args:
+            draft_id:
+
+        Returns:
+            the draft, with only its contents loaded.
+
+        """
+        try:
+            return ComposeDraft.objects(pk=str(draft_id)).only('content', 'checkpoint_contents').get()
+        except mongoengine_errors.DoesNotExist as e:
+            raise exceptions.DoesNotExist(e.message)
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def update_version(draft_id, version, update):
+        """Apply a raw update to a draft, only if the draft is still at the given version.
+
+        Args:
+            draft_id:
+            version: version of the draft when it was loaded
+            update: MongoDB update document
+
+        Returns:
+            the number of updated drafts (0 if the draft was modified since it was loaded).
+
+        """
+        try:
+            return ComposeDraft.objects(pk=str(draft_id), version=version).update_one(__raw__=update)
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def compress(xsd_string):
+        """Return the stored (compressed if large enough) content of a schema.
+
+        Args:
+            xsd_string:
+
+        Returns:
+
+        """
+        return Binary(compression_utils.compress(xsd_string))
+
+    @staticmethod
+    def decompress(content):
+        """Return the schema of a stored content.
+
+        Args:
+            content:
+
+        Returns:
+
+        """
+        return compression_utils.decompress(content)
+
+    def save_object(self):
+        """Custom save
+
+        Returns:
+
+        """
+        try:
+            return self.save()
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
@@ -0,0 +1,41 @@
+"""Compose Job api
+"""
+from core_composer_app.components.compose_job.models import ComposeJob
+
+
+def insert(compose_job):
+    """Save a new job.
+
+    Args:
+        compose_job:
+
+    Returns:
+
+    """
+    return compose_job.save_object()
+
+
+def get_by_id(job_id, user_id):
+    """Return a job of the user given its id.
+
+    Args:
+        job_id:
+        user_id:
+
+    Returns:
+
+    """
+    return ComposeJob.get_by_id_and_user(job_id, user_id)
+
+
+def update_status(job_id, **values):
+    """Update the status of a job.
+
+    Args:
+        job_id:
+        **values: values of the fields of the job
+
+    Returns:
+
+    """
+    ComposeJob.update_status(job_id, values)
@@ -0,0 +1,68 @@
+"""Compose Job model
+"""
+from datetime import datetime
+
+from django_mongoengine import fields, Document
+from mongoengine import errors as mongoengine_errors
+
+from core_composer_app.settings import COMPOSER_JOB_STATUS_TIMEOUT
+from core_main_app.commons import exceptions
+
+
+class ComposeJob(Document):
+    """Status of a job run by the workers of a process (see utils.jobs).
+    """
+    user = fields.StringField()
+    status = fields.StringField()
+    message = fields.StringField(blank=True)
+    result = fields.DictField(blank=True)
+    error = fields.StringField(blank=True)
+    last_modified = fields.DateTimeField(default=datetime.utcnow)
+
+    meta = {'indexes': [{'fields': ['last_modified'], 'expireAfterSeconds': COMPOSER_JOB_STATUS_TIMEOUT}]}
+
+    @staticmethod
+    def get_by_id_and_user(job_id, user_id):
+        """Return a job of the user given its id.
+
+        Args:
+            job_id:
+            user_id:
+
+        Returns:
+
+        """
+        try:
+            return ComposeJob.objects(pk=str(job_id), user=str(user_id)).get()
+        except mongoengine_errors.DoesNotExist as e:
+            raise exceptions.DoesNotExist(e.message)
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    @staticmethod
+    def update_status(job_id, values):
+        """Update the status of a job.
+
+        Args:
+            job_id:
+            values: dict of the values of the fields of the job
+
+        Returns:
+
+        """
+        try:
+            update = dict(('set__{}'.format(field_name), value) for field_name, value in values.items())
+            return ComposeJob.objects(pk=str(job_id)).update_one(set__last_modified=datetime.utcnow(), **update)
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
+
+    def save_object(self):
+        """Custom save
+
+        Returns:
+
+        """
+        try:
+            return self.save()
+        except Exception as ex:
+            raise exceptions.ModelError(ex.message)
@@ -1,7 +1,8 @@
 """
 Type API
 """
-from core_composer_app.utils.xml import check_type_core_support, COMPLEX_TYPE
+from core_composer_app.utils import rendering as rendering_utils
+from core_composer_app.utils.xml import get_type_metadata, COMPLEX_TYPE
 from core_main_app.components.template import api as template_api
 from core_composer_app.components.type.models import Type
 
@@ -15,11 +16,15 @@ def upsert(type_object):
     Returns:
 
     """
-    # Check that the type is supported by the core
-    type_definition = check_type_core_support(type_object.content)
-    type_object.is_complex = type_definition == COMPLEX_TYPE
+    # Check that the type is supported by the core, and compute the metadata used to insert it
+    _set_metadata(type_object)
     # Save type
-    return template_api.upsert(type_object)
+    is_update = type_object.id is not None
+    saved_type = template_api.upsert(type_object)
+    # content of an existing type may have changed
+    if is_update:
+        rendering_utils.invalidate_template(type_object.id)
+    return saved_type
 
 
 def get(type_id):
@@ -34,6 +39,48 @@ def get(type_id):
     return Type.get_by_id(type_id)
 
 
+def get_summary(type_id):
+    """Get a type, without its content.
+
+    Args:
+        type_id:
+
+    Returns:
+
+    """
+    return Type.get_summary_by_id(type_id)
+
+
+def get_with_metadata(type_id):
+    """Get a type, without its content, with the metadata used to insert it in a schema.
+    The metadata of a type saved before it was computed is computed and stored.
+
+    Args:
+        type_id:
+
+    Returns:
+
+    """
+    type_object = Type.get_summary_by_id(type_id)
+    if type_object.root_type_name is None:
+        type_object = Type.get_by_id(type_id)
+        _set_metadata(type_object)
+        Type.set_metadata(type_object)
+    return type_object
+
+
+def get_summaries_by_ids(type_ids):
+    """Get the types with the given ids, without their content.
+
+    Args:
+        type_ids:
+
+    Returns:
+
+    """
+    return Type.get_summaries_by_ids(type_ids)
+
+
 def get_all():
     """List all types.
 
@@ -59,3 +106,23 @@ def delete(type_object):
 
     """
     type_object.delete()
+    rendering_utils.invalidate_template(type_object.id)
+
+
+def _set_metadata(type_object):
+    """Compute the metadata of the type from its content.
+
+    Args:
+        type_object:
+
+    Returns:
+
+    """
+    metadata = get_type_metadata(type_object.content)
+    type_object.is_complex = metadata['type_definition'] == COMPLEX_TYPE
+    type_object.root_type_name = metadata['root_type_name']
+    type_object.target_namespace = metadata['target_namespace']
+    type_object.target_namespace_prefix = metadata['target_namespace_prefix']
+    type_object.schema_locations = metadata['schema_locations']
+    type_object.content_hash = rendering_utils.get_content_hash(type_object.content)
+    type_object.element_count = metadata['element_count']
@@ -11,6 +11,16 @@ class Type(Template):
     """Type class.
     """
     is_complex = fields.BooleanField(blank=False)
+    # metadata computed when the type is saved, used to insert the type in a schema without parsing it
+    root_type_name = fields.StringField(blank=True)
+    target_namespace = fields.StringField(blank=True)
+    target_namespace_prefix = fields.StringField(blank=True)
+    schema_locations = fields.ListField(fields.StringField(), blank=True)
+    content_hash = fields.StringField(blank=True)
+    element_count = fields.IntField(blank=True)
+
+    # the _cls of the types is added in front of the indexes
+    meta = {'indexes': ['is_complex']}
 
     @staticmethod
     def get_by_id(type_id):
@@ -29,6 +39,35 @@ class Type(Template):
         except Exception as e:
             raise exceptions.ModelError(e.message)
 
+    @staticmethod
+    def get_summary_by_id(type_id):
+        """Return a type given its id, without its content.
+
+        Args:
+            type_id:
+
+        Returns:
+
+        """
+        try:
+            return Type.objects(pk=str(type_id)).exclude('content').get()
+        except mongoengine_errors.DoesNotExist as e:
+            raise exceptions.DoesNotExist(e.message)
+        except Exception as e:
+            raise exceptions.ModelError(e.message)
+
+    @staticmethod
+    def get_summaries_by_ids(type_ids):
+        """Return the types with the given ids, without their content.
+
+        Args:
+            type_ids:
+
+        Returns:
+
+        """
+        return Type.objects(id__in=type_ids).exclude('content').all()
+
     @staticmethod
     def get_all():
         """Return all types.
@@ -46,3 +85,24 @@ class Type(Template):
 
         """
         return Type.objects(is_complex=True).all()
+
+    @staticmethod
+    def set_metadata(type_object):
+        """Store the metadata of a type, without saving its content.
+
+        Args:
+            type_object:
+
+        Returns:
+
+        """
+        try:
+            Type.objects(pk=type_object.id).update(set__is_complex=type_object.is_complex,
+                                                   set__root_type_name=type_object.root_type_name,
+                                                   set__target_namespace=type_object.target_namespace,
+                                                   set__target_namespace_prefix=type_object.target_namespace_prefix,
+                                                   set__schema_locations=type_object.schema_locations,
+                                                   set__content_hash=type_object.content_hash,
+                                                   set__element_count=type_object.element_count)
+        except Exception as e:
+            raise exceptions.ModelError(e.message)
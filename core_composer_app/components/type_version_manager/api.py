@@ -8,6 +8,9 @@ from core_main_app.components.template import api as template_api
 from core_main_app.components.version_manager import api as version_manager_api
 from core_main_app.components.version_manager.utils import get_latest_version_name
 
+# fields of the type version managers displayed in the listings of types (e.g. palette of the composer)
+SUMMARY_FIELDS = ['title', 'user', 'current', 'is_disabled']
+
 
 def insert(type_version_manager, type_object, list_bucket_ids=None):
     """Add a version to a type version manager.
@@ -67,6 +70,30 @@ def get_version_managers_by_user(user_id):
     return TypeVersionManager.get_version_managers_by_user(user_id)
 
 
+def get_summaries_by_user(user_id):
+    """Get all version managers of a user, with only the fields displayed in the listings of types.
+
+    Args:
+        user_id:
+
+    Returns:
+
+    """
+    return TypeVersionManager.get_version_managers_by_user(user_id, fields=SUMMARY_FIELDS)
+
+
+def get_summaries_by_ids(version_manager_ids):
+    """Get the version managers with the given ids, with only the fields displayed in the listings of types.
+
+    Args:
+        version_manager_ids:
+
+    Returns:
+
+    """
+    return TypeVersionManager.get_by_ids(version_manager_ids, fields=SUMMARY_FIELDS)
+
+
 def get_active_version_manager_by_user_id(user_id):
     """ Return all active Version Managers with given user id.
 
@@ -79,18 +106,13 @@ def get_active_version_manager_by_user_id(user_id):
 def get_no_buckets_types():
     """Get list of available types not inside a bucket.
 
+    Only the fields displayed in the listings of types are loaded.
+
     Returns:
 
     """
-    # build list of types
-    bucket_types = []
-    for bucket in bucket_api.get_all():
-        bucket_types += bucket.types
-
-    all_types = get_global_version_managers()
-    no_bucket_types = [type_version_manager for type_version_manager in all_types
-                       if type_version_manager not in bucket_types]
-    return no_bucket_types
+    # the buckets of each type are stored in the type version manager (indexed)
+    return TypeVersionManager.get_global_version_managers_without_bucket(fields=SUMMARY_FIELDS)
 
 
 def get_all_version_manager_except_user_id(user_id):
@@ -1,6 +1,10 @@
 """
 Type Version Manager model
 """
+from django_mongoengine import fields
+from mongoengine.queryset.visitor import Q
+from pymongo import UpdateMany
+
 from core_main_app.components.template_version_manager.models import TemplateVersionManager
 from core_main_app.components.version_manager.models import VersionManager
 
@@ -8,10 +12,17 @@ from core_main_app.components.version_manager.models import VersionManager
 class TypeVersionManager(TemplateVersionManager):
     """Manage versions of types.
     """
+    # ids of the buckets containing the type (reverse index of Bucket.types, maintained by the bucket api)
+    buckets = fields.ListField(fields.ObjectIdField(), blank=True)
 
     # TODO: see if better way to find _cls
     class_name = 'VersionManager.TemplateVersionManager.TypeVersionManager'
 
+    # the _cls of the type version managers is added in front of the indexes
+    meta = {'indexes': [{'fields': ['user', 'is_disabled']},
+                        'title',
+                        'buckets']}
+
     @staticmethod
     def get_global_version_managers(_cls=True):
         """Return all Type Version Managers with user set to None.
@@ -31,16 +42,174 @@ class TypeVersionManager(TemplateVersionManager):
         return TypeVersionManager.objects(is_disabled=False, user=None).all()
 
     @staticmethod
-    def get_version_managers_by_user(user_id):
+    def get_global_version_managers_without_bucket(fields=None):
+        """Return the Type Version Managers with user set to None, that are not in a bucket.
+
+        Args:
+            fields: names of the fields to load (all fields if None)
+
+        Returns:
+
+        """
+        # type version managers saved before the buckets field existed have no buckets field
+        queryset = TypeVersionManager.objects(Q(buckets=[]) | Q(buckets__exists=False), user=None)
+        if fields is not None:
+            queryset = queryset.only(*fields)
+        return queryset.all()
+
+    @staticmethod
+    def get_global_version_managers_by_ids_or_titles(version_manager_ids, titles):
+        """Return the Type Version Managers with user set to None, with one of the given ids or titles. Only their
+        ids and titles are loaded.
+
+        Args:
+            version_manager_ids:
+            titles:
+
+        Returns:
+
+        """
+        return TypeVersionManager.objects(Q(id__in=version_manager_ids) | Q(title__in=titles),
+                                          user=None).only('title').all()
+
+    @staticmethod
+    def get_titles(version_manager_ids):
+        """Return the titles of Type Version Managers.
+
+        Args:
+            version_manager_ids:
+
+        Returns:
+            dict: titles by id
+
+        """
+        return dict((version_manager.id, version_manager.title)
+                    for version_manager in TypeVersionManager.objects(id__in=version_manager_ids).only('title'))
+
+    @staticmethod
+    def get_ids_without_buckets_field():
+        """Return the ids of the Type Version Managers saved before the buckets field existed.
+
+        Returns:
+
+        """
+        return list(TypeVersionManager.objects(buckets__exists=False).scalar('id'))
+
+    @staticmethod
+    def reset_buckets(version_manager_ids):
+        """Remove all buckets of Type Version Managers.
+
+        Args:
+            version_manager_ids:
+
+        Returns:
+
+        """
+        return TypeVersionManager.objects(id__in=version_manager_ids).update(set__buckets=[])
+
+    @staticmethod
+    def set_buckets(version_manager_id, bucket_ids):
+        """Set the buckets of a Type Version Manager.
+
+        Args:
+            version_manager_id:
+            bucket_ids: list of ObjectId
+
+        Returns:
+
+        """
+        return TypeVersionManager.objects(id=version_manager_id).update(set__buckets=bucket_ids)
+
+    @staticmethod
+    def add_buckets(version_manager_id, bucket_ids):
+        """Add buckets to a Type Version Manager.
+
+        Args:
+            version_manager_id:
+            bucket_ids: list of ObjectId
+
+        Returns:
+
+        """
+        return TypeVersionManager.objects(id=version_manager_id).update(add_to_set__buckets=bucket_ids)
+
+    @staticmethod
+    def add_bucket(version_manager_ids, bucket_id):
+        """Add a bucket to Type Version Managers.
+
+        Args:
+            version_manager_ids:
+            bucket_id:
+
+        Returns:
+
+        """
+        return TypeVersionManager.objects(id__in=version_manager_ids).update(add_to_set__buckets=bucket_id)
+
+    @staticmethod
+    def set_bucket_types(type_ids_by_bucket):
+        """Set the Type Version Managers in buckets, with a single bulk write.
+
+        Args:
+            type_ids_by_bucket: dict of the ids of the Type Version Managers by bucket id
+
+        Returns:
+
+        """
+        operations = []
+        for bucket_id, version_manager_ids in type_ids_by_bucket.items():
+            operations.append(UpdateMany({'buckets': bucket_id, '_id': {'$nin': version_manager_ids}},
+                                         {'$pull': {'buckets': bucket_id}}))
+            operations.append(UpdateMany({'_id': {'$in': version_manager_ids}},
+                                         {'$addToSet': {'buckets': bucket_id}}))
+        if len(operations) > 0:
+            TypeVersionManager._get_collection().bulk_write(operations)
+
+    @staticmethod
+    def remove_bucket(bucket_id, excluded_ids=None):
+        """Remove a bucket from the Type Version Managers in it, except the given ones.
+
+        Args:
+            bucket_id:
+            excluded_ids: ids of the Type Version Managers keeping the bucket
+
+        Returns:
+
+        """
+        return TypeVersionManager.objects(buckets=bucket_id,
+                                          id__nin=excluded_ids or []).update(pull__buckets=bucket_id)
+
+    @staticmethod
+    def get_version_managers_by_user(user_id, fields=None):
         """Return Type Version Managers with user set to user_id.
 
         Args:
             user_id:
+            fields: names of the fields to load (all fields if None)
+
+        Returns:
+
+        """
+        queryset = TypeVersionManager.objects(user=str(user_id))
+        if fields is not None:
+            queryset = queryset.only(*fields)
+        return queryset.all()
+
+    @staticmethod
+    def get_by_ids(version_manager_ids, fields=None):
+        """Return the Type Version Managers with the given ids.
+
+        Args:
+            version_manager_ids:
+            fields: names of the fields to load (all fields if None)
 
         Returns:
 
         """
-        return TypeVersionManager.objects(user=str(user_id)).all()
+        queryset = TypeVersionManager.objects(id__in=version_manager_ids)
+        if fields is not None:
+            queryset = queryset.only(*fields)
+        return queryset.all()
 
     @staticmethod
     def get_active_version_manager_by_user_id(user_id):
@@ -0,0 +1,42 @@
+""" Command writing all buckets to a JSON file
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from core_composer_app.components.bucket import api as bucket_api
+
+
+class Command(BaseCommand):
+    """ Write all buckets to a JSON file, as read by import_buckets.
+    """
+    help = 'Write the label, the color and the titles of the types of all buckets to a JSON file.'
+
+    def add_arguments(self, parser):
+        """ Add the arguments of the command.
+
+        Args:
+            parser:
+
+        Returns:
+
+        """
+        parser.add_argument('file', nargs='?', help='path of the JSON file (standard output if not given)')
+
+    def handle(self, *args, **options):
+        """ Run the command.
+
+        Args:
+            *args:
+            **options:
+
+        Returns:
+
+        """
+        content = json.dumps(bucket_api.export_buckets(), indent=4)
+        if options['file'] is None:
+            self.stdout.write(content)
+            return
+
+        with open(options['file'], 'w') as buckets_file:
+            buckets_file.write(content)
@@ -0,0 +1,53 @@
+""" Command creating or updating buckets from a JSON file
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core_composer_app.components.bucket import api as bucket_api
+from core_main_app.commons.exceptions import CoreError
+
+
+class Command(BaseCommand):
+    """ Create or update buckets from a JSON file, as written by export_buckets.
+    """
+    help = 'Create or update buckets from a JSON file: a list of {"label", "color", "types"} objects, the color ' \
+           'and the types (ids or titles of global types) being optional.'
+
+    def add_arguments(self, parser):
+        """ Add the arguments of the command.
+
+        Args:
+            parser:
+
+        Returns:
+
+        """
+        parser.add_argument('file', help='path of the JSON file')
+
+    def handle(self, *args, **options):
+        """ Run the command.
+
+        Args:
+            *args:
+            **options:
+
+        Returns:
+
+        """
+        try:
+            with open(options['file']) as buckets_file:
+                buckets_data = json.load(buckets_file)
+        except (IOError, ValueError), e:
+            raise CommandError('Unable to read the buckets: {}'.format(e))
+
+        if not isinstance(buckets_data, list) or not all('label' in bucket_data for bucket_data in buckets_data):
+            raise CommandError('The file should contain a list of buckets with a label.')
+
+        try:
+            result = bucket_api.import_buckets(buckets_data)
+        except CoreError, e:
+            raise CommandError(e.message)
+
+        self.stdout.write('{} buckets created, {} buckets updated.'.format(len(result['created']),
+                                                                          len(result['updated'])))
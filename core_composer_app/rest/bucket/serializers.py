@@ -5,7 +5,8 @@ from rest_framework_mongoengine.serializers import DocumentSerializer
 
 from core_composer_app.components.bucket import api as bucket_api
 from core_composer_app.components.bucket.models import Bucket
-from rest_framework.fields import CharField
+from rest_framework.fields import CharField, ListField
+from rest_framework.serializers import Serializer
 
 from core_main_app.commons.exceptions import DoesNotExist
 
@@ -61,3 +62,11 @@ class BucketsSerializer(DocumentSerializer):
             return id
         except DoesNotExist:
             raise Http404
+
+
+class BucketImportSerializer(Serializer):
+    """ Bucket import serializer.
+    """
+    label = CharField()
+    color = CharField(required=False, allow_null=True)
+    types = ListField(child=CharField(), required=False, allow_null=True)
@@ -8,8 +8,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from core_composer_app.components.bucket import api as bucket_api
-from core_composer_app.rest.bucket.serializers import BucketSerializer, BucketsSerializer
-from core_main_app.commons.exceptions import DoesNotExist
+from core_composer_app.rest.bucket.serializers import BucketSerializer, BucketsSerializer, BucketImportSerializer
+from core_main_app.commons.exceptions import DoesNotExist, ApiError, NotUniqueError
+from core_main_app.components.version_manager import api as version_manager_api
 from core_main_app.rest.template_version_manager.abstract_views import AbstractTemplateVersionManagerDetail
 from core_main_app.utils.access_control.exceptions import AccessControlError
 from core_main_app.utils.decorators import api_staff_member_required
@@ -101,6 +102,89 @@ class BucketList(APIView):
             return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class BucketBulk(APIView):
+    """ Export all buckets, or create/update many buckets at once.
+    """
+
+    def get(self, request):
+        """ Export all buckets, with the titles of their types
+
+        Args:
+
+            request: HTTP request
+
+        Returns:
+
+            - code: 200
+              content: List of buckets
+            - code: 500
+              content: Internal server error
+        """
+        try:
+            return Response(bucket_api.export_buckets(), status=status.HTTP_200_OK)
+        except Exception as api_exception:
+            content = {'message': api_exception.message}
+            return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @method_decorator(api_staff_member_required())
+    def post(self, request):
+        """ Create or update buckets, identified by their label
+
+        Parameters:
+
+            [
+                {
+                    "label": "label",
+                    "color": "#000000",
+                    "types": ["<type_version_manager_id>", "<type_version_manager_title>"]
+                }
+            ]
+
+        Note:
+
+            The color and the types are optional. A color is set on the new buckets without color, the types of
+            the existing buckets are not modified if not given.
+
+        Args:
+
+            request: HTTP request
+
+        Returns:
+
+            - code: 200
+              content: Labels of the created and of the updated buckets
+            - code: 400
+              content: Validation error / bad request
+            - code: 409
+              content: Label or color already used
+            - code: 500
+              content: Internal server error
+        """
+        try:
+            # Build serializer
+            serializer = BucketImportSerializer(data=request.data, many=True)
+
+            # Validate data
+            serializer.is_valid(True)
+
+            # Save data
+            result = bucket_api.import_buckets(serializer.validated_data)
+
+            return Response(result, status=status.HTTP_200_OK)
+        except ValidationError as validation_exception:
+            content = {'message': validation_exception.detail}
+            return Response(content, status=status.HTTP_400_BAD_REQUEST)
+        except NotUniqueError as not_unique_error:
+            content = {'message': not_unique_error.message}
+            return Response(content, status=status.HTTP_409_CONFLICT)
+        except ApiError as api_error:
+            content = {'message': api_error.message}
+            return Response(content, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as api_exception:
+            content = {'message': api_exception.message}
+            return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class BucketDetail(APIView):
     """ Retrieve, update or delete a bucket
     """
@@ -241,9 +325,48 @@ class BucketDetail(APIView):
 
 
 class TypeVersionManagerBuckets(AbstractTemplateVersionManagerDetail):
-    """ Set new list of buckets for a type version manager
+    """ Get or set the list of buckets of a type version manager
     """
 
+    def get(self, request, pk):
+        """ Get the buckets of a type version manager
+
+        Args:
+
+            request: HTTP request
+            pk: ObjectId
+
+        Returns:
+
+            - code: 200
+              content: List of buckets
+            - code: 403
+              content: Authentication error
+            - code: 404
+              content: Object was not found
+            - code: 500
+              content: Internal server error
+        """
+        try:
+            # Get object, reading the buckets does not require the rights to modify the type
+            type_version_manager = version_manager_api.get(pk)
+
+            # Get the buckets of the type
+            buckets = bucket_api.get_by_type_version_manager(type_version_manager)
+
+            # Serialize object
+            serializer = BucketSerializer(buckets, many=True)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        except DoesNotExist:
+            content = {'message': 'Object not found.'}
+            return Response(content, status=status.HTTP_404_NOT_FOUND)
+        except AccessControlError as access_error:
+            content = {'message': access_error.message}
+            return Response(content, status=status.HTTP_403_FORBIDDEN)
+        except Exception as api_exception:
+            content = {'message': api_exception.message}
+            return Response(content, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @method_decorator(api_staff_member_required())
     def patch(self, request, pk):
         """ Set new list of buckets for a type version manager
@@ -58,6 +58,10 @@ urlpatterns = [
         bucket_views.BucketList.as_view(),
         name='core_composer_app_rest_bucket_list'),
 
+    url(r'^bucket/bulk/$',
+        bucket_views.BucketBulk.as_view(),
+        name='core_composer_app_rest_bucket_bulk'),
+
     url(r'^bucket/(?P<pk>\w+)/$',
         bucket_views.BucketDetail.as_view(),
         name='core_composer_app_rest_bucket_detail'),
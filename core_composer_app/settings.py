@@ -4,3 +4,54 @@ from django.conf import settings
 
 if not settings.configured:
     settings.configure()
+
+# Maximum number of parsed drafts kept in memory by each process
+COMPOSER_DRAFT_CACHE_MAX_ENTRIES = getattr(settings, 'COMPOSER_DRAFT_CACHE_MAX_ENTRIES', 100)
+# Maximum memory (in bytes, estimated from their number of nodes) of the parsed drafts kept in memory by each process
+COMPOSER_DRAFT_CACHE_MAX_SIZE = getattr(settings, 'COMPOSER_DRAFT_CACHE_MAX_SIZE', 50 * 1024 * 1024)
+# Time (in seconds) after its last modification before a draft is deleted
+COMPOSER_DRAFT_EXPIRY = getattr(settings, 'COMPOSER_DRAFT_EXPIRY', 7 * 24 * 60 * 60)
+# zlib compression level (0 to disable compression, 1 to 9) of the contents of the drafts
+COMPOSER_DRAFT_COMPRESSION_LEVEL = getattr(settings, 'COMPOSER_DRAFT_COMPRESSION_LEVEL', 6)
+# Size (in bytes) from which the contents of the drafts are compressed
+COMPOSER_DRAFT_COMPRESSION_THRESHOLD = getattr(settings, 'COMPOSER_DRAFT_COMPRESSION_THRESHOLD', 1024)
+# Number of edits of a draft stored as operations before the full content of the draft is stored (checkpoint)
+COMPOSER_DRAFT_CHECKPOINT_INTERVAL = getattr(settings, 'COMPOSER_DRAFT_CHECKPOINT_INTERVAL', 20)
+# Number of previous checkpoints of a draft kept to undo edits
+COMPOSER_DRAFT_MAX_CHECKPOINTS = getattr(settings, 'COMPOSER_DRAFT_MAX_CHECKPOINTS', 2)
+
+# Maximum number of type contents kept in memory by the schema resolver of each process
+COMPOSER_RESOLVER_CACHE_MAX_ENTRIES = getattr(settings, 'COMPOSER_RESOLVER_CACHE_MAX_ENTRIES', 500)
+# Maximum size (in bytes) of the type contents kept in memory by the schema resolver of each process
+COMPOSER_RESOLVER_CACHE_MAX_SIZE = getattr(settings, 'COMPOSER_RESOLVER_CACHE_MAX_SIZE', 20 * 1024 * 1024)
+# Maximum number of schemas found valid kept in memory by each process
+COMPOSER_SCHEMA_CACHE_MAX_ENTRIES = getattr(settings, 'COMPOSER_SCHEMA_CACHE_MAX_ENTRIES', 500)
+
+# Validation of the schema after each edit: 'immediate', or 'deferred' to only run structural checks after each
+# edit, and validate the schema on save, on demand, or in the background after an idle period
+COMPOSER_VALIDATION_MODE = getattr(settings, 'COMPOSER_VALIDATION_MODE', 'immediate')
+# Idle time (in ms) after an edit before the schema is validated in the background, in deferred mode
+COMPOSER_DEFERRED_VALIDATION_DELAY = getattr(settings, 'COMPOSER_DEFERRED_VALIDATION_DELAY', 5000)
+
+# Renderer of the tree of the schema: 'python' to render it in a single pass over the xsd tree, or 'xslt' to
+# transform it with the xsd2html stylesheet (time quadratic in the number of siblings)
+COMPOSER_RENDERER = getattr(settings, 'COMPOSER_RENDERER', 'python')
+# Alias of the Django cache (see CACHES) storing the renderings of the templates opened in the composer
+COMPOSER_RENDERING_CACHE = getattr(settings, 'COMPOSER_RENDERING_CACHE', 'default')
+# Time (in seconds) the rendering of a template is kept in cache (None to keep it until evicted by the backend)
+COMPOSER_RENDERING_CACHE_TIMEOUT = getattr(settings, 'COMPOSER_RENDERING_CACHE_TIMEOUT', 24 * 60 * 60)
+# Render the templates and types saved from the composer, so opening them is a cache hit
+COMPOSER_RENDERING_CACHE_WARM = getattr(settings, 'COMPOSER_RENDERING_CACHE_WARM', True)
+
+# Alias of the Django cache (see CACHES) storing the catalog of types displayed in the palette of the composer, has to
+# be shared by the processes (see utils.catalog)
+COMPOSER_CATALOG_CACHE = getattr(settings, 'COMPOSER_CATALOG_CACHE', 'default')
+# Time (in seconds) the catalog of types is kept in cache (at most 60 seconds in a LocMemCache, local to each process)
+COMPOSER_CATALOG_CACHE_TIMEOUT = getattr(settings, 'COMPOSER_CATALOG_CACHE_TIMEOUT', 60 * 60)
+
+# Number of worker threads of each process running the jobs (validation and persistence of templates and types)
+COMPOSER_JOB_WORKERS = getattr(settings, 'COMPOSER_JOB_WORKERS', 2)
+# Time (in seconds) the status of a job is kept after its last update
+COMPOSER_JOB_STATUS_TIMEOUT = getattr(settings, 'COMPOSER_JOB_STATUS_TIMEOUT', 3600)
+# Time (in seconds) after its last update before a pending or running job is reported as failed (process stopped)
+COMPOSER_JOB_MAX_DURATION = getattr(settings, 'COMPOSER_JOB_MAX_DURATION', 30 * 60)
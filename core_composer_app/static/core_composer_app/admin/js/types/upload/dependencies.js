@@ -32,4 +32,35 @@ var resolveDependenciesType = function(event)
         buckets: buckets
     };
 	resolve_dependencies(payload);
-};
\ No newline at end of file
+};
+
+
+/**
+ * AJAX call, resolves the dependencies and saves the type (the type is validated and saved by a job)
+ * @param payload
+ */
+var resolve_dependencies = function(payload)
+{
+    var $errors = $("#dependencies-errors");
+    if ($errors.length == 0){
+        $errors = $("<div id='dependencies-errors' class='alert alert-danger'></div>").insertAfter("#dependencies");
+    }
+    $errors.hide();
+
+    $.ajax({
+        url : templateDependenciesPostUrl,
+        type : "POST",
+        dataType: "json",
+        data : payload,
+        success: function(data){
+            waitForJob(data, function(){
+                window.location = typesIndexUrl;
+            }, function(error){
+                $errors.text(error).show();
+            });
+        },
+        error: function(data){
+            $errors.text(data.responseText).show();
+        }
+    });
+};
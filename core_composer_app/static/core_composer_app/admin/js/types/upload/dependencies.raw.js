@@ -1 +1,2 @@
-var templateDependenciesPostUrl = "{% url 'admin:core_composer_app_resolve_dependencies' %}";
\ No newline at end of file
+var templateDependenciesPostUrl = "{% url 'admin:core_composer_app_resolve_dependencies' %}";
+var typesIndexUrl = "{% url 'admin:core_composer_app_types' %}";
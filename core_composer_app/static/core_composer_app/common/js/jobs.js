@@ -0,0 +1,36 @@
+/**
+ * Interval (in ms) between two requests of the status of a job
+ */
+var jobStatusInterval = 1000;
+
+/**
+ * Wait for the end of a job submitted by an AJAX call (response with a job_id and a status_url)
+ * @param response response of the AJAX call
+ * @param success function called with the result of the job
+ * @param error function called with the error message of the job
+ * @param progress function called with the progress message of the job (optional)
+ */
+var waitForJob = function(response, success, error, progress){
+    $.ajax({
+        url : response.status_url,
+        type : "GET",
+        dataType: "json",
+        success: function(data){
+            if (data.status == "success"){
+                success(data.result);
+            }else if (data.status == "failure"){
+                error(data.error);
+            }else{
+                if (progress !== undefined){
+                    progress(data.message);
+                }
+                setTimeout(function(){
+                    waitForJob(response, success, error, progress);
+                }, jobStatusInterval);
+            }
+        },
+        error: function(data){
+            error(data.responseText);
+        }
+    });
+};
@@ -2,6 +2,12 @@
  * Load controllers for build template page
  */
 $(document).ready(function() {
+    // send the id of the draft of the page with the AJAX calls
+    $.ajaxSetup({
+        headers: {"X-Compose-Draft": $("#draftID").html()}
+    });
+    draftRevision = parseInt($("#draftRevision").html());
+
 	// new template: offer to rename root type
 	var $templateID = $("#templateID");
 	if ($templateID.html() == "new"){
@@ -32,8 +38,15 @@ var save_template = function(){
                 templateName: templateName
             },
             success: function(data){
-                $("#save-template-modal").modal("hide");
-                displaySaveSuccess();
+                // the template is validated and saved by a job
+                waitForJob(data, function(){
+                    $("#save-template-modal").modal("hide");
+                    displaySaveSuccess();
+                }, function(error){
+                    $("#new-template-error").html(error);
+                }, function(message){
+                    $("#new-template-error").html(message);
+                });
             },
             error: function(data){
                 $("#new-template-error").html(data.responseText);
@@ -70,8 +83,15 @@ var save_type = function(){
                 templateID: templateID
             },
             success: function(data){
-                $("#save-type-modal").modal("hide");
-                displaySaveSuccess();
+                // the type is validated and saved by a job
+                waitForJob(data, function(){
+                    $("#save-type-modal").modal("hide");
+                    displaySaveSuccess();
+                }, function(error){
+                    $("#new-type-error").html(error);
+                }, function(message){
+                    $("#new-type-error").html(message);
+                });
             },
             error: function (data) {
                 $("#new-type-error").html(data.responseText);
@@ -82,6 +102,166 @@ var save_type = function(){
     }
 };
 
+/**
+ * AJAX call, applies a list of operations to the schema in a single request
+ * (e.g. [{action: "rename", xpath: "xs:element", newName: "name"}, {action: "delete", xpath: "..."}])
+ * @param operations list of operations
+ * @param success function called with the result of each operation
+ * @param error function called with the error and the result of each operation applied
+ */
+var apply_operations = function(operations, success, error){
+    $.ajax({
+        url : applyOperationsUrl,
+        type : "POST",
+        dataType: "json",
+        data:{
+            operations: JSON.stringify(operations)
+        },
+        success: function(data){
+            success(data.results);
+        },
+        error: function(data){
+            var response = data.responseJSON || {error: data.responseText, results: []};
+            error(response.error, response.results);
+        }
+    });
+};
+
+/**
+ * Urls of the AJAX calls editing the schema
+ */
+var editUrls = [insertElementSequenceUrl, changeXsdTypeUrl, renameElementUrl, deleteElementUrl,
+    setElementOccurrencesUrl, applyOperationsUrl, changeRootTypeNameUrl];
+var schemaCheckTimeout = null;
+
+/**
+ * Deferred validation: schedule a check of the schema after an idle period
+ */
+var scheduleSchemaCheck = function(){
+    $("#schema-validation-status").html("<i class='fa fa-clock-o'></i> Not yet validated");
+    if (schemaCheckTimeout !== null){
+        clearTimeout(schemaCheckTimeout);
+    }
+    schemaCheckTimeout = setTimeout(check_schema, parseInt($("#validationDelay").html()));
+};
+
+/**
+ * AJAX call, validates the schema
+ */
+var check_schema = function(){
+    var $status = $("#schema-validation-status");
+    if (schemaCheckTimeout !== null){
+        clearTimeout(schemaCheckTimeout);
+        schemaCheckTimeout = null;
+    }
+    $.ajax({
+        url : checkSchemaUrl,
+        type : "POST",
+        dataType: "json",
+        success: function(){
+            $status.html("<i class='fa fa-check'></i> Valid schema");
+        },
+        error: function(data){
+            $status.html("<i class='fa fa-exclamation-triangle'></i> ").append($("<span>").text(data.responseText));
+        }
+    });
+};
+
+/**
+ * Revision of the draft known by the page, sent with the AJAX calls: edits can be sent without waiting for the
+ * previous ones, the server rejects them if the draft was modified in a way they can not be applied to
+ */
+var draftRevision = null;
+
+$.ajaxPrefilter(function(options, originalOptions, jqXHR){
+    if (draftRevision !== null){
+        jqXHR.setRequestHeader("X-Compose-Draft-Revision", draftRevision);
+    }
+});
+
+/**
+ * Keep the most recent revision of the draft returned by the server
+ * @param xhr
+ */
+var updateDraftRevision = function(xhr){
+    if (xhr.responseJSON && xhr.responseJSON.revision !== undefined && xhr.responseJSON.revision !== null){
+        draftRevision = Math.max(draftRevision, xhr.responseJSON.revision);
+    }
+};
+
+$(document).ajaxError(function(event, xhr){
+    updateDraftRevision(xhr);
+    if (xhr.status == 409){
+        // edit conflicting with another modification of the draft: display the current schema
+        if (xhr.responseJSON && xhr.responseJSON.xsd_form){
+            $("#xsd_form").html(xhr.responseJSON.xsd_form);
+        }
+        $( "#validate-error" ).html("The schema was modified by another request. The current schema is displayed, " +
+            "please try again.");
+        $( "#error-modal" ).modal("show");
+    }
+});
+
+$(document).ajaxSuccess(function(event, xhr, settings){
+    updateDraftRevision(xhr);
+    if (editUrls.indexOf(settings.url) >= 0){
+        // a new edit can be cancelled, and cancels the undone edits
+        setHistoryButtons(true, false);
+        if ($("#validationMode").html() == "deferred"){
+            scheduleSchemaCheck();
+        }
+    }
+});
+
+/**
+ * Enable or disable the undo/redo buttons
+ * @param canUndo
+ * @param canRedo
+ */
+var setHistoryButtons = function(canUndo, canRedo){
+    $(".btn.undo").attr("disabled", !canUndo);
+    $(".btn.redo").attr("disabled", !canRedo);
+};
+
+/**
+ * AJAX call, cancels the last edit or applies again the last cancelled edit
+ * @param url undo or redo url
+ */
+var move_in_history = function(url){
+    $.ajax({
+        url : url,
+        type : "POST",
+        dataType: "json",
+        success: function(data){
+            // display the restored schema
+            $("#xsd_form").html(data.xsd_form);
+            setHistoryButtons(data.can_undo, data.can_redo);
+            if ($("#validationMode").html() == "deferred"){
+                scheduleSchemaCheck();
+            }
+        },
+        error: function(data){
+            // conflicts are displayed by the ajaxError handler
+            if (data.status != 409){
+                $( "#validate-error" ).html(data.responseText);
+                $( "#error-modal" ).modal("show");
+            }
+        }
+    });
+};
+
+var undo = function(){
+    if (!$(this).attr("disabled")){
+        move_in_history(undoUrl);
+    }
+};
+
+var redo = function(){
+    if (!$(this).attr("disabled")){
+        move_in_history(redoUrl);
+    }
+};
+
 var displaySaveSuccess = function(){
     var $save_success_modal = $("#save-success-modal");
     $save_success_modal.modal("show");
@@ -142,6 +322,9 @@ var change_root_type_name = function(typeName){
 
 $(document).on('click', '.btn.save-template', saveTemplate);
 $(document).on('click', '.btn.save-type', saveType);
+$(document).on('click', '.btn.check-schema', check_schema);
+$(document).on('click', '.btn.undo', undo);
+$(document).on('click', '.btn.redo', redo);
 
 $(document).on('click', '#save-template', save_template);
 $(document).on('click', '#save-type', save_type);
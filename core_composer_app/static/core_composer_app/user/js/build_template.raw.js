@@ -4,6 +4,10 @@ var renameElementUrl = "{% url 'core_composer_rename_element' %}";
 var deleteElementUrl = "{% url 'core_composer_delete_element' %}";
 var getElementOccurrencesUrl = "{% url 'core_composer_get_element_occurrences' %}";
 var setElementOccurrencesUrl = "{% url 'core_composer_set_element_occurrences' %}";
+var applyOperationsUrl = "{% url 'core_composer_apply_operations' %}";
+var undoUrl = "{% url 'core_composer_undo' %}";
+var redoUrl = "{% url 'core_composer_redo' %}";
+var checkSchemaUrl = "{% url 'core_composer_check_schema' %}";
 var saveTemplateUrl = "{% url 'core_composer_save_template' %}";
 var saveTypeUrl = "{% url 'core_composer_save_type' %}";
 var changeRootTypeNameUrl = "{% url 'core_composer_change_root_type_name' %}";
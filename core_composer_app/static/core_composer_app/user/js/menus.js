@@ -103,14 +103,6 @@ var insertElementSequence = function(event){
     var insertButton = event.target;
     var typeName = $(insertButton).parent().siblings(':first').text();
     var typeID = $(insertButton).parent().siblings(':first').attr('templateid');
-    var namespace = $(target).text().split(":")[0];
-
-    // get element's value xpath
-    var path = namespace + ":element";
-    var nbElement = $(parent).parent().children("ul").children().length;
-    if (nbElement > 0){
-        path = namespace + ":element[" + String(nbElement + 1) + "]";
-    }
 
     // get xpath to element
     var xpath = getXPath(target);
@@ -123,9 +115,7 @@ var insertElementSequence = function(event){
         data:{
         	typeID: typeID,
         	xpath: xpath,
-        	typeName: typeName,
-            namespace: namespace,
-            path: path
+        	typeName: typeName
         },
         success: function(data){
             // add the new element to the html tree
@@ -195,13 +185,8 @@ var change_xsd_type = function(){
         	newType: newType
         },
         success: function(data){
-            // get value of type to change
-            var oldType = $(target).text().split(":")[1];
-            // update html text
-            $(target).html($(target).html().replace(oldType, newType));
-            // update xpath value
-            var path = $(target).parent().siblings(".path");
-            path.html(path.html().replace(oldType, newType));
+            // replace the element in the html tree
+            replaceElement(target, data.element);
             $("#change-element-type-modal").modal("hide");
         }
     });
@@ -237,8 +222,8 @@ var rename_element = function(){
                 newName: newName
             },
             success: function(data){
-                // set new name in html tree
-                $(target).parent().siblings('.name').html(newName);
+                // replace the element in the html tree
+                replaceElement(target, data.element);
                 $("#element-name-modal").modal("hide");
             },
             error: function(data){
@@ -378,19 +363,23 @@ var set_occurrences = function(xpath, minOccurs, maxOccurs){
         	maxOccurs: maxOccurs
         },
         success: function(data){
-            var occursStr = "( " + minOccurs + " , ";
-            if (maxOccurs == "unbounded"){
-                occursStr += "*";
-            }else{
-                occursStr += maxOccurs;
-            }
-            occursStr += " )";
-            $(target).parent().siblings(".occurs").html(occursStr);
+            // replace the element in the html tree
+            replaceElement(target, data.element);
         }
     });
 };
 
 
+/**
+ * Replaces the node of the html tree containing the selected element by its new rendering
+ * @param element selected element
+ * @param elementHtml rendering of the element, returned by the server
+ */
+var replaceElement = function(element, elementHtml){
+    $(element).closest("li").replaceWith(elementHtml);
+};
+
+
 /**
  * True, if valid integer
  * @param value
@@ -0,0 +1,11 @@
+<?xml version="1.0" encoding="UTF-8"?>
+
+<xsl:stylesheet xmlns:xsl="http://www.w3.org/1999/XSL/Transform"
+	version="1.0">
+	<xsl:import href="xsd2html.xsl" />
+	<xsl:output method="html" indent="yes" encoding="UTF-8" />
+	<!-- Only render the marked element, in the context of the whole schema -->
+	<xsl:template match="/">
+		<xsl:apply-templates select="//*[@composer-render]" />
+	</xsl:template>
+</xsl:stylesheet>
@@ -39,10 +39,22 @@ urlpatterns = [
         name='core_composer_get_element_occurrences'),
     url(r'^set-element-occurrences$', user_ajax.set_element_occurrences,
         name='core_composer_set_element_occurrences'),
+    url(r'^render-element$', user_ajax.render_element,
+        name='core_composer_render_element'),
+    url(r'^apply-operations$', user_ajax.apply_operations,
+        name='core_composer_apply_operations'),
+    url(r'^undo$', user_ajax.undo,
+        name='core_composer_undo'),
+    url(r'^redo$', user_ajax.redo,
+        name='core_composer_redo'),
+    url(r'^check-schema$', user_ajax.check_schema,
+        name='core_composer_check_schema'),
     url(r'^save-template$', user_ajax.save_template,
         name='core_composer_save_template'),
     url(r'^save-type$', user_ajax.save_type,
         name='core_composer_save_type'),
+    url(r'^job-status$', user_ajax.get_job_status,
+        name='core_composer_job_status'),
 
     url(r'^rest/', include('core_composer_app.rest.urls')),
 ]
@@ -0,0 +1,117 @@
+"""Cache utils for Composer app
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """Thread safe Least Recently Used cache, bounded by a number of entries and a total size.
+    """
+
+    def __init__(self, max_entries, max_size=None):
+        """Initialize the cache.
+
+        Args:
+            max_entries: maximum number of entries kept in the cache
+            max_size: maximum total size of the entries (None for no limit)
+
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """Return the value stored for the key, and mark it as most recently used.
+
+        Args:
+            key:
+            default: value returned if the key is not in the cache
+
+        Returns:
+
+        """
+        with self._lock:
+            try:
+                entry = self._entries.pop(key)
+            except KeyError:
+                return default
+            self._entries[key] = entry
+            return entry[0]
+
+    def set(self, key, value, size=0):
+        """Store a value in the cache, evict least recently used entries if needed.
+
+        Args:
+            key:
+            value:
+            size: size of the value, counted against max_size
+
+        Returns:
+
+        """
+        with self._lock:
+            self._remove(key)
+            # do not flush the whole cache for a single entry larger than the limit
+            if self.max_size is not None and size > self.max_size:
+                return
+            self._entries[key] = (value, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or \
+                    (self.max_size is not None and self._size > self.max_size):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def pop(self, key, default=None):
+        """Remove the key from the cache, and return its value.
+
+        Args:
+            key:
+            default: value returned if the key is not in the cache
+
+        Returns:
+
+        """
+        with self._lock:
+            entry = self._remove(key)
+            return entry[0] if entry is not None else default
+
+    def clear(self):
+        """Remove all entries from the cache.
+
+        Returns:
+
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self):
+        """Return the total size of the entries.
+
+        Returns:
+
+        """
+        return self._size
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        """Remove an entry, update the total size.
+
+        Args:
+            key:
+
+        Returns:
+
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
+        return entry
@@ -0,0 +1,181 @@
+"""Catalog utils for Composer app
+
+The catalog lists the types displayed in the palette of the composer: the buckets and their types, the types that
+are not in a bucket, and the built-in types. The global catalog is shared by all users, the types of each user are
+stored separately. Both are stored in the COMPOSER_CATALOG_CACHE cache, and removed from it when a bucket, a type or
+a type version manager is saved or deleted.
+
+The cache has to be shared by the processes (e.g. memcached, redis) to be invalidated by all of them. With a cache
+local to each process (LocMemCache, the default backend of Django), the catalog is only kept LOCAL_CACHE_TIMEOUT
+seconds, so the changes made through another process are displayed after this delay.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from mongoengine import signals
+
+from core_composer_app.components.bucket import api as bucket_api
+from core_composer_app.components.bucket.models import Bucket
+from core_composer_app.components.type.models import Type
+from core_composer_app.components.type_version_manager import api as type_version_manager_api
+from core_composer_app.components.type_version_manager.models import TypeVersionManager
+from core_composer_app.settings import COMPOSER_CATALOG_CACHE, COMPOSER_CATALOG_CACHE_TIMEOUT
+from core_composer_app.utils import operations as operations_utils
+from xml_utils.xsd_types.xsd_types import get_xsd_types
+
+# time (in seconds) the catalog is kept in a cache local to each process, not invalidated by the other processes
+LOCAL_CACHE_TIMEOUT = 60
+
+
+def get_catalog(user_id):
+    """Return the catalog of types of a user.
+
+    Args:
+        user_id:
+
+    Returns:
+        dict: buckets, built_in_types, no_buckets_types and user_types. Types are dicts with current (id of the
+        current version), title and is_disabled, buckets are dicts with label, color and types.
+
+    """
+    cache = _get_cache()
+
+    catalog = cache.get(_get_key())
+    if catalog is None:
+        catalog = _build_catalog()
+        cache.set(_get_key(), catalog, _get_timeout())
+
+    user_types = cache.get(_get_key(user_id))
+    if user_types is None:
+        user_types = [_get_type_entry(version_manager)
+                      for version_manager in type_version_manager_api.get_summaries_by_user(str(user_id))]
+        cache.set(_get_key(user_id), user_types, _get_timeout())
+
+    return dict(catalog, user_types=user_types)
+
+
+def invalidate(user_id=None):
+    """Remove the global catalog from the cache, and the types of a user if given.
+
+    Args:
+        user_id:
+
+    Returns:
+
+    """
+    keys = [_get_key()]
+    if user_id is not None:
+        keys.append(_get_key(user_id))
+    _get_cache().delete_many(keys)
+
+
+def init_signals():
+    """Invalidate the catalog when buckets, types and type version managers are saved or deleted.
+
+    Returns:
+
+    """
+    for signal in [signals.post_save, signals.post_delete]:
+        signal.connect(_on_catalog_document_changed, sender=Bucket)
+        signal.connect(_on_catalog_document_changed, sender=Type)
+        signal.connect(_on_type_version_manager_changed, sender=TypeVersionManager)
+
+
+def _on_catalog_document_changed(sender, document, **kwargs):
+    """Invalidate the global catalog.
+
+    Args:
+        sender:
+        document:
+        **kwargs:
+
+    Returns:
+
+    """
+    invalidate()
+
+
+def _on_type_version_manager_changed(sender, document, **kwargs):
+    """Invalidate the global catalog, and the types of the owner of the type version manager.
+
+    Args:
+        sender:
+        document:
+        **kwargs:
+
+    Returns:
+
+    """
+    invalidate(document.user)
+
+
+def _build_catalog():
+    """Build the global catalog from the database.
+
+    Returns:
+
+    """
+    # the types of all buckets are loaded at once, with only the fields displayed in the palette
+    buckets = bucket_api.get_all_descriptions()
+    type_ids = list(set(type_id for bucket in buckets for type_id in bucket.get('types', [])))
+    version_managers = dict((version_manager.id, version_manager)
+                            for version_manager in type_version_manager_api.get_summaries_by_ids(type_ids))
+
+    return {
+        'buckets': [{'label': bucket['label'],
+                     'color': bucket.get('color'),
+                     'types': [_get_type_entry(version_managers[type_id]) for type_id in bucket.get('types', [])
+                               if type_id in version_managers]}
+                    for bucket in buckets],
+        'no_buckets_types': [_get_type_entry(version_manager)
+                             for version_manager in type_version_manager_api.get_no_buckets_types()],
+        'built_in_types': [{'current': operations_utils.BUILT_IN_TYPE, 'title': built_in_type, 'is_disabled': False}
+                           for built_in_type in get_xsd_types()],
+    }
+
+
+def _get_type_entry(version_manager):
+    """Return the entry of a type in the catalog.
+
+    Args:
+        version_manager:
+
+    Returns:
+
+    """
+    return {'current': str(version_manager.current),
+            'title': version_manager.title,
+            'is_disabled': version_manager.is_disabled}
+
+
+def _get_cache():
+    """Return the cache of the catalog.
+
+    Returns:
+
+    """
+    return caches[COMPOSER_CATALOG_CACHE]
+
+
+def _get_timeout():
+    """Return the time the catalog is kept in cache.
+
+    Returns:
+
+    """
+    if isinstance(_get_cache(), LocMemCache):
+        return min(COMPOSER_CATALOG_CACHE_TIMEOUT, LOCAL_CACHE_TIMEOUT)
+    return COMPOSER_CATALOG_CACHE_TIMEOUT
+
+
+def _get_key(user_id=None):
+    """Return the cache key of the global catalog, or of the types of a user.
+
+    Args:
+        user_id:
+
+    Returns:
+
+    """
+    if user_id is None:
+        return 'core_composer_app:catalog'
+    return 'core_composer_app:catalog:user:{}'.format(user_id)
@@ -0,0 +1,117 @@
+"""Colors utils for Composer app
+
+The colors of the buckets are taken in order from a deterministic palette: the hues are spread by the golden angle,
+so consecutive colors are far apart on the color wheel, and each new round of hues uses a different saturation and
+brightness. The colors in use are kept in memory by each process, and reloaded when a color was taken by another
+process.
+"""
+import colorsys
+import threading
+
+# golden ratio conjugate, fraction of the color wheel between two consecutive hues
+GOLDEN_RATIO_CONJUGATE = 0.618033988749895
+# number of consecutive hues using the same saturation and brightness
+HUES_PER_ROUND = 12
+# (saturation, brightness) of each round of hues
+ROUNDS = [(0.65, 0.85), (0.45, 0.95), (0.85, 0.70), (0.35, 0.80), (0.75, 0.55)]
+
+_used_colors = None
+_next_index = 0
+_colors_lock = threading.Lock()
+
+
+def get_palette_color(index):
+    """Return the color at the given index of the palette.
+
+    Args:
+        index:
+
+    Returns:
+        hexadecimal color string
+
+    """
+    hue = (index * GOLDEN_RATIO_CONJUGATE) % 1.0
+    saturation, brightness = ROUNDS[(index // HUES_PER_ROUND) % len(ROUNDS)]
+    red, green, blue = colorsys.hsv_to_rgb(hue, saturation, brightness)
+    return '#{:02X}{:02X}{:02X}'.format(int(round(red * 255)), int(round(green * 255)), int(round(blue * 255)))
+
+
+def allocate_color(get_used_colors):
+    """Return the next color of the palette that is not in use, and mark it as used.
+
+    Args:
+        get_used_colors: function returning the colors in use, called to load them on first allocation
+
+    Returns:
+
+    """
+    global _used_colors, _next_index
+    with _colors_lock:
+        if _used_colors is None:
+            _load(get_used_colors)
+
+        # the palette never runs out of colors, only the colors in use are skipped
+        while True:
+            color = get_palette_color(_next_index)
+            _next_index += 1
+            if color not in _used_colors:
+                _used_colors.add(color)
+                return color
+
+
+def is_used(color, get_used_colors):
+    """Reload the colors in use, and return True if the color is one of them.
+
+    Args:
+        color:
+        get_used_colors: function returning the colors in use
+
+    Returns:
+
+    """
+    with _colors_lock:
+        _load(get_used_colors)
+        return color in _used_colors
+
+
+def release_color(color):
+    """Mark a color as not used anymore, so it is allocated again before the next colors of the palette.
+
+    Args:
+        color:
+
+    Returns:
+
+    """
+    global _next_index
+    with _colors_lock:
+        if _used_colors is not None and color is not None:
+            _used_colors.discard(color.upper())
+            # the allocation restarts from the beginning of the palette, skipping the colors in use
+            _next_index = 0
+
+
+def clear():
+    """Clear the colors in use kept in memory.
+
+    Returns:
+
+    """
+    global _used_colors, _next_index
+    with _colors_lock:
+        _used_colors = None
+        _next_index = 0
+
+
+def _load(get_used_colors):
+    """Load the colors in use, and restart the allocation from the beginning of the palette.
+
+    Args:
+        get_used_colors:
+
+    Returns:
+
+    """
+    global _used_colors, _next_index
+    _used_colors = set(color.upper() for color in get_used_colors() if color is not None)
+    _next_index = 0
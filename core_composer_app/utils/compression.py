@@ -0,0 +1,48 @@
+"""Compression utils for Composer app
+
+Contents of drafts are compressed with zlib when larger than COMPOSER_DRAFT_COMPRESSION_THRESHOLD bytes. The first
+byte of a stored content tells whether the rest is compressed, so the level and threshold can change at any time.
+"""
+import zlib
+
+from core_composer_app.settings import COMPOSER_DRAFT_COMPRESSION_LEVEL, COMPOSER_DRAFT_COMPRESSION_THRESHOLD
+
+RAW_FORMAT = b'r'
+ZLIB_FORMAT = b'z'
+
+
+def compress(content):
+    """Return the stored form of a content.
+
+    Args:
+        content: unicode or utf-8 encoded string
+
+    Returns:
+
+    """
+    if not isinstance(content, bytes):
+        content = content.encode('utf-8')
+
+    # small contents do not benefit from compression
+    if COMPOSER_DRAFT_COMPRESSION_LEVEL == 0 or len(content) < COMPOSER_DRAFT_COMPRESSION_THRESHOLD:
+        return RAW_FORMAT + content
+    return ZLIB_FORMAT + zlib.compress(content, COMPOSER_DRAFT_COMPRESSION_LEVEL)
+
+
+def decompress(stored_content):
+    """Return the content of its stored form.
+
+    Args:
+        stored_content:
+
+    Returns:
+        the content, as unicode.
+
+    """
+    stored_content = bytes(stored_content)
+    content_format, content = stored_content[:1], stored_content[1:]
+    if content_format == ZLIB_FORMAT:
+        content = zlib.decompress(content)
+    elif content_format != RAW_FORMAT:
+        raise ValueError('Unknown format of stored content.')
+    return content.decode('utf-8')
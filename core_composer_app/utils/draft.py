@@ -0,0 +1,485 @@
+"""Draft utils for Composer app
+
+The schema being composed (draft) is stored in a ComposeDraft document, as a checkpoint (compressed content of the
+schema) and a log of the edits applied since the checkpoint, each edit being the list of operations applied by a
+request. A new checkpoint is stored every COMPOSER_DRAFT_CHECKPOINT_INTERVAL edits, and the previous checkpoints are
+kept to cancel (undo) and apply again (redo) edits. The session only stores the id of the last draft of the user.
+
+Each process keeps the tree of the most recently used drafts in memory, so edits work on the live tree instead of
+rebuilding it on every request.
+"""
+import threading
+
+from bson.binary import Binary
+
+from core_composer_app.commons.exceptions import DraftConflictError
+from core_composer_app.components.compose_draft import api as compose_draft_api
+from core_composer_app.components.compose_draft.models import ComposeDraft
+from core_composer_app.settings import COMPOSER_DRAFT_CACHE_MAX_ENTRIES, COMPOSER_DRAFT_CACHE_MAX_SIZE, \
+    COMPOSER_DRAFT_CHECKPOINT_INTERVAL, COMPOSER_DRAFT_MAX_CHECKPOINTS
+from core_composer_app.utils import operations as operations_utils
+from core_composer_app.utils.cache import LRUCache
+from core_composer_app.utils.xml import build_xsd_tree, get_schema_locations
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+DRAFT_ID_KEY = 'composeDraftId'
+DRAFT_ID_HEADER = 'HTTP_X_COMPOSE_DRAFT'
+DRAFT_ID_PARAMETER = 'draft_id'
+
+# estimated memory (in bytes) of a node of a parsed tree, with its attributes
+TREE_NODE_SIZE = 512
+
+# draft id -> (version, xsd tree)
+_tree_cache = LRUCache(COMPOSER_DRAFT_CACHE_MAX_ENTRIES, COMPOSER_DRAFT_CACHE_MAX_SIZE)
+# striped locks, serialize the edits of a same draft within the process
+_locks = [threading.RLock() for _ in range(64)]
+
+
+def create_draft(request, xsd_string, includes, xsd_tree=None):
+    """Create a new draft for the user, and make it the current draft of the session.
+
+    Args:
+        request:
+        xsd_string: initial content of the draft
+        includes: list of schemaLocation of the included/imported types
+        xsd_tree: tree of the content if already built, kept in cache for the next edits
+
+    Returns:
+
+    """
+    compose_draft = ComposeDraft(user=str(request.user.id),
+                                 content=ComposeDraft.compress(xsd_string),
+                                 includes=includes)
+    compose_draft_api.insert(compose_draft)
+    request.session[DRAFT_ID_KEY] = str(compose_draft.id)
+    if xsd_tree is not None:
+        _cache_draft_tree(compose_draft, xsd_tree)
+    return compose_draft
+
+
+def get_draft(request):
+    """Return the draft of the request, without the contents of its checkpoints.
+
+    The draft id is sent in the X-Compose-Draft header or in the draft_id parameter, the current draft of the
+    session is used otherwise.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    return compose_draft_api.get_by_id(_get_draft_id(request), request.user.id)
+
+
+def get_draft_string(compose_draft):
+    """Return the content of the draft.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    return XSDTree.tostring(get_draft_tree(compose_draft))
+
+
+def get_draft_tree(compose_draft):
+    """Return the xsd tree of the draft, build it from the last checkpoint only if the tree is not in cache.
+
+    The returned tree is shared: use lock_draft to modify it, and discard_draft_tree if a modification fails.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    cached = _tree_cache.get(str(compose_draft.id))
+    # the cached tree is only valid if the draft was not modified by another process
+    if cached is not None and cached[0] == compose_draft.version:
+        return cached[1]
+
+    compose_draft_api.load_contents(compose_draft)
+    xsd_tree = _build_draft_tree(ComposeDraft.decompress(compose_draft.content), compose_draft.operations)
+    _cache_draft_tree(compose_draft, xsd_tree)
+    return xsd_tree
+
+
+def check_draft_revision(compose_draft, revision, rebase=True):
+    """Check that operations sent for a revision of the draft can be applied to its current version.
+
+    Operations sent for an older revision are applied to the current version (rebased) if the structure of the
+    draft did not change since, so their xpaths still designate the same elements.
+
+    Args:
+        compose_draft:
+        revision: revision of the draft known by the client, None to skip the check
+        rebase: accept an older revision if the structure of the draft did not change since (False for undo/redo,
+        which would move in a history the client has not seen)
+
+    Returns:
+
+    """
+    if revision is None or int(revision) == compose_draft.version:
+        return
+    if rebase and compose_draft.structure_version <= int(revision) < compose_draft.version:
+        return
+    raise DraftConflictError("The schema was modified by another request.", revision=compose_draft.version)
+
+
+def save_draft_operations(compose_draft, xsd_tree, operations, validated=True):
+    """Record operations applied to the tree of the draft, and make the tree the current version of the draft.
+
+    Only the operations are written, the full content of the draft is written every
+    COMPOSER_DRAFT_CHECKPOINT_INTERVAL edits.
+
+    Args:
+        compose_draft:
+        xsd_tree: tree of the draft, after the operations were applied
+        operations: list of operations applied to the tree
+        validated: True if the tree was validated after the operations were applied
+
+    Returns:
+
+    """
+    # included types of the inserted types
+    includes = [operations_utils.get_include_url(operation) for operation in operations]
+    includes = [include_url for include_url in includes if include_url is not None]
+
+    update_document = _push_draft_operations(compose_draft, xsd_tree, [dict(operation) for operation in operations])
+    # a new edit cancels the undone edits
+    update_document['$set']['redo'] = []
+    update_document['$set']['validated'] = validated
+    if any(operation.get('action') in operations_utils.STRUCTURAL_ACTIONS for operation in operations):
+        _set_structure_changed(compose_draft, update_document)
+    if len(includes) > 0:
+        update_document['$addToSet'] = {'includes': {'$each': includes}}
+
+    _update_draft(compose_draft, xsd_tree, update_document)
+    compose_draft.redo = []
+    compose_draft.validated = validated
+    compose_draft.includes = compose_draft.includes + [include_url for include_url in includes
+                                                       if include_url not in compose_draft.includes]
+
+
+def undo_draft(compose_draft, validated=True):
+    """Cancel the last edit of the draft.
+
+    Args:
+        compose_draft:
+        validated: True if the edits applied to the draft were validated
+
+    Returns:
+        the tree of the draft, None if there is no edit to cancel.
+
+    """
+    if not can_undo_draft(compose_draft):
+        return None
+
+    compose_draft_api.load_contents(compose_draft)
+    content = compose_draft.content
+    edits = list(compose_draft.operations)
+    checkpoint_contents = list(compose_draft.checkpoint_contents)
+    checkpoint_operations = list(compose_draft.checkpoint_operations)
+
+    if len(edits) == 0:
+        # go back to the previous checkpoint
+        content = checkpoint_contents.pop()
+        edits = list(checkpoint_operations.pop())
+
+    cancelled_edit = edits.pop()
+    xsd_tree = _build_draft_tree(ComposeDraft.decompress(content), edits)
+    redo_edits = compose_draft.redo + [cancelled_edit]
+    includes = get_schema_locations(xsd_tree)
+
+    update_document = {'$set': {'content': Binary(content),
+                                'operations': edits,
+                                'checkpoint_contents': [Binary(checkpoint_content)
+                                                        for checkpoint_content in checkpoint_contents],
+                                'checkpoint_operations': checkpoint_operations,
+                                'redo': redo_edits,
+                                'includes': includes,
+                                'validated': validated}}
+    _set_structure_changed(compose_draft, update_document)
+
+    _update_draft(compose_draft, xsd_tree, update_document)
+    compose_draft.content = content
+    compose_draft.operations = edits
+    compose_draft.checkpoint_contents = checkpoint_contents
+    compose_draft.checkpoint_operations = checkpoint_operations
+    compose_draft.redo = redo_edits
+    compose_draft.includes = includes
+    compose_draft.validated = validated
+    return xsd_tree
+
+
+def redo_draft(compose_draft, validated=True):
+    """Apply again the last cancelled edit of the draft.
+
+    Args:
+        compose_draft:
+        validated: True if the edits applied to the draft were validated
+
+    Returns:
+        the tree of the draft, None if there is no edit to apply again.
+
+    """
+    if not can_redo_draft(compose_draft):
+        return None
+
+    redo_edits = list(compose_draft.redo)
+    operations = redo_edits.pop()
+    xsd_tree = get_draft_tree(compose_draft)
+    try:
+        xsd_tree = _apply_draft_operations(xsd_tree, operations)
+    except Exception:
+        discard_draft_tree(compose_draft)
+        raise
+
+    includes = get_schema_locations(xsd_tree)
+    update_document = _push_draft_operations(compose_draft, xsd_tree, operations)
+    update_document['$set']['redo'] = redo_edits
+    update_document['$set']['includes'] = includes
+    update_document['$set']['validated'] = validated
+    _set_structure_changed(compose_draft, update_document)
+
+    _update_draft(compose_draft, xsd_tree, update_document)
+    compose_draft.redo = redo_edits
+    compose_draft.includes = includes
+    compose_draft.validated = validated
+    return xsd_tree
+
+
+def can_undo_draft(compose_draft):
+    """Return True if the draft has an edit to cancel.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    return len(compose_draft.operations) > 0 or len(compose_draft.checkpoint_operations) > 0
+
+
+def can_redo_draft(compose_draft):
+    """Return True if the draft has a cancelled edit to apply again.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    return len(compose_draft.redo) > 0
+
+
+def discard_draft_tree(compose_draft):
+    """Remove the tree of the draft from the cache (e.g. after a failed modification).
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    _tree_cache.pop(str(compose_draft.id))
+
+
+def lock_draft(request):
+    """Return the lock serializing the modifications of the draft of the request in this process.
+
+    The draft has to be loaded after the lock is acquired.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    return _locks[hash(_get_draft_id(request)) % len(_locks)]
+
+
+def get_draft_includes(compose_draft):
+    """Return the list of schemaLocation of the types included/imported in the draft.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    return list(compose_draft.includes)
+
+
+def is_draft_validated(compose_draft):
+    """Return True if the current content of the draft was validated.
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    return compose_draft.validated
+
+
+def set_draft_validated(compose_draft, validated):
+    """Set whether the current content of the draft was validated.
+
+    Args:
+        compose_draft:
+        validated:
+
+    Returns:
+
+    """
+    if compose_draft.validated != validated:
+        compose_draft_api.update(compose_draft, {'$set': {'validated': validated}})
+        compose_draft.validated = validated
+
+
+def _get_draft_id(request):
+    """Return the id of the draft of the request.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    return request.META.get(DRAFT_ID_HEADER) or \
+        request.GET.get(DRAFT_ID_PARAMETER) or \
+        request.session.get(DRAFT_ID_KEY)
+
+
+def _set_structure_changed(compose_draft, update_document):
+    """Add to the update of the draft that its structure changes with the new version.
+
+    Args:
+        compose_draft:
+        update_document:
+
+    Returns:
+
+    """
+    compose_draft.structure_version = compose_draft.version + 1
+    update_document['$set']['structure_version'] = compose_draft.structure_version
+
+
+def _push_draft_operations(compose_draft, xsd_tree, operations):
+    """Return the update adding an edit to the log of the draft, storing a checkpoint if the log is full.
+
+    Args:
+        compose_draft:
+        xsd_tree: tree of the draft, after the operations were applied
+        operations:
+
+    Returns:
+
+    """
+    edits = compose_draft.operations + [operations]
+
+    if len(edits) < COMPOSER_DRAFT_CHECKPOINT_INTERVAL:
+        compose_draft.operations = edits
+        # only the new edit is written
+        return {'$set': {}, '$push': {'operations': operations}}
+
+    compose_draft_api.load_contents(compose_draft)
+    checkpoint_contents = compose_draft.checkpoint_contents + [compose_draft.content]
+    checkpoint_operations = compose_draft.checkpoint_operations + [edits]
+    # older edits can not be cancelled anymore
+    if COMPOSER_DRAFT_MAX_CHECKPOINTS > 0:
+        checkpoint_contents = checkpoint_contents[-COMPOSER_DRAFT_MAX_CHECKPOINTS:]
+        checkpoint_operations = checkpoint_operations[-COMPOSER_DRAFT_MAX_CHECKPOINTS:]
+    else:
+        checkpoint_contents = []
+        checkpoint_operations = []
+
+    compose_draft.content = ComposeDraft.compress(XSDTree.tostring(xsd_tree))
+    compose_draft.operations = []
+    compose_draft.checkpoint_contents = checkpoint_contents
+    compose_draft.checkpoint_operations = checkpoint_operations
+    return {'$set': {'content': compose_draft.content,
+                     'operations': [],
+                     'checkpoint_contents': [Binary(checkpoint_content)
+                                             for checkpoint_content in checkpoint_contents],
+                     'checkpoint_operations': checkpoint_operations}}
+
+
+def _update_draft(compose_draft, xsd_tree, update_document):
+    """Write the update of the draft, and keep the resulting tree in cache.
+
+    Args:
+        compose_draft:
+        xsd_tree:
+        update_document:
+
+    Returns:
+
+    """
+    try:
+        compose_draft_api.update(compose_draft, update_document)
+    except Exception:
+        discard_draft_tree(compose_draft)
+        raise
+    _cache_draft_tree(compose_draft, xsd_tree)
+
+
+def _build_draft_tree(xsd_string, edits):
+    """Build the tree of a checkpoint, and apply the edits recorded after it.
+
+    Args:
+        xsd_string: content of the checkpoint
+        edits: list of edits, each edit being a list of operations
+
+    Returns:
+
+    """
+    xsd_tree = build_xsd_tree(xsd_string)
+    for operations in edits:
+        xsd_tree = _apply_draft_operations(xsd_tree, operations)
+    return xsd_tree
+
+
+def _apply_draft_operations(xsd_tree, operations):
+    """Apply again operations that were already validated.
+
+    Args:
+        xsd_tree:
+        operations:
+
+    Returns:
+
+    """
+    for operation in operations:
+        xsd_tree = operations_utils.apply_operation(xsd_tree, operation)
+    return xsd_tree
+
+
+def _cache_draft_tree(compose_draft, xsd_tree):
+    """Keep the tree of the current version of the draft in cache.
+
+    Args:
+        compose_draft:
+        xsd_tree:
+
+    Returns:
+
+    """
+    _tree_cache.set(str(compose_draft.id), (compose_draft.version, xsd_tree), size=_get_tree_size(xsd_tree))
+
+
+def _get_tree_size(xsd_tree):
+    """Return the estimated memory of a parsed tree, from its number of nodes. The content of the draft is not
+    loaded by the edits, and its compressed size is far from the memory of the tree.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+
+    """
+    root = xsd_tree.getroot() if hasattr(xsd_tree, 'getroot') else xsd_tree
+    return sum(1 for _ in root.iter()) * TREE_NODE_SIZE
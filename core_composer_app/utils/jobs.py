@@ -0,0 +1,164 @@
+"""Jobs utils for Composer app
+
+Long running tasks (e.g. validation and persistence of templates and types) are run as jobs by a pool of worker
+threads of the process, so requests do not block until the task is done. The status of the jobs is stored in the
+database, so it can be polled from any process. The jobs of a process that stopped are lost: a job not updated
+for COMPOSER_JOB_MAX_DURATION is reported as failed.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta
+from Queue import Queue
+
+from bson.objectid import ObjectId
+
+from core_composer_app.components.compose_job import api as compose_job_api
+from core_composer_app.components.compose_job.models import ComposeJob
+from core_composer_app.settings import COMPOSER_JOB_WORKERS, COMPOSER_JOB_MAX_DURATION
+from core_main_app.commons.exceptions import DoesNotExist
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+SUCCESS = 'success'
+FAILURE = 'failure'
+
+_queue = Queue()
+_workers = []
+_workers_lock = threading.Lock()
+
+
+class JobError(Exception):
+    """Error ending a job, the message is reported in the status of the job.
+    """
+    def __init__(self, message):
+        super(JobError, self).__init__(message)
+        self.message = message
+
+
+class Job(object):
+    """Job run by the workers.
+    """
+
+    def __init__(self, job_id):
+        self.id = job_id
+
+    def set_progress(self, message):
+        """Report the progress of the job.
+
+        Args:
+            message:
+
+        Returns:
+
+        """
+        compose_job_api.update_status(self.id, status=RUNNING, message=message)
+
+
+def submit(user_id, func, *args, **kwargs):
+    """Submit a job, run func(job, *args, **kwargs) by a worker.
+
+    Args:
+        user_id: id of the user owning the job
+        func: function of the job, returning the result of the job or raising JobError
+        *args:
+        **kwargs:
+
+    Returns:
+        the id of the job.
+
+    """
+    compose_job = compose_job_api.insert(ComposeJob(user=str(user_id),
+                                                    status=PENDING,
+                                                    message='Waiting to start.'))
+    job_id = str(compose_job.id)
+    _start_workers()
+    _queue.put((job_id, func, args, kwargs))
+    return job_id
+
+
+def get_status(job_id, user_id):
+    """Return the status of a job.
+
+    Args:
+        job_id:
+        user_id: id of the user owning the job
+
+    Returns:
+        the status of the job, None if the job does not exist or is owned by another user.
+
+    """
+    if not ObjectId.is_valid(job_id):
+        return None
+    try:
+        compose_job = compose_job_api.get_by_id(job_id, user_id)
+    except DoesNotExist:
+        return None
+
+    status = {'id': str(compose_job.id),
+              'user': compose_job.user,
+              'status': compose_job.status,
+              'message': compose_job.message,
+              'result': compose_job.result if compose_job.status == SUCCESS else None,
+              'error': compose_job.error}
+    if status['status'] in [PENDING, RUNNING] and \
+            compose_job.last_modified < datetime.utcnow() - timedelta(seconds=COMPOSER_JOB_MAX_DURATION):
+        # the process running the job stopped before the end of the job
+        status.update(status=FAILURE, message='Failed.', error='The job was interrupted. Please try again.')
+    return status
+
+
+def run_job(job_id, func, *args, **kwargs):
+    """Run a job, and store its result.
+
+    Args:
+        job_id:
+        func:
+        *args:
+        **kwargs:
+
+    Returns:
+
+    """
+    compose_job_api.update_status(job_id, status=RUNNING, message='Running.')
+    try:
+        result = func(Job(job_id), *args, **kwargs)
+        compose_job_api.update_status(job_id, status=SUCCESS, message='Done.', result=result)
+    except JobError, e:
+        compose_job_api.update_status(job_id, status=FAILURE, message='Failed.', error=e.message)
+    except Exception, e:
+        logger.exception('Job {} failed.'.format(job_id))
+        compose_job_api.update_status(job_id, status=FAILURE, message='Failed.', error=e.message)
+
+
+def _worker():
+    """Run the jobs of the queue.
+
+    Returns:
+
+    """
+    while True:
+        job_id, func, args, kwargs = _queue.get()
+        try:
+            run_job(job_id, func, *args, **kwargs)
+        except Exception:
+            # the status of the job could not be stored, keep the worker running
+            logger.exception('Unable to run the job {}.'.format(job_id))
+        finally:
+            _queue.task_done()
+
+
+def _start_workers():
+    """Start the workers of the process, if not started yet.
+
+    Returns:
+
+    """
+    with _workers_lock:
+        while len(_workers) < COMPOSER_JOB_WORKERS:
+            worker = threading.Thread(target=_worker, name='composer-job-worker-{}'.format(len(_workers)))
+            worker.daemon = True
+            worker.start()
+            _workers.append(worker)
+
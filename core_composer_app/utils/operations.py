@@ -0,0 +1,200 @@
+"""Operations of the Composer app
+
+An operation is a dict describing an edit of the schema being composed, using the same parameters as the
+composer AJAX views, e.g.:
+
+    {"action": "rename", "xpath": "xs:element", "newName": "name"}
+"""
+import re
+
+from core_composer_app.components.type import api as type_api
+from core_composer_app.utils import xml as composer_xml_utils
+from core_main_app.commons.exceptions import XMLError
+from core_main_app.utils import xml as main_xml_utils
+from xml_utils.xsd_types.xsd_types import get_xsd_types
+
+INSERT = 'insert'
+RENAME = 'rename'
+DELETE = 'delete'
+CHANGE_TYPE = 'change_type'
+SET_OCCURRENCES = 'set_occurrences'
+RENAME_ROOT_TYPE = 'rename_root_type'
+
+BUILT_IN_TYPE = 'built_in_type'
+
+# metadata of the inserted type, stored in the operation to replay it without querying the type
+ROOT_TYPE_NAME = 'rootTypeName'
+TARGET_NAMESPACE = 'targetNamespace'
+TARGET_NAMESPACE_PREFIX = 'targetNamespacePrefix'
+
+# operations after which the schema has to be validated
+VALIDATED_ACTIONS = [INSERT, RENAME]
+# operations changing the xpaths of other elements
+STRUCTURAL_ACTIONS = [DELETE, CHANGE_TYPE]
+
+IMMEDIATE_VALIDATION = 'immediate'
+DEFERRED_VALIDATION = 'deferred'
+
+NCNAME_PATTERN = re.compile(r'^[^\W\d][\w.\-]*$', re.UNICODE)
+
+
+def apply_operations(xsd_tree, operations, validate=True):
+    """Apply a list of operations to the xsd tree, and validate the result once.
+
+    The xsd tree is modified in place, and should be discarded if an error is returned.
+
+    Args:
+        xsd_tree:
+        operations: list of operations
+        validate: validate the resulting schema if True, only run structural checks of the operations otherwise
+
+    Returns:
+        xsd_tree: modified xsd tree
+        results: list of results, one per operation applied, with the xpath of the element inserted or modified
+        error: error message, None if all operations were applied and the result is valid
+
+    """
+    results = []
+    for operation in operations:
+        result = {'action': operation.get('action')}
+        results.append(result)
+        try:
+            if not validate:
+                check_operation(operation)
+            # the modified element stays in the tree, but its xpath may change (e.g. change of type)
+            element = _get_modified_element(xsd_tree, operation)
+            if operation.get('action') == INSERT:
+                set_type_metadata(operation)
+            xsd_tree = apply_operation(xsd_tree, operation)
+            if operation.get('action') == INSERT:
+                # the new element is appended to the sequence
+                element = composer_xml_utils.find_element(xsd_tree, operation['xpath'])[-1]
+            if operation.get('action') in STRUCTURAL_ACTIONS:
+                # the xpaths returned for the previous operations may be outdated
+                for previous_result in results:
+                    previous_result.pop('xpath', None)
+            if element is not None:
+                result['xpath'] = composer_xml_utils.get_element_xpath(element)
+        except Exception, e:
+            result['error'] = e.message
+            return xsd_tree, results, e.message
+
+    if validate and any(operation.get('action') in VALIDATED_ACTIONS for operation in operations):
+        error = composer_xml_utils.validate_xml_schema(xsd_tree)
+        if error is not None:
+            return xsd_tree, results, error
+
+    return xsd_tree, results, None
+
+
+def apply_operation(xsd_tree, operation):
+    """Apply an operation to the xsd tree, without validating the result.
+
+    Args:
+        xsd_tree:
+        operation:
+
+    Returns:
+        the xsd tree, or a new tree if the namespaces map of the schema was updated.
+
+    """
+    action = operation.get('action')
+
+    if action == INSERT:
+        if operation['typeID'] == BUILT_IN_TYPE:
+            return composer_xml_utils._insert_element_built_in_type_in_tree(xsd_tree,
+                                                                            operation['xpath'],
+                                                                            operation['typeName'])
+        # operations recorded before the metadata was stored in them
+        if ROOT_TYPE_NAME not in operation:
+            set_type_metadata(operation)
+        return composer_xml_utils._insert_element_type_reference_in_tree(xsd_tree,
+                                                                         operation['xpath'],
+                                                                         operation[ROOT_TYPE_NAME],
+                                                                         operation[TARGET_NAMESPACE],
+                                                                         operation[TARGET_NAMESPACE_PREFIX],
+                                                                         operation['typeName'],
+                                                                         get_include_url(operation))
+    elif action == RENAME:
+        return composer_xml_utils.rename_element_in_tree(xsd_tree, operation['xpath'], operation['newName'])
+    elif action == DELETE:
+        return composer_xml_utils.delete_element_from_tree(xsd_tree, operation['xpath'])
+    elif action == CHANGE_TYPE:
+        return composer_xml_utils.change_element_type_in_tree(xsd_tree, operation['xpath'], operation['newType'])
+    elif action == SET_OCCURRENCES:
+        return composer_xml_utils.set_element_occurrences_in_tree(xsd_tree,
+                                                                  operation['xpath'],
+                                                                  operation['minOccurs'],
+                                                                  operation['maxOccurs'])
+    elif action == RENAME_ROOT_TYPE:
+        return composer_xml_utils.rename_single_root_type_in_tree(xsd_tree, operation['typeName'])
+
+    raise XMLError('Unknown operation: {}.'.format(action))
+
+
+def check_operation(operation):
+    """Run cheap structural checks of an operation, that would otherwise be detected by validating the schema.
+
+    Args:
+        operation:
+
+    Returns:
+
+    """
+    action = operation.get('action')
+
+    if action == RENAME and not NCNAME_PATTERN.match(operation['newName']):
+        raise XMLError("{} is not a valid name.".format(operation['newName']))
+    elif action == INSERT and operation['typeID'] == BUILT_IN_TYPE and operation['typeName'] not in get_xsd_types():
+        raise XMLError("{} is not a built-in type.".format(operation['typeName']))
+
+
+def set_type_metadata(operation):
+    """Store the metadata of the type inserted by the operation in the operation.
+
+    The metadata is logged with the operation, so the operation can be applied again
+    after the type was modified or deleted.
+
+    Args:
+        operation:
+
+    Returns:
+
+    """
+    if operation['typeID'] == BUILT_IN_TYPE:
+        return
+    # the type is inserted from its stored metadata, without parsing its content
+    type_object = type_api.get_with_metadata(operation['typeID'])
+    operation[ROOT_TYPE_NAME] = type_object.root_type_name
+    operation[TARGET_NAMESPACE] = type_object.target_namespace
+    operation[TARGET_NAMESPACE_PREFIX] = type_object.target_namespace_prefix
+
+
+def get_include_url(operation):
+    """Return the url used to include the type inserted by the operation, None if no type is included.
+
+    Args:
+        operation:
+
+    Returns:
+
+    """
+    if operation.get('action') != INSERT or operation['typeID'] == BUILT_IN_TYPE:
+        return None
+    return main_xml_utils._get_schema_location_uri(str(operation['typeID']))
+
+
+def _get_modified_element(xsd_tree, operation):
+    """Return the element of the xsd tree modified in place by an operation.
+
+    Args:
+        xsd_tree:
+        operation:
+
+    Returns:
+        the element, None if the operation does not modify a single element.
+
+    """
+    if operation.get('action') in [RENAME, CHANGE_TYPE, SET_OCCURRENCES]:
+        return composer_xml_utils.find_element(xsd_tree, operation['xpath'])
+    return None
@@ -0,0 +1,297 @@
+"""Rendering utils for Composer app
+
+The tree of the schema displayed by the composer is rendered either by the xsd2html stylesheet, or by a single
+walk of the xsd tree producing the same markup in linear time (see COMPOSER_RENDERER).
+"""
+import hashlib
+from cgi import escape
+from copy import deepcopy
+
+from django.core.cache import caches
+
+from core_composer_app.settings import COMPOSER_RENDERER, COMPOSER_RENDERING_CACHE, \
+    COMPOSER_RENDERING_CACHE_TIMEOUT
+from core_composer_app.utils import resources as resources_utils
+from core_composer_app.utils import xml as composer_xml_utils
+from xml_utils.xsd_tree.operations.annotation import remove_annotations
+
+XSLT_RENDERER = 'xslt'
+PYTHON_RENDERER = 'python'
+
+# attribute marking the elements rendered by the subtree stylesheet
+RENDERED_ELEMENT_ATTRIBUTE = 'composer-render'
+
+# elements not displayed in the tree
+IGNORED_ELEMENTS = ['include', 'import', 'annotation']
+
+
+def render_template(template_id, xsd_string):
+    """Render a template opened in the composer, and list its includes/imports.
+
+    The template is parsed once, and the rendering is skipped if the same content of the template was already
+    rendered: the rendering and the includes/imports of each template are stored in the COMPOSER_RENDERING_CACHE
+    cache, with the hash of the content they were computed from.
+
+    Args:
+        template_id: id of the template ('new' for the base template)
+        xsd_string: content of the template
+
+    Returns:
+        xsd_tree: xsd tree of the template, None if the rendering was already done
+        xsd_form: HTML tree of the template
+        includes: list of schemaLocation of the included/imported types
+
+    """
+    content_hash = get_content_hash(xsd_string)
+    cached = _get_cache().get(_get_cache_key(template_id))
+    # a new version of the template has a different content
+    if cached is not None and cached['hash'] == content_hash:
+        return None, cached['xsd_form'], list(cached['includes'])
+
+    xsd_tree = composer_xml_utils.build_xsd_tree(xsd_string)
+    includes = composer_xml_utils.get_schema_locations(xsd_tree)
+    xsd_form = render_xsd_tree(xsd_tree)
+    _get_cache().set(_get_cache_key(template_id),
+                     {'hash': content_hash, 'xsd_form': xsd_form, 'includes': includes},
+                     COMPOSER_RENDERING_CACHE_TIMEOUT)
+    return xsd_tree, xsd_form, list(includes)
+
+
+def invalidate_template(template_id):
+    """Remove the rendering of a template from the cache, after it was modified or deleted.
+
+    Args:
+        template_id:
+
+    Returns:
+
+    """
+    _get_cache().delete(_get_cache_key(template_id))
+
+
+def get_content_hash(xsd_string):
+    """Return the hash of the content of a template.
+
+    Args:
+        xsd_string:
+
+    Returns:
+
+    """
+    if isinstance(xsd_string, unicode):
+        xsd_string = xsd_string.encode('utf-8')
+    return hashlib.sha1(xsd_string).hexdigest()
+
+
+def render_xsd_tree(xsd_tree):
+    """Return the HTML tree of the schema displayed by the composer.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+
+    """
+    if COMPOSER_RENDERER == PYTHON_RENDERER:
+        root = xsd_tree.getroot() if hasattr(xsd_tree, 'getroot') else xsd_tree
+        html = ['<ul class="tree">']
+        _render_element(root, _get_path(root), html)
+        html.append('</ul>')
+        return ''.join(html)
+
+    # remove annotations from a copy of the tree
+    xsd_tree = deepcopy(xsd_tree)
+    remove_annotations(xsd_tree)
+
+    # transform XML to HTML
+    return str(resources_utils.get_xslt(resources_utils.XSD2HTML_XSL)(xsd_tree))
+
+
+def render_xsd_element(xsd_tree, element):
+    """Return the HTML of an element of the schema and of its children, as displayed in the tree of the composer.
+
+    The element is rendered in the context of the whole schema, so its path, name, type and occurrences are the
+    same as in the rendering of the whole tree.
+
+    Args:
+        xsd_tree:
+        element: element of the xsd tree
+
+    Returns:
+
+    """
+    if COMPOSER_RENDERER == PYTHON_RENDERER:
+        html = []
+        _render_element(element, _get_path(element), html)
+        return ''.join(html)
+
+    # find the element in a copy of the tree, from its position among the children of its ancestors, and mark it
+    indexes = _get_child_indexes(element)
+    xsd_tree = deepcopy(xsd_tree)
+    copied_element = xsd_tree.getroot() if hasattr(xsd_tree, 'getroot') else xsd_tree
+    for index in indexes:
+        copied_element = copied_element[index]
+    copied_element.attrib[RENDERED_ELEMENT_ATTRIBUTE] = 'true'
+    remove_annotations(xsd_tree)
+
+    # transform the marked element to HTML
+    return str(resources_utils.get_xslt(resources_utils.XSD2HTML_SUBTREE_XSL)(xsd_tree)).strip()
+
+
+def _get_child_indexes(element):
+    """Return the positions of an element and of its ancestors among the children of their parents, from the root.
+
+    Args:
+        element:
+
+    Returns:
+
+    """
+    indexes = []
+    parent = element.getparent()
+    while parent is not None:
+        indexes.insert(0, parent.index(element))
+        element = parent
+        parent = element.getparent()
+    return indexes
+
+
+def _render_element(element, path, html):
+    """Append the HTML of an element and of its children to the list of HTML strings, as done by xsd2html.xsl.
+
+    Args:
+        element:
+        path: path of the element displayed in the tree (name and position among the siblings with the same name)
+        html: list of HTML strings
+
+    Returns:
+
+    """
+    name = _get_name(element)
+    # annotations are not rendered, and do not count as children
+    children = [child for child in element
+                if isinstance(child.tag, basestring) and 'annotation' not in _get_name(child)]
+
+    html.append('<li><div class="element-wrapper"')
+    if element.getparent() is None:
+        # no left indent for root element
+        html.append(' style="left:0"')
+    html.append(u'><span class="path">{}</span>'.format(escape(path)))
+
+    if children:
+        html.append('<span class="collapse"></span><span class="category">')
+        if 'sequence' in name or 'choice' in name:
+            html.append(u'<span class="menu sequence">{}</span>'.format(escape(name)))
+        else:
+            html.append(u'<span>{}</span>'.format(escape(name)))
+        if 'name' in element.attrib:
+            html.append(u'<span class="type">{}</span>'.format(escape(element.attrib['name'])))
+        html.append('</span><ul>')
+
+        # count the siblings with the same name to build their paths, in a single pass
+        siblings_count = {}
+        for child in children:
+            child_name = _get_name(child)
+            if any(ignored in child_name for ignored in IGNORED_ELEMENTS):
+                continue
+            position = siblings_count.get(child_name, 0)
+            siblings_count[child_name] = position + 1
+            _render_element(child, _format_path(child_name, position), html)
+
+        html.append('</ul></div></li>')
+        return
+
+    html.append('<span class="element">')
+    if 'sequence' in name:
+        html.append(u'<span class="menu sequence">{}</span>'.format(escape(name)))
+    elif 'element' in name:
+        html.append(u'<span class="menu element">{} : </span>'.format(escape(name)))
+    elif 'enumeration' in name:
+        html.append(u'<span>{} : <span class="text">{}</span></span>'.format(escape(name),
+                                                                           escape(element.attrib.get('value', ''))))
+    else:
+        html.append(u'<span>{}</span>'.format(escape(name)))
+    html.append('</span>')
+
+    if 'name' in element.attrib:
+        html.append(u'<span class="name">{}</span>'.format(escape(element.attrib['name'])))
+    if 'type' in element.attrib:
+        html.append(u'<span class="type">{}</span>'.format(escape(element.attrib['type'])))
+    if 'ref' in element.attrib:
+        html.append(u'<span class="type">{}</span>'.format(escape(element.attrib['ref'])))
+    if 'element' in name:
+        min_occurs = element.attrib.get('minOccurs', '1')
+        max_occurs = element.attrib.get('maxOccurs', '1')
+        if max_occurs == 'unbounded':
+            max_occurs = '*'
+        html.append(u'<span class="occurs">( {} , {} )</span>'.format(escape(min_occurs), escape(max_occurs)))
+
+    html.append('</div></li>')
+
+
+def _get_path(element):
+    """Return the path of an element displayed in the tree.
+
+    Args:
+        element:
+
+    Returns:
+
+    """
+    name = _get_name(element)
+    position = 0
+    for sibling in element.itersiblings(preceding=True):
+        if isinstance(sibling.tag, basestring) and _get_name(sibling) == name:
+            position += 1
+    return _format_path(name, position)
+
+
+def _format_path(name, position):
+    """Format the path of an element, from the number of its preceding siblings with the same name.
+
+    Args:
+        name:
+        position:
+
+    Returns:
+
+    """
+    if position:
+        return u'{}[{}]'.format(name, position + 1)
+    return name
+
+
+def _get_name(element):
+    """Return the qualified name of an element, as returned by name() in XPath.
+
+    Args:
+        element:
+
+    Returns:
+
+    """
+    local_name = element.tag.split('}')[-1]
+    if element.prefix:
+        return u'{}:{}'.format(element.prefix, local_name)
+    return local_name
+
+
+def _get_cache():
+    """Return the cache of the renderings of templates.
+
+    Returns:
+
+    """
+    return caches[COMPOSER_RENDERING_CACHE]
+
+
+def _get_cache_key(template_id):
+    """Return the cache key of the rendering of a template.
+
+    Args:
+        template_id:
+
+    Returns:
+
+    """
+    return 'core_composer_app:rendering:{}'.format(template_id)
@@ -0,0 +1,324 @@
+"""Resolver utils for Composer app
+
+The composer references the types it includes/imports with their download url. The resolver serves the content
+of the templates and types stored in the database directly, so validating a schema does not require the server
+to fetch types from itself over HTTP. Other urls are resolved from the network.
+
+Contents of types, and the schemas found valid, are cached in each process. The entries are keyed by the ids of
+the types and the hashes of their contents stored in the database, so a type modified or deleted by any process
+is never served from the cache. Templates that are not types (or types saved without the hash of their content)
+are loaded from the database each time, and the schemas including them are not cached.
+"""
+import hashlib
+import threading
+import weakref
+from io import BytesIO
+from urlparse import urlparse
+
+from lxml import etree
+
+from core_composer_app.components.type.models import Type
+from core_composer_app.settings import COMPOSER_RESOLVER_CACHE_MAX_ENTRIES, COMPOSER_RESOLVER_CACHE_MAX_SIZE, \
+    COMPOSER_SCHEMA_CACHE_MAX_ENTRIES
+from core_composer_app.utils.cache import LRUCache
+from core_main_app.components.template import api as template_api
+from core_main_app.utils.urls import get_template_download_pattern
+
+SCHEMA_NAMESPACE = '{http://www.w3.org/2001/XMLSchema}'
+
+# type id and content hash -> encoded type content
+_content_cache = LRUCache(COMPOSER_RESOLVER_CACHE_MAX_ENTRIES, COMPOSER_RESOLVER_CACHE_MAX_SIZE)
+# digests of the schemas found valid, with the content hashes of the types they include (errors may come from
+# includes that could not be loaded, and are not cached)
+_schema_cache = LRUCache(COMPOSER_SCHEMA_CACHE_MAX_ENTRIES)
+# regex of the path of the template download urls, computed on first use
+_download_pattern = None
+
+
+class TemplateResolver(etree.Resolver):
+    """Resolve the download urls of templates and types from the database.
+    """
+
+    def __init__(self):
+        super(TemplateResolver, self).__init__()
+        # content hashes of the types included by the schema being compiled
+        self.content_hashes = None
+
+    def resolve(self, url, pubid, context):
+        """Resolve the url.
+
+        Args:
+            url:
+            pubid:
+            context:
+
+        Returns:
+            the content of the template, None to let the default resolvers load the url.
+
+        """
+        try:
+            content = get_template_content_from_url(url, self.content_hashes)
+        except Exception:
+            # lxml stores the errors raised by a resolver and raises them again on the next parse with the parser
+            return None
+        if content is None:
+            return None
+        return self.resolve_string(content, context, base_url=url)
+
+
+class _ResolverParser(object):
+    """Parser using the template resolver. lxml parsers are not thread safe: the lock has to be held while the
+    parser is used, including while compiling a schema parsed with it (which may happen in another thread than the
+    one that built the tree).
+    """
+
+    def __init__(self):
+        self.parser = etree.XMLParser()
+        self.resolver = TemplateResolver()
+        self.parser.resolvers.add(self.resolver)
+        self.lock = threading.RLock()
+
+
+# resolver parser of each thread
+_local = threading.local()
+# resolver parsers of the running threads, to find the parser of a tree
+_parsers = weakref.WeakSet()
+_parsers_lock = threading.Lock()
+
+
+def build_tree(xsd_string):
+    """Build the tree of the xsd string, with a parser resolving templates and types from the database.
+
+    Args:
+        xsd_string:
+
+    Returns:
+
+    """
+    if not isinstance(xsd_string, bytes):
+        xsd_string = xsd_string.encode('utf-8')
+
+    resolver_parser = _get_thread_resolver_parser()
+    with resolver_parser.lock:
+        return etree.parse(BytesIO(xsd_string), parser=resolver_parser.parser)
+
+
+def validate_xml_schema(xsd_tree):
+    """Check that the tree is a valid XML Schema, resolving templates and types from the database.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+        None if the schema is valid, the error message otherwise.
+
+    """
+    root_tree = xsd_tree.getroottree() if hasattr(xsd_tree, 'getroottree') else xsd_tree
+    xsd_bytes = etree.tostring(root_tree)
+
+    # same schema already found valid, with the same versions of the stored types
+    content_hashes = _get_content_hashes(_get_schema_locations(root_tree))
+    digest = _get_schema_digest(xsd_bytes, content_hashes)
+    if digest is not None and digest in _schema_cache:
+        return None
+
+    resolver_parser = _get_resolver_parser(root_tree)
+    if resolver_parser is None:
+        # tree not built with a resolver parser, build it again
+        root_tree = build_tree(xsd_bytes)
+        resolver_parser = _get_resolver_parser(root_tree)
+
+    try:
+        with resolver_parser.lock:
+            resolver_parser.resolver.content_hashes = content_hashes
+            try:
+                etree.XMLSchema(root_tree)
+            finally:
+                resolver_parser.resolver.content_hashes = None
+    except Exception, e:
+        # the error may come from an include that could not be loaded (e.g. type not available yet, network), so
+        # the schema is validated again next time
+        return e.message
+
+    if digest is not None:
+        _schema_cache.set(digest, None)
+    return None
+
+
+def get_template_content_from_url(url, content_hashes=None):
+    """Return the encoded content of the template downloaded by the url.
+
+    Args:
+        url:
+        content_hashes: content hashes of the types, by type id (see _get_content_hashes), looked up if not given
+
+    Returns:
+        the content of the template, None if the url is not a template download url of this server.
+
+    """
+    template_id = _get_template_id(url)
+    if template_id is None:
+        return None
+
+    if content_hashes is None or template_id not in content_hashes:
+        content_hashes = _get_content_hashes([url], recursive=False)
+    content_hash = content_hashes.get(template_id)
+    # templates without content hash are not cached
+    cache_key = '{}:{}'.format(template_id, content_hash) if content_hash is not None else None
+
+    content = _content_cache.get(cache_key) if cache_key is not None else None
+    if content is None:
+        try:
+            template = template_api.get(template_id)
+        except Exception:
+            return None
+        content = template.content.encode('utf-8')
+        if cache_key is not None:
+            _content_cache.set(cache_key, content, size=len(content))
+    return content
+
+
+def _get_content_hashes(schema_locations, recursive=True):
+    """Return the content hashes of the stored types downloaded by the schema locations, and of the types they
+    include.
+
+    Args:
+        schema_locations:
+        recursive: also return the content hashes of the types included by the types if True
+
+    Returns:
+        dict: type id -> content hash, None for the templates that are not types with a content hash.
+
+    """
+    content_hashes = {}
+    template_ids = _get_template_ids(schema_locations)
+    while len(template_ids) > 0:
+        try:
+            types = dict((str(type_object.id), type_object)
+                         for type_object in Type.get_summaries_by_ids(list(template_ids)))
+        except Exception:
+            # e.g. id that is not an object id
+            types = {}
+
+        schema_locations = []
+        for template_id in template_ids:
+            type_object = types.get(template_id)
+            content_hashes[template_id] = type_object.content_hash if type_object is not None else None
+            if type_object is not None and type_object.schema_locations is not None:
+                schema_locations.extend(type_object.schema_locations)
+
+        if not recursive:
+            break
+        template_ids = _get_template_ids(schema_locations) - set(content_hashes.keys())
+    return content_hashes
+
+
+def _get_schema_digest(xsd_bytes, content_hashes):
+    """Return the digest of a schema, with the content hashes of the types it includes.
+
+    Args:
+        xsd_bytes:
+        content_hashes:
+
+    Returns:
+        the digest, None if an included template has no content hash.
+
+    """
+    if None in content_hashes.values():
+        return None
+    digest = hashlib.sha1(xsd_bytes)
+    for template_id in sorted(content_hashes.keys()):
+        digest.update('\n{}:{}'.format(template_id, content_hashes[template_id]))
+    return digest.hexdigest()
+
+
+def _get_schema_locations(xsd_tree):
+    """Return the list of schemaLocation of the includes/imports of the schema.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+
+    """
+    schema_locations = []
+    for tag in ['include', 'import']:
+        for element in xsd_tree.findall("{}{}".format(SCHEMA_NAMESPACE, tag)):
+            if 'schemaLocation' in element.attrib:
+                schema_locations.append(element.attrib['schemaLocation'])
+    return schema_locations
+
+
+def _get_template_ids(schema_locations):
+    """Return the ids of the templates downloaded by the schema locations of this server.
+
+    Args:
+        schema_locations:
+
+    Returns:
+
+    """
+    template_ids = set(_get_template_id(schema_location) for schema_location in schema_locations)
+    template_ids.discard(None)
+    return template_ids
+
+
+def _get_template_id(url):
+    """Return the id of the template downloaded by the url.
+
+    Args:
+        url:
+
+    Returns:
+        the id, None if the url is not a template download url of this server.
+
+    """
+    match = _get_download_pattern().match(urlparse(url).path)
+    if match is None:
+        return None
+    return match.group('pk')
+
+
+def _get_download_pattern():
+    """Return the regex of the path of the template download urls.
+
+    Returns:
+
+    """
+    global _download_pattern
+    if _download_pattern is None:
+        _download_pattern = get_template_download_pattern()
+    return _download_pattern
+
+
+def _get_thread_resolver_parser():
+    """Return the resolver parser of the current thread.
+
+    Returns:
+
+    """
+    resolver_parser = getattr(_local, 'resolver_parser', None)
+    if resolver_parser is None:
+        resolver_parser = _ResolverParser()
+        _local.resolver_parser = resolver_parser
+        with _parsers_lock:
+            _parsers.add(resolver_parser)
+    return resolver_parser
+
+
+def _get_resolver_parser(xsd_tree):
+    """Return the resolver parser used to build the tree, None if it was not built with one (or if the thread
+    that built it has ended).
+
+    Args:
+        xsd_tree:
+
+    Returns:
+
+    """
+    with _parsers_lock:
+        resolver_parsers = list(_parsers)
+    for resolver_parser in resolver_parsers:
+        if xsd_tree.parser is resolver_parser.parser:
+            return resolver_parser
+    return None
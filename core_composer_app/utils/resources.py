@@ -0,0 +1,90 @@
+"""Resources utils for Composer app
+
+The static files used on each request (XSLT stylesheets, base template) are located, read and compiled once per
+process. In DEBUG, the modification time of the files is checked on each access, so edited files are reloaded.
+"""
+import threading
+from os.path import join, getmtime
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from lxml import etree
+
+from core_main_app.utils.file import read_file_content
+
+XSD2HTML_XSL = join('core_composer_app', 'user', 'xsl', 'xsd2html.xsl')
+XSD2HTML_SUBTREE_XSL = join('core_composer_app', 'user', 'xsl', 'xsd2html_subtree.xsl')
+NEW_BASE_TEMPLATE_XSD = join('core_composer_app', 'user', 'xsd', 'new_base_template.xsd')
+
+# static path -> (file path, modification time, loaded resource)
+_resources = {}
+_resources_lock = threading.Lock()
+
+
+def get_xslt(static_path):
+    """Return the compiled XSLT transformation of a static stylesheet.
+
+    Args:
+        static_path: path of the stylesheet in the static files
+
+    Returns:
+
+    """
+    return _get_resource(static_path, _load_xslt)
+
+
+def get_new_base_template():
+    """Return the content of the base template of a new template.
+
+    Returns:
+
+    """
+    return _get_resource(NEW_BASE_TEMPLATE_XSD, read_file_content)
+
+
+def clear():
+    """Clear the loaded resources.
+
+    Returns:
+
+    """
+    with _resources_lock:
+        _resources.clear()
+
+
+def _get_resource(static_path, load):
+    """Return a static resource, loaded on first access.
+
+    Args:
+        static_path: path of the resource in the static files
+        load: function loading the resource from its file path
+
+    Returns:
+
+    """
+    entry = _resources.get(static_path)
+    if entry is not None:
+        file_path, mtime, resource = entry
+        if not settings.DEBUG or getmtime(file_path) == mtime:
+            return resource
+
+    with _resources_lock:
+        file_path = finders.find(static_path)
+        if file_path is None:
+            raise IOError('Unable to find {}.'.format(static_path))
+        mtime = getmtime(file_path)
+        resource = load(file_path)
+        _resources[static_path] = (file_path, mtime, resource)
+        return resource
+
+
+def _load_xslt(file_path):
+    """Parse and compile a stylesheet.
+
+    Args:
+        file_path:
+
+    Returns:
+
+    """
+    return etree.XSLT(etree.parse(file_path))
@@ -1,7 +1,8 @@
 """XML utils for Composer app
 """
+from core_composer_app.utils import resolver as resolver_utils
 from core_main_app.commons.exceptions import CoreError, XMLError
-from core_main_app.utils.xml import is_well_formed_xml, validate_xml_schema
+from core_main_app.utils.xml import is_well_formed_xml
 
 from xml_utils.commons.constants import LXML_SCHEMA_NAMESPACE
 from xml_utils.xsd_tree.operations.namespaces import get_namespaces, get_default_prefix, get_target_namespace
@@ -22,16 +23,65 @@ def check_type_core_support(xsd_string):
         type_definition: simpleType or complexType.
 
     """
-    type_definition = ""
-    error_message = "A type should be a valid XML schema containing only one type definition " \
-                    "(Allowed tags are: simpleType or complexType and include)."
+    return _get_type_definition(_build_type_tree(xsd_string))
+
+
+def get_type_metadata(xsd_string):
+    """Check that the format of the type is supported by the current version of the Core (see
+    check_type_core_support), and return the metadata used to insert the type in a schema, from a single parse.
+
+    Args:
+        xsd_string:
+
+    Returns:
+        dict: root_type_name, type_definition (simpleType or complexType), target_namespace,
+        target_namespace_prefix, schema_locations (includes of the type) and element_count.
+
+    """
+    xsd_tree = _build_type_tree(xsd_string)
+    type_definition = _get_type_definition(xsd_tree)
+    target_namespace, target_namespace_prefix = get_target_namespace(xsd_tree, get_namespaces(xsd_string))
+    element_type = xsd_tree.find("{}{}".format(LXML_SCHEMA_NAMESPACE, type_definition))
+
+    return {
+        'root_type_name': element_type.attrib.get('name'),
+        'type_definition': type_definition,
+        'target_namespace': target_namespace,
+        'target_namespace_prefix': target_namespace_prefix,
+        'schema_locations': get_schema_locations(xsd_tree),
+        'element_count': len(xsd_tree.findall(".//{}element".format(LXML_SCHEMA_NAMESPACE))),
+    }
+
+
+def _build_type_tree(xsd_string):
+    """Build the xsd tree of a type, after checking that it is well formatted.
+
+    Args:
+        xsd_string:
 
+    Returns:
+
+    """
     # check that well formatted first
     if not is_well_formed_xml(xsd_string):
         raise XMLError('Uploaded file is not well formatted XML.')
 
     # build the tree
-    xsd_tree = XSDTree.build_tree(xsd_string)
+    return XSDTree.build_tree(xsd_string)
+
+
+def _get_type_definition(xsd_tree):
+    """Check that the xsd tree contains only one type definition, and return it (simpleType or complexType).
+
+    Args:
+        xsd_tree:
+
+    Returns:
+
+    """
+    type_definition = ""
+    error_message = "A type should be a valid XML schema containing only one type definition " \
+                    "(Allowed tags are: simpleType or complexType and include)."
 
     # get elements
     elements = xsd_tree.findall("*")
@@ -58,6 +108,87 @@ def check_type_core_support(xsd_string):
     return type_definition
 
 
+def build_xsd_tree(xsd_string):
+    """Build the xsd tree of the xsd string.
+    References to templates and types of the database are resolved locally when the tree is validated.
+
+    Args:
+        xsd_string:
+
+    Returns:
+
+    """
+    return resolver_utils.build_tree(xsd_string)
+
+
+def validate_xml_schema(xsd_tree):
+    """Check that the xsd tree is a valid XML Schema.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+        None if the schema is valid, the error message otherwise.
+
+    """
+    return resolver_utils.validate_xml_schema(xsd_tree)
+
+
+def get_schema_locations(xsd_tree):
+    """Return the list of schemaLocation of the includes/imports of the schema.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+
+    """
+    schema_locations = []
+    for tag in ['include', 'import']:
+        for element in xsd_tree.findall("{}{}".format(LXML_SCHEMA_NAMESPACE, tag)):
+            if 'schemaLocation' in element.attrib:
+                schema_locations.append(element.attrib['schemaLocation'])
+    return schema_locations
+
+
+def find_element(xsd_tree, xpath):
+    """Find the element of the xsd tree at the given xpath.
+
+    Args:
+        xsd_tree:
+        xpath: xpath using the schema prefix
+
+    Returns:
+
+    """
+    element = xsd_tree.find(_get_lxml_xpath(_get_tree_namespaces(xsd_tree), xpath))
+    if element is None:
+        raise XMLError('Unable to find the element at {}.'.format(xpath))
+    return element
+
+
+def get_element_xpath(element):
+    """Return the xpath of an element of the xsd tree, using the schema prefix (as displayed by the composer).
+
+    Args:
+        element:
+
+    Returns:
+
+    """
+    steps = []
+    while element.getparent() is not None:
+        tag = element.tag.split('}')[-1]
+        step = '{}:{}'.format(element.prefix, tag) if element.prefix else tag
+        # same index as the one displayed in the path of the element
+        position = sum(1 for _ in element.itersiblings(element.tag, preceding=True))
+        if position > 0:
+            step += '[{}]'.format(position + 1)
+        steps.insert(0, step)
+        element = element.getparent()
+    return '/'.join(steps)
+
+
 def remove_single_root_element(xsd_string):
     """Remove root element from the xsd string.
 
@@ -68,18 +199,34 @@ def remove_single_root_element(xsd_string):
 
     """
     # Build xsd tree
-    xsd_tree = XSDTree.build_tree(xsd_string)
+    xsd_tree = build_xsd_tree(xsd_string)
     # find the root element
-    root = xsd_tree.find("{}element".format(LXML_SCHEMA_NAMESPACE))
-    if root is not None:
-        # remove root element from parent (schema)
-        root.getparent().remove(root)
+    if remove_single_root_element_from_tree(xsd_tree):
         # convert the tree to back string
         xsd_string = XSDTree.tostring(xsd_tree)
     # return xsd string
     return xsd_string
 
 
+def remove_single_root_element_from_tree(xsd_tree):
+    """Remove root element from the xsd tree.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+        True if a root element was removed.
+
+    """
+    # find the root element
+    root = xsd_tree.find("{}element".format(LXML_SCHEMA_NAMESPACE))
+    if root is None:
+        return False
+    # remove root element from parent (schema)
+    root.getparent().remove(root)
+    return True
+
+
 def rename_single_root_type(xsd_string, type_name):
     """Rename the type of the single root element.
 
@@ -91,7 +238,23 @@ def rename_single_root_type(xsd_string, type_name):
 
     """
     # build xsd tree
-    xsd_tree = XSDTree.build_tree(xsd_string)
+    xsd_tree = build_xsd_tree(xsd_string)
+    # change the root type name in the xsd tree
+    rename_single_root_type_in_tree(xsd_tree, type_name)
+    # rebuild xsd string
+    return XSDTree.tostring(xsd_tree)
+
+
+def rename_single_root_type_in_tree(xsd_tree, type_name):
+    """Rename the type of the single root element in the xsd tree.
+
+    Args:
+        xsd_tree:
+        type_name:
+
+    Returns:
+
+    """
     # xpath to the single root element
     xpath_root = LXML_SCHEMA_NAMESPACE + "element"
     # xpath to the single root type
@@ -99,10 +262,7 @@ def rename_single_root_type(xsd_string, type_name):
     # change the root type name in the xsd tree
     xsd_tree.find(xpath_root).attrib['type'] = type_name
     xsd_tree.find(xpath_root_type).attrib['name'] = type_name
-    # rebuild xsd string
-    xsd_string = XSDTree.tostring(xsd_tree)
-    # return xsd string
-    return xsd_string
+    return xsd_tree
 
 
 def delete_xsd_element(xsd_string, xpath):
@@ -116,22 +276,28 @@ def delete_xsd_element(xsd_string, xpath):
 
     """
     # build xsd tree
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    # get xsd namespaces
-    namespaces = get_namespaces(xsd_string)
-    # get default prefix
-    default_prefix = get_default_prefix(namespaces)
-    # set the element namespace
-    xpath = xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
+    xsd_tree = build_xsd_tree(xsd_string)
+    # remove element from tree
+    delete_element_from_tree(xsd_tree, xpath)
+    # rebuild xsd string
+    return XSDTree.tostring(xsd_tree)
+
+
+def delete_element_from_tree(xsd_tree, xpath):
+    """Delete element from the xsd tree.
+
+    Args:
+        xsd_tree:
+        xpath:
+
+    Returns:
+
+    """
     # get element to remove from tree
-    element_to_remove = xsd_tree.find(xpath)
+    element_to_remove = find_element(xsd_tree, xpath)
     # remove element from tree
     element_to_remove.getparent().remove(element_to_remove)
-
-    # rebuild xsd string
-    xsd_string = XSDTree.tostring(xsd_tree)
-    # return xsd string
-    return xsd_string
+    return xsd_tree
 
 
 def change_xsd_element_type(xsd_string, xpath, type_name):
@@ -145,19 +311,25 @@ def change_xsd_element_type(xsd_string, xpath, type_name):
     Returns:
 
     """
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    namespaces = get_namespaces(xsd_string)
-    default_prefix = get_default_prefix(namespaces)
+    xsd_tree = build_xsd_tree(xsd_string)
+    change_element_type_in_tree(xsd_tree, xpath, type_name)
+    # rebuild xsd string
+    return XSDTree.tostring(xsd_tree)
 
-    # set the element namespace
-    xpath = xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
-    xsd_tree.find(xpath).tag = LXML_SCHEMA_NAMESPACE + type_name
 
-    # rebuild xsd string
-    xsd_string = XSDTree.tostring(xsd_tree)
+def change_element_type_in_tree(xsd_tree, xpath, type_name):
+    """Change the type of an element of the xsd tree (e.g. sequence -> choice).
 
-    # return xsd string
-    return xsd_string
+    Args:
+        xsd_tree:
+        xpath:
+        type_name:
+
+    Returns:
+
+    """
+    find_element(xsd_tree, xpath).tag = LXML_SCHEMA_NAMESPACE + type_name
+    return xsd_tree
 
 
 def set_xsd_element_occurrences(xsd_string, xpath, min_occurs, max_occurs):
@@ -173,24 +345,29 @@ def set_xsd_element_occurrences(xsd_string, xpath, min_occurs, max_occurs):
 
     """
     # build xsd tree
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    # get namespaces
-    namespaces = get_namespaces(xsd_string)
-    # get default prefix
-    default_prefix = get_default_prefix(namespaces)
+    xsd_tree = build_xsd_tree(xsd_string)
+    # set the occurrences
+    set_element_occurrences_in_tree(xsd_tree, xpath, min_occurs, max_occurs)
+    # return xsd string
+    return XSDTree.tostring(xsd_tree)
 
-    # set the element namespace
-    xpath = xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
-    # add the element to the sequence
-    element = xsd_tree.find(xpath)
-    element.attrib['minOccurs'] = min_occurs
-    element.attrib['maxOccurs'] = max_occurs
 
-    # save the tree in the session
-    xsd_string = XSDTree.tostring(xsd_tree)
+def set_element_occurrences_in_tree(xsd_tree, xpath, min_occurs, max_occurs):
+    """Set occurrences of an element of the xsd tree.
 
-    # return xsd string
-    return xsd_string
+    Args:
+        xsd_tree:
+        xpath:
+        min_occurs:
+        max_occurs:
+
+    Returns:
+
+    """
+    element = find_element(xsd_tree, xpath)
+    element.attrib['minOccurs'] = min_occurs
+    element.attrib['maxOccurs'] = max_occurs
+    return xsd_tree
 
 
 def get_xsd_element_occurrences(xsd_string, xpath):
@@ -204,16 +381,21 @@ def get_xsd_element_occurrences(xsd_string, xpath):
 
     """
     # build the xsd tree
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    # get the namespaces
-    namespaces = get_namespaces(xsd_string)
-    # get the default prefix
-    default_prefix = get_default_prefix(namespaces)
+    xsd_tree = build_xsd_tree(xsd_string)
+    return get_element_occurrences_from_tree(xsd_tree, xpath)
 
-    # set the element namespace
-    xpath = xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
-    # add the element to the sequence
-    element = xsd_tree.find(xpath)
+
+def get_element_occurrences_from_tree(xsd_tree, xpath):
+    """Get the min and max occurrences of an element of the xsd tree.
+
+    Args:
+        xsd_tree:
+        xpath:
+
+    Returns:
+
+    """
+    element = find_element(xsd_tree, xpath)
 
     if 'minOccurs' in element.attrib:
         min_occurs = element.attrib['minOccurs']
@@ -239,24 +421,28 @@ def rename_xsd_element(xsd_string, xpath, new_name):
 
     """
     # build the xsd tree
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    # get the namespaces
-    namespaces = get_namespaces(xsd_string)
-    # get the default prefix
-    default_prefix = get_default_prefix(namespaces)
-
-    # set the element namespace
-    xpath = xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
+    xsd_tree = build_xsd_tree(xsd_string)
     # rename element
-    xsd_tree.find(xpath).attrib['name'] = new_name
-
+    rename_element_in_tree(xsd_tree, xpath, new_name)
     # rebuild xsd string
-    xsd_string = XSDTree.tostring(xsd_tree)
-    # return xsd string
-    return xsd_string
+    return XSDTree.tostring(xsd_tree)
+
+
+def rename_element_in_tree(xsd_tree, xpath, new_name):
+    """Rename an element of the xsd tree.
+
+    Args:
+        xsd_tree:
+        xpath:
+        new_name:
+
+    Returns:
+
+    """
+    find_element(xsd_tree, xpath).attrib['name'] = new_name
+    return xsd_tree
 
 
-# TODO: refactor more
 def _insert_element_type(xsd_string, xpath, type_content, element_type_name, include_url):
     """Insert an element of given type in xsd string.
 
@@ -270,16 +456,24 @@ def _insert_element_type(xsd_string, xpath, type_content, element_type_name, inc
     Returns:
 
     """
-    # build the dom tree of the schema being built
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    # get namespaces information for the schema
-    namespaces = get_namespaces(xsd_string)
-    # get the default namespace
-    default_prefix = get_default_prefix(namespaces)
-    # get target namespace information
-    target_namespace, target_namespace_prefix = get_target_namespace(xsd_tree, namespaces)
-    # build xpath to element
-    xpath = xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
+    return _insert_element_type_in_tree(build_xsd_tree(xsd_string), xpath, type_content, element_type_name,
+                                        include_url)
+
+
+def _insert_element_type_in_tree(xsd_tree, xpath, type_content, element_type_name, include_url):
+    """Insert an element of given type in xsd tree.
+
+    Args:
+        xsd_tree: xsd tree
+        xpath: xpath where to insert the element
+        type_content: string content of the type to insert
+        element_type_name: name of the type
+        include_url: url used to reference the type in schemaLocation
+
+    Returns:
+        the xsd tree, or a new tree if the namespaces map of the schema was updated.
+
+    """
     # build xsd tree
     type_xsd_tree = XSDTree.build_tree(type_content)
     # get namespaces information for the type
@@ -295,6 +489,36 @@ def _insert_element_type(xsd_string, xpath, type_content, element_type_name, inc
         element_type = type_xsd_tree.find("{}simpleType".format(LXML_SCHEMA_NAMESPACE))
     type_name = element_type.attrib["name"]
 
+    return _insert_element_type_reference_in_tree(xsd_tree, xpath, type_name, type_target_namespace,
+                                                  type_target_namespace_prefix, element_type_name, include_url)
+
+
+# TODO: refactor more
+def _insert_element_type_reference_in_tree(xsd_tree, xpath, type_name, type_target_namespace,
+                                           type_target_namespace_prefix, element_type_name, include_url):
+    """Insert an element of given type in xsd tree, from the metadata of the type (see get_type_metadata), without
+    parsing the type.
+
+    Args:
+        xsd_tree: xsd tree
+        xpath: xpath where to insert the element
+        type_name: name of the root type of the type to insert
+        type_target_namespace: target namespace of the type to insert
+        type_target_namespace_prefix: prefix of the target namespace of the type to insert
+        element_type_name: name of the type
+        include_url: url used to reference the type in schemaLocation
+
+    Returns:
+        the xsd tree, or a new tree if the namespaces map of the schema was updated.
+
+    """
+    # get namespaces information for the schema
+    namespaces = _get_tree_namespaces(xsd_tree)
+    # get target namespace information
+    target_namespace, target_namespace_prefix = get_target_namespace(xsd_tree, namespaces)
+    # build xpath to element
+    xpath = _get_lxml_xpath(namespaces, xpath)
+
     # format type name to avoid forbidden xml characters
     element_type_name = _get_valid_xml_name(element_type_name)
 
@@ -375,8 +599,8 @@ def _insert_element_type(xsd_string, xpath, type_content, element_type_name, inc
             new_root = XSDTree.create_element(root.tag, nsmap=root_ns_map, attrib=root.attrib)
             new_root[:] = root[:]
 
-            # return result tree
-            return new_root
+            # return result tree, built again to resolve the types locally
+            return build_xsd_tree(XSDTree.tostring(new_root))
 
     else:
         # return result tree
@@ -396,8 +620,26 @@ def insert_element_type(xsd_string, xpath, type_content, element_type_name, incl
     Returns:
 
     """
+    new_xsd_tree = insert_element_type_in_tree(build_xsd_tree(xsd_string), xpath, type_content, element_type_name,
+                                               include_url)
+    return XSDTree.tostring(new_xsd_tree)
+
+
+def insert_element_type_in_tree(xsd_tree, xpath, type_content, element_type_name, include_url):
+    """Insert an element of given type in xsd tree, and validates result.
+
+    Args:
+        xsd_tree: xsd tree
+        xpath: xpath where to insert the element
+        type_content: string content of the type to insert
+        element_type_name: name of the type
+        include_url: url used to reference the type in schemaLocation
 
-    new_xsd_tree = _insert_element_type(xsd_string, xpath, type_content, element_type_name, include_url)
+    Returns:
+        the xsd tree, or a new tree if the namespaces map of the schema was updated.
+
+    """
+    new_xsd_tree = _insert_element_type_in_tree(xsd_tree, xpath, type_content, element_type_name, include_url)
 
     error = validate_xml_schema(new_xsd_tree)
 
@@ -405,9 +647,7 @@ def insert_element_type(xsd_string, xpath, type_content, element_type_name, incl
     if error is not None:
         raise XMLError(error)
 
-    new_xsd_string = XSDTree.tostring(new_xsd_tree)
-
-    return new_xsd_string
+    return new_xsd_tree
 
 
 def insert_element_built_in_type(xsd_string, xpath, element_type_name):
@@ -421,19 +661,23 @@ def insert_element_built_in_type(xsd_string, xpath, element_type_name):
     Returns:
 
     """
-    # build the dom tree of the schema being built
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    # get namespaces information for the schema
-    namespaces = get_namespaces(xsd_string)
-    # get the default namespace
-    default_prefix = get_default_prefix(namespaces)
-    # build xpath to element
-    xpath = xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
+    xsd_tree = insert_element_built_in_type_in_tree(build_xsd_tree(xsd_string), xpath, element_type_name)
+    return XSDTree.tostring(xsd_tree)
+
+
+def insert_element_built_in_type_in_tree(xsd_tree, xpath, element_type_name):
+    """Insert element with a builtin type in xsd tree, and validates result.
+
+    Args:
+        xsd_tree: xsd tree
+        xpath: xpath where to insert the element
+        element_type_name: name of the type to insert
+
+    Returns:
+
+    """
+    _insert_element_built_in_type_in_tree(xsd_tree, xpath, element_type_name)
 
-    type_name = default_prefix + ':' + element_type_name
-    xsd_tree.find(xpath).append(XSDTree.create_element("{}element".format(LXML_SCHEMA_NAMESPACE),
-                                                       attrib={'type': type_name,
-                                                               'name': element_type_name}))
     # validate XML schema
     error = validate_xml_schema(xsd_tree)
 
@@ -441,7 +685,60 @@ def insert_element_built_in_type(xsd_string, xpath, element_type_name):
     if error is not None:
         raise XMLError(error)
 
-    return XSDTree.tostring(xsd_tree)
+    return xsd_tree
+
+
+def _insert_element_built_in_type_in_tree(xsd_tree, xpath, element_type_name):
+    """Insert element with a builtin type in xsd tree.
+
+    Args:
+        xsd_tree: xsd tree
+        xpath: xpath where to insert the element
+        element_type_name: name of the type to insert
+
+    Returns:
+
+    """
+    # get namespaces information for the schema
+    namespaces = _get_tree_namespaces(xsd_tree)
+    # get the default namespace
+    default_prefix = get_default_prefix(namespaces)
+
+    type_name = default_prefix + ':' + element_type_name
+    find_element(xsd_tree, xpath).append(XSDTree.create_element("{}element".format(LXML_SCHEMA_NAMESPACE),
+                                                                 attrib={'type': type_name,
+                                                                         'name': element_type_name}))
+    return xsd_tree
+
+
+def _get_tree_namespaces(xsd_tree):
+    """Return the namespaces declared on the root of the xsd tree, without re-parsing the document.
+
+    Args:
+        xsd_tree:
+
+    Returns:
+        dict: prefix -> namespace ('' for the default namespace).
+
+    """
+    root = xsd_tree.getroot() if hasattr(xsd_tree, 'getroot') else xsd_tree
+    return {prefix if prefix is not None else '': namespace for prefix, namespace in root.nsmap.items()}
+
+
+def _get_lxml_xpath(namespaces, xpath):
+    """Convert an xpath using the schema prefix to an xpath usable by lxml.
+
+    Args:
+        namespaces:
+        xpath:
+
+    Returns:
+
+    """
+    # get the default prefix
+    default_prefix = get_default_prefix(namespaces)
+    # set the element namespace
+    return xpath.replace(default_prefix + ":", LXML_SCHEMA_NAMESPACE)
 
 
 def _get_ns_type_name(prefix, type_name, prefix_required=False):
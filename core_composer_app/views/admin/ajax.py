@@ -2,14 +2,15 @@
 """
 import json
 
-from django.core.urlresolvers import reverse_lazy
-from django.http.response import HttpResponse, HttpResponseBadRequest
+from django.core.urlresolvers import reverse, reverse_lazy
+from django.http.response import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
 
 from core_composer_app.components.bucket import api as bucket_api
 from core_composer_app.components.bucket.models import Bucket
 from core_composer_app.components.type.models import Type
 from core_composer_app.components.type_version_manager import api as type_version_manager_api
 from core_composer_app.components.type_version_manager.models import TypeVersionManager
+from core_composer_app.utils import jobs as jobs_utils
 from core_composer_app.views.admin.forms import EditBucketForm
 from core_main_app.commons import exceptions
 from core_main_app.components.template.api import init_template_with_dependencies
@@ -39,7 +40,7 @@ def delete_bucket(request):
 
 
 def resolve_dependencies(request):
-    """Resolve import/includes to avoid local references.
+    """Submit a job resolving import/includes to avoid local references, and saving the type.
 
     Args:
         request:
@@ -52,25 +53,71 @@ def resolve_dependencies(request):
         name = request.POST.get('name', None)
         version_manager_id = request.POST.get('version_manager_id', '')
         filename = request.POST['filename']
-        xsd_content = request.POST['xsd_content']
+        xsd_content = _get_xsd_content_from_html(request.POST['xsd_content'])
         schema_locations = request.POST.getlist('schemaLocations[]')
         dependencies = request.POST.getlist('dependencies[]')
         buckets = request.POST.getlist('buckets[]')
 
-        # create new object
-        type_object = Type(filename=filename, content=_get_xsd_content_from_html(xsd_content))
-        init_template_with_dependencies(type_object, _get_dependencies_dict(schema_locations, dependencies))
+        job_id = jobs_utils.submit(request.user.id, _resolve_dependencies_job, name, version_manager_id, filename,
+                                   xsd_content, _get_dependencies_dict(schema_locations, dependencies), buckets)
+    except Exception, e:
+        return HttpResponseBadRequest(e.message, content_type='application/javascript')
+
+    response_dict = {
+        'job_id': job_id,
+        'status_url': '{}?job_id={}'.format(reverse('admin:core_composer_app_job_status'), job_id),
+    }
+    return HttpResponse(json.dumps(response_dict), content_type='application/javascript', status=202)
 
-        # get the version manager or create a new one
-        if version_manager_id != '':
-            type_version_manager = version_manager_api.get(version_manager_id)
-        else:
-            type_version_manager = TypeVersionManager(title=name)
-        type_version_manager_api.insert(type_version_manager, type_object, buckets)
+
+def get_job_status(request):
+    """Return the status of a job.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        status = jobs_utils.get_status(request.GET['job_id'], request.user.id)
+        if status is None:
+            return HttpResponseNotFound('Job not found.', content_type='application/javascript')
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
-    return HttpResponse(json.dumps({}), content_type='application/javascript')
+    return HttpResponse(json.dumps(status), content_type='application/javascript')
+
+
+def _resolve_dependencies_job(job, name, version_manager_id, filename, xsd_content, dependencies_dict, buckets):
+    """Resolve the dependencies of a type, then validate and save it.
+
+    Args:
+        job:
+        name:
+        version_manager_id:
+        filename:
+        xsd_content:
+        dependencies_dict:
+        buckets:
+
+    Returns:
+
+    """
+    job.set_progress('Resolving the dependencies.')
+    # create new object
+    type_object = Type(filename=filename, content=xsd_content)
+    init_template_with_dependencies(type_object, dependencies_dict)
+
+    job.set_progress('Validating and saving the type.')
+    # get the version manager or create a new one
+    if version_manager_id != '':
+        type_version_manager = version_manager_api.get(version_manager_id)
+    else:
+        type_version_manager = TypeVersionManager(title=name)
+    type_version_manager_api.insert(type_version_manager, type_object, buckets)
+
+    return {}
 
 
 class EditBucketView(EditObjectModalView):
@@ -31,16 +31,16 @@ class UploadTypeForm(forms.Form):
                            widget=forms.TextInput(attrs={'class': 'form-control'}))
     xsd_file = forms.FileField(label='Select a file', required=True,
                                widget=forms.FileInput(attrs={'class': 'form-control'}))
-    buckets = BucketDataModelChoiceField(label='Select buckets', queryset=bucket_api.get_all(), required=False,
-                                         widget=forms.SelectMultiple(attrs={'class': 'form-control'}))
+    buckets = BucketDataModelChoiceField(label='Select buckets', queryset=bucket_api.get_all_summaries(),
+                                         required=False, widget=forms.SelectMultiple(attrs={'class': 'form-control'}))
 
 
 class EditTypeBucketsForm(forms.Form):
     """
     Form to edit buckets of a Type.
     """
-    buckets = BucketDataModelChoiceField(label='Select new buckets', queryset=bucket_api.get_all(), required=False,
-                                         widget=forms.SelectMultiple(attrs={'class': 'form-control'}))
+    buckets = BucketDataModelChoiceField(label='Select new buckets', queryset=bucket_api.get_all_summaries(),
+                                         required=False, widget=forms.SelectMultiple(attrs={'class': 'form-control'}))
 
 
 class EditBucketForm(DocumentForm):
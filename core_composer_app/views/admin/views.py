@@ -38,8 +38,8 @@ def manage_types(request):
     """
     # get all types
     type_version_managers = type_version_manager_api.get_global_version_managers()
-    # get buckets
-    buckets = bucket_api.get_all()
+    # get buckets, without their types (the buckets of each type are stored in its version manager)
+    buckets = bucket_api.get_all_summaries()
 
     context = {
         'object_name': "Type",
@@ -150,6 +150,10 @@ def upload_type(request):
                 "path": 'core_main_app/admin/js/templates/upload/dependencies.js',
                 "is_raw": False
             },
+            {
+                "path": 'core_composer_app/common/js/jobs.js',
+                "is_raw": False
+            },
             {
                 "path": 'core_composer_app/admin/js/types/upload/dependencies.js',
                 "is_raw": False
@@ -308,6 +312,10 @@ def upload_type_version(request, version_manager_id):
                 "path": 'core_main_app/admin/js/templates/upload/dependencies.js',
                 "is_raw": False
             },
+            {
+                "path": 'core_composer_app/common/js/jobs.js',
+                "is_raw": False
+            },
             {
                 "path": 'core_composer_app/admin/js/types/upload/dependencies.js',
                 "is_raw": False
@@ -392,7 +400,7 @@ def manage_buckets(request):
 
     context = {
         'object_name': "Bucket",
-        'buckets': bucket_api.get_all()
+        'buckets': bucket_api.get_all_summaries()
     }
 
     assets = {
@@ -490,7 +498,7 @@ def manage_type_buckets(request, version_manager_id):
 
     context = {
         'version_manager': version_manager,
-        'buckets': bucket_api.get_all()
+        'type_buckets': bucket_api.get_by_type_version_manager(version_manager) if version_manager else []
     }
 
     assets = {
@@ -1,25 +1,33 @@
 """AJAX user views of composer application
 """
 import json
+import logging
 from urlparse import urlparse
 
-from django.http.response import HttpResponse, HttpResponseBadRequest
-from django.template import loader
+from bson.objectid import ObjectId
+from django.core.urlresolvers import reverse
+from django.http.response import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound
 
+from core_composer_app.commons.exceptions import DraftConflictError
 from core_composer_app.components.type import api as type_api
 from core_composer_app.components.type.models import Type
 from core_composer_app.components.type_version_manager import api as type_version_manager_api
 from core_composer_app.components.type_version_manager.models import TypeVersionManager
 from core_composer_app.permissions import rights
+from core_composer_app.settings import COMPOSER_VALIDATION_MODE, COMPOSER_RENDERING_CACHE_WARM
+from core_composer_app.utils import draft as draft_utils
+from core_composer_app.utils import jobs as jobs_utils
+from core_composer_app.utils import operations as operations_utils
+from core_composer_app.utils import rendering as rendering_utils
 from core_composer_app.utils import xml as composer_xml_utils
 from core_main_app.commons import exceptions
 from core_main_app.components.template.models import Template
 from core_main_app.components.template_version_manager import api as template_version_manager_api
 from core_main_app.components.template_version_manager.models import TemplateVersionManager
 from core_main_app.utils import decorators as decorators
-from core_main_app.utils import xml as main_xml_utils
 from core_main_app.utils.urls import get_template_download_pattern
-from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+logger = logging.getLogger(__name__)
 
 
 @decorators.permission_required(content_type=rights.composer_content_type,
@@ -37,36 +45,19 @@ def insert_element_sequence(request):
         type_id = request.POST['typeID']
         type_name = request.POST['typeName']
         xpath = request.POST['xpath']
-        namespace = request.POST['namespace']
-        path = request.POST['path']
-
-        # get link to the type to include
-        xsd_string = request.session['newXmlTemplateCompose']
-
-        if type_id == 'built_in_type':
-            # insert built-in type into xsd string
-            new_xsd_str = composer_xml_utils.insert_element_built_in_type(xsd_string, xpath, type_name)
-        else:
-            # get type from database
-            type_object = type_api.get(type_id)
-            # generate include url
-            include_url = main_xml_utils._get_schema_location_uri(str(type_id))
-            # insert element in xsd string
-            new_xsd_str = composer_xml_utils.insert_element_type(xsd_string, xpath, type_object.content, type_name,
-                                                                 include_url)
-            # add the id of the type if not already present
-            if include_url not in request.session['includedTypesCompose']:
-                request.session['includedTypesCompose'].append(include_url)
-
-        # save the tree in the session
-        request.session['newXmlTemplateCompose'] = new_xsd_str
-
-        template = loader.get_template('core_composer_app/user/builder/new_element.html')
-        context = {'namespace': namespace,
-                   'path': path,
-                   'type_name': type_name}
-        new_element_html = template.render(context)
-        return HttpResponse(json.dumps({'new_element': new_element_html}), content_type='application/json')
+
+        # insert element in the draft
+        results, error, revision = _apply_operations(request, [{'action': operations_utils.INSERT,
+                                                                'typeID': type_id,
+                                                                'typeName': type_name,
+                                                                'xpath': xpath}], render=True)
+        if error is not None:
+            return _error_response(error)
+
+        return HttpResponse(json.dumps({'new_element': results[0]['element'], 'revision': revision}),
+                            content_type='application/json')
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
@@ -85,14 +76,18 @@ def change_xsd_type(request):
     try:
         xpath = request.POST['xpath']
         new_type = request.POST['newType']
-        xsd_string = request.session['newXmlTemplateCompose']
 
         # change type
-        xsd_string = composer_xml_utils.change_xsd_element_type(xsd_string, xpath, new_type)
+        results, error, revision = _apply_operations(request, [{'action': operations_utils.CHANGE_TYPE,
+                                                                'xpath': xpath,
+                                                                'newType': new_type}], render=True)
+        if error is not None:
+            return _error_response(error)
 
-        # save the tree in the session
-        request.session['newXmlTemplateCompose'] = xsd_string
-        return HttpResponse(json.dumps({}), content_type='application/javascript')
+        return HttpResponse(json.dumps({'element': results[0]['element'], 'revision': revision}),
+                            content_type='application/javascript')
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
@@ -110,13 +105,16 @@ def change_root_type_name(request):
     """
     try:
         type_name = request.POST['typeName']
-        xsd_string = request.session['newXmlTemplateCompose']
 
         # rename root type
-        xsd_string = composer_xml_utils.rename_single_root_type(xsd_string, type_name)
+        _, error, revision = _apply_operations(request, [{'action': operations_utils.RENAME_ROOT_TYPE,
+                                                          'typeName': type_name}])
+        if error is not None:
+            return _error_response(error)
 
-        request.session['newXmlTemplateCompose'] = xsd_string
-        return HttpResponse(json.dumps({}), content_type='application/javascript')
+        return HttpResponse(json.dumps({'revision': revision}), content_type='application/javascript')
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
@@ -135,23 +133,18 @@ def rename_element(request):
     try:
         xpath = request.POST['xpath']
         new_name = request.POST['newName']
-        xsd_string = request.session['newXmlTemplateCompose']
-
-        # rename element
-        xsd_string = composer_xml_utils.rename_xsd_element(xsd_string, xpath, new_name)
-
-        # build xsd tree
-        xsd_tree = XSDTree.build_tree(xsd_string)
-        # validate the schema
-        error = main_xml_utils.validate_xml_schema(xsd_tree)
 
+        # rename element, and validate the schema
+        results, error, revision = _apply_operations(request, [{'action': operations_utils.RENAME,
+                                                                'xpath': xpath,
+                                                                'newName': new_name}], render=True)
         if error is not None:
             return _error_response("This is not a valid name.")
 
-        # save the tree in the session
-        request.session['newXmlTemplateCompose'] = xsd_string
-
-        return HttpResponse(json.dumps({}), content_type='application/javascript')
+        return HttpResponse(json.dumps({'element': results[0]['element'], 'revision': revision}),
+                            content_type='application/javascript')
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
@@ -169,15 +162,16 @@ def delete_element(request):
     """
     try:
         xpath = request.POST['xpath']
-        xsd_string = request.session['newXmlTemplateCompose']
 
-        # delete element from string
-        xsd_string = composer_xml_utils.delete_xsd_element(xsd_string, xpath)
-
-        # save the tree in the session
-        request.session['newXmlTemplateCompose'] = xsd_string
+        # delete element from tree
+        _, error, revision = _apply_operations(request, [{'action': operations_utils.DELETE,
+                                                          'xpath': xpath}])
+        if error is not None:
+            return _error_response(error)
 
-        return HttpResponse(json.dumps({}), content_type='application/javascript')
+        return HttpResponse(json.dumps({'revision': revision}), content_type='application/javascript')
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
@@ -195,10 +189,11 @@ def get_element_occurrences(request):
     """
     try:
         xpath = request.POST['xpath']
-        xsd_string = request.session['newXmlTemplateCompose']
 
         # get occurrences of xsd element
-        min_occurs, max_occurs = composer_xml_utils.get_xsd_element_occurrences(xsd_string, xpath)
+        with draft_utils.lock_draft(request):
+            xsd_tree = draft_utils.get_draft_tree(draft_utils.get_draft(request))
+            min_occurs, max_occurs = composer_xml_utils.get_element_occurrences_from_tree(xsd_tree, xpath)
 
         response_dict = {'minOccurs': min_occurs, 'maxOccurs': max_occurs}
         return HttpResponse(json.dumps(response_dict), content_type='application/javascript')
@@ -206,6 +201,32 @@ def get_element_occurrences(request):
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
 
+@decorators.permission_required(content_type=rights.composer_content_type,
+                                permission=rights.composer_access, raise_exception=True)
+def render_element(request):
+    """Render the selected element and its children, to update a single node of the displayed tree.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        xpath = request.POST['xpath']
+
+        with draft_utils.lock_draft(request):
+            compose_draft = draft_utils.get_draft(request)
+            xsd_tree = draft_utils.get_draft_tree(compose_draft)
+            element_html = rendering_utils.render_xsd_element(xsd_tree,
+                                                              composer_xml_utils.find_element(xsd_tree, xpath))
+
+        return HttpResponse(json.dumps({'element': element_html, 'revision': compose_draft.version}),
+                            content_type='application/javascript')
+    except Exception, e:
+        return HttpResponseBadRequest(e.message, content_type='application/javascript')
+
+
 @decorators.permission_required(content_type=rights.composer_content_type,
                                 permission=rights.composer_access, raise_exception=True)
 def set_element_occurrences(request):
@@ -221,22 +242,30 @@ def set_element_occurrences(request):
         xpath = request.POST['xpath']
         min_occurs = request.POST['minOccurs']
         max_occurs = request.POST['maxOccurs']
-        xsd_string = request.session['newXmlTemplateCompose']
 
         # set element occurrences
-        xsd_string = composer_xml_utils.set_xsd_element_occurrences(xsd_string, xpath, min_occurs, max_occurs)
+        results, error, revision = _apply_operations(request, [{'action': operations_utils.SET_OCCURRENCES,
+                                                                'xpath': xpath,
+                                                                'minOccurs': min_occurs,
+                                                                'maxOccurs': max_occurs}], render=True)
+        if error is not None:
+            return _error_response(error)
 
-        # save the tree in the session
-        request.session['newXmlTemplateCompose'] = xsd_string
-        return HttpResponse(json.dumps({}), content_type='application/javascript')
+        return HttpResponse(json.dumps({'element': results[0]['element'], 'revision': revision}),
+                            content_type='application/javascript')
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
 
 @decorators.permission_required(content_type=rights.composer_content_type,
-                                permission=rights.composer_save_template, raise_exception=True)
-def save_template(request):
-    """Save the current template in the database.
+                                permission=rights.composer_access, raise_exception=True)
+def apply_operations(request):
+    """Apply a list of operations to the schema, and validate the result once.
+
+    The operations are applied in order, and are all discarded if one of them fails or if the resulting schema
+    is not valid.
 
     Args:
         request:
@@ -245,39 +274,121 @@ def save_template(request):
 
     """
     try:
-        template_name = request.POST['templateName']
-        xsd_string = request.session['newXmlTemplateCompose']
+        operations = json.loads(request.POST['operations'])
+        if not isinstance(operations, list) or not all(isinstance(operation, dict) for operation in operations):
+            return _error_response("The operations should be a list of objects.")
 
-        response_dict = {}
+        results, error, revision = _apply_operations(request, operations)
 
-        try:
-            # Build XSD tree
-            xsd_tree = XSDTree.build_tree(xsd_string)
+        response_dict = {'results': results, 'revision': revision}
+        if error is not None:
+            response_dict['error'] = error
+            return HttpResponseBadRequest(json.dumps(response_dict), content_type='application/json')
 
-            # validate the schema
-            error = main_xml_utils.validate_xml_schema(xsd_tree)
+        return HttpResponse(json.dumps(response_dict), content_type='application/json')
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
+    except Exception, e:
+        return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
-            if error is not None:
-                return _error_response('This is not a valid XML schema. ' + error)
-        except Exception, e:
-            return _error_response('This is not a valid XML schema. ' + e.message)
 
-        # get list of dependencies
-        dependencies = _get_dependencies_ids(request.session["includedTypesCompose"])
+@decorators.permission_required(content_type=rights.composer_content_type,
+                                permission=rights.composer_access, raise_exception=True)
+def undo(request):
+    """Cancel the last edit of the schema.
 
-        try:
-            # create template version manager
-            template_version_manager = TemplateVersionManager(title=template_name, user=str(request.user.id))
-            # create template
-            template = Template(filename=template_name, content=xsd_string, dependencies=dependencies)
-            # save template in database
-            template_version_manager_api.insert(template_version_manager, template)
-        except exceptions.NotUniqueError:
-            return HttpResponseBadRequest("A template with the same name already exists. Please choose another name.")
-        except Exception, e:
-            return _error_response(e.message)
+    Args:
+        request:
 
-        return HttpResponse(json.dumps(response_dict), content_type='application/javascript')
+    Returns:
+
+    """
+    try:
+        revision = _get_revision(request)
+        with draft_utils.lock_draft(request):
+            compose_draft = draft_utils.get_draft(request)
+            draft_utils.check_draft_revision(compose_draft, revision, rebase=False)
+            xsd_tree = draft_utils.undo_draft(compose_draft, validated=_is_validated_on_edit())
+            return _history_response(compose_draft, xsd_tree)
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
+    except Exception, e:
+        return HttpResponseBadRequest(e.message, content_type='application/javascript')
+
+
+@decorators.permission_required(content_type=rights.composer_content_type,
+                                permission=rights.composer_access, raise_exception=True)
+def redo(request):
+    """Apply again the last cancelled edit of the schema.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        revision = _get_revision(request)
+        with draft_utils.lock_draft(request):
+            compose_draft = draft_utils.get_draft(request)
+            draft_utils.check_draft_revision(compose_draft, revision, rebase=False)
+            xsd_tree = draft_utils.redo_draft(compose_draft, validated=_is_validated_on_edit())
+            return _history_response(compose_draft, xsd_tree)
+    except DraftConflictError, e:
+        return _conflict_response(request, e)
+    except Exception, e:
+        return HttpResponseBadRequest(e.message, content_type='application/javascript')
+
+
+@decorators.permission_required(content_type=rights.composer_content_type,
+                                permission=rights.composer_access, raise_exception=True)
+def check_schema(request):
+    """Validate the current schema.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        with draft_utils.lock_draft(request):
+            compose_draft = draft_utils.get_draft(request)
+            error = composer_xml_utils.validate_xml_schema(draft_utils.get_draft_tree(compose_draft))
+            draft_utils.set_draft_validated(compose_draft, error is None)
+
+        if error is not None:
+            return _error_response('This is not a valid XML schema. ' + error)
+
+        return HttpResponse(json.dumps({'validated': True, 'revision': compose_draft.version}),
+                            content_type='application/javascript')
+    except Exception, e:
+        return HttpResponseBadRequest(e.message, content_type='application/javascript')
+
+
+@decorators.permission_required(content_type=rights.composer_content_type,
+                                permission=rights.composer_save_template, raise_exception=True)
+def save_template(request):
+    """Submit a job saving the current template in the database.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        template_name = request.POST['templateName']
+
+        with draft_utils.lock_draft(request):
+            compose_draft = draft_utils.get_draft(request)
+            xsd_string = draft_utils.get_draft_string(compose_draft)
+            includes = draft_utils.get_draft_includes(compose_draft)
+
+        job_id = jobs_utils.submit(request.user.id, _save_template_job,
+                                   str(request.user.id), template_name, xsd_string, includes)
+
+        return _job_response(job_id)
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
@@ -285,7 +396,7 @@ def save_template(request):
 @decorators.permission_required(content_type=rights.composer_content_type,
                                 permission=rights.composer_save_type, raise_exception=True)
 def save_type(request):
-    """Save the current type in the database.
+    """Submit a job saving the current type in the database.
 
     Args:
         request:
@@ -296,51 +407,287 @@ def save_type(request):
     try:
         type_name = request.POST['typeName']
         template_id = request.POST['templateID']
-        xsd_string = request.session['newXmlTemplateCompose']
-
-        response_dict = {}
 
         # can save as type if new type or from existing type
         if template_id != "new":
             try:
                 # check if the type exists, raises exception otherise
-                type_api.get(template_id)
+                type_api.get_summary(template_id)
             except:
                 # the type does not exist
                 return _error_response("Unable to save an existing template as a type.")
 
-        try:
-            # remove root from tree if present
-            xsd_string = composer_xml_utils.remove_single_root_element(xsd_string)
-            # build xsd tree
-            xsd_tree = XSDTree.build_tree(xsd_string)
-            # validate the schema
-            error = main_xml_utils.validate_xml_schema(xsd_tree)
+        with draft_utils.lock_draft(request):
+            compose_draft = draft_utils.get_draft(request)
+            xsd_string = draft_utils.get_draft_string(compose_draft)
+            includes = draft_utils.get_draft_includes(compose_draft)
 
-            if error is not None:
-                return _error_response('This is not a valid XML schema. ' + error)
-        except Exception, e:
-            return _error_response('This is not a valid XML schema. ' + e.message)
+        job_id = jobs_utils.submit(request.user.id, _save_type_job,
+                                   str(request.user.id), type_name, xsd_string, includes)
 
-        dependencies = _get_dependencies_ids(request.session["includedTypesCompose"])
+        return _job_response(job_id)
+    except Exception, e:
+        return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
-        try:
-            # create type version manager
-            type_version_manager = TypeVersionManager(title=type_name, user=str(request.user.id))
-            # create type
-            type_object = Type(filename=type_name, content=xsd_string, dependencies=dependencies)
-            # save type in database
-            type_version_manager_api.insert(type_version_manager, type_object)
-        except exceptions.NotUniqueError, e:
-            return HttpResponseBadRequest("A type with the same name already exists. Please choose another name.")
-        except Exception, e:
-            return _error_response(e.message)
 
-        return HttpResponse(json.dumps(response_dict), content_type='application/javascript')
+@decorators.permission_required(content_type=rights.composer_content_type,
+                                permission=rights.composer_access, raise_exception=True)
+def get_job_status(request):
+    """Return the status of a job.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    try:
+        status = jobs_utils.get_status(request.GET['job_id'], request.user.id)
+        if status is None:
+            return HttpResponseNotFound('Job not found.', content_type='application/javascript')
+
+        return HttpResponse(json.dumps(status), content_type='application/javascript')
     except Exception, e:
         return HttpResponseBadRequest(e.message, content_type='application/javascript')
 
 
+def _save_template_job(job, user_id, template_name, xsd_string, includes):
+    """Validate and save a template.
+
+    Args:
+        job:
+        user_id:
+        template_name:
+        xsd_string:
+        includes: list of schemaLocation of the included/imported types
+
+    Returns:
+
+    """
+    job.set_progress('Validating the schema.')
+    _validate_schema(xsd_string)
+
+    job.set_progress('Saving the template.')
+    # get list of dependencies
+    dependencies = _get_dependencies_ids(includes)
+    try:
+        # create template version manager
+        template_version_manager = TemplateVersionManager(title=template_name, user=user_id)
+        # create template
+        template = Template(filename=template_name, content=xsd_string, dependencies=dependencies)
+        # save template in database
+        template_version_manager_api.insert(template_version_manager, template)
+    except exceptions.NotUniqueError:
+        raise jobs_utils.JobError("A template with the same name already exists. Please choose another name.")
+
+    _warm_rendering(job, template.id, xsd_string)
+    return {}
+
+
+def _save_type_job(job, user_id, type_name, xsd_string, includes):
+    """Validate and save a type.
+
+    Args:
+        job:
+        user_id:
+        type_name:
+        xsd_string:
+        includes: list of schemaLocation of the included/imported types
+
+    Returns:
+
+    """
+    job.set_progress('Validating the schema.')
+    try:
+        # remove root from tree if present
+        xsd_string = composer_xml_utils.remove_single_root_element(xsd_string)
+    except Exception, e:
+        raise jobs_utils.JobError('This is not a valid XML schema. ' + e.message)
+    _validate_schema(xsd_string)
+
+    job.set_progress('Saving the type.')
+    dependencies = _get_dependencies_ids(includes)
+    try:
+        # create type version manager
+        type_version_manager = TypeVersionManager(title=type_name, user=user_id)
+        # create type
+        type_object = Type(filename=type_name, content=xsd_string, dependencies=dependencies)
+        # save type in database
+        type_version_manager_api.insert(type_version_manager, type_object)
+    except exceptions.NotUniqueError:
+        raise jobs_utils.JobError("A type with the same name already exists. Please choose another name.")
+
+    _warm_rendering(job, type_object.id, xsd_string)
+    return {}
+
+
+def _validate_schema(xsd_string):
+    """Validate the schema, raise a JobError if not valid.
+
+    Args:
+        xsd_string:
+
+    Returns:
+
+    """
+    try:
+        error = composer_xml_utils.validate_xml_schema(composer_xml_utils.build_xsd_tree(xsd_string))
+    except Exception, e:
+        error = e.message
+
+    if error is not None:
+        raise jobs_utils.JobError('This is not a valid XML schema. ' + error)
+
+
+def _warm_rendering(job, template_id, xsd_string):
+    """Render a saved template or type, so opening it in the composer is a cache hit.
+
+    Args:
+        job:
+        template_id:
+        xsd_string:
+
+    Returns:
+
+    """
+    if not COMPOSER_RENDERING_CACHE_WARM:
+        return
+
+    job.set_progress('Rendering the schema.')
+    try:
+        rendering_utils.render_template(template_id, xsd_string)
+    except Exception:
+        # the schema is saved, it will be rendered when opened
+        logger.exception('Unable to render the schema {}.'.format(template_id))
+
+
+def _job_response(job_id):
+    """Return the response of a request accepted as a job.
+
+    Args:
+        job_id:
+
+    Returns:
+
+    """
+    response_dict = {
+        'job_id': job_id,
+        'status_url': '{}?job_id={}'.format(reverse('core_composer_job_status'), job_id),
+    }
+    return HttpResponse(json.dumps(response_dict), content_type='application/javascript', status=202)
+
+
+def _history_response(compose_draft, xsd_tree):
+    """Return the response of an undo/redo request, with the new rendering of the schema.
+
+    Args:
+        compose_draft:
+        xsd_tree: tree of the draft, None if the history was not modified
+
+    Returns:
+
+    """
+    if xsd_tree is None:
+        return _error_response('Nothing to undo or redo.')
+
+    response_dict = {
+        'xsd_form': rendering_utils.render_xsd_tree(xsd_tree),
+        'can_undo': draft_utils.can_undo_draft(compose_draft),
+        'can_redo': draft_utils.can_redo_draft(compose_draft),
+        'revision': compose_draft.version,
+    }
+    return HttpResponse(json.dumps(response_dict), content_type='application/javascript')
+
+
+def _apply_operations(request, operations, render=False):
+    """Apply operations to the xsd tree of the draft, and save the result if valid.
+
+    Args:
+        request:
+        operations: list of operations
+        render: add the HTML of the element inserted or modified by each operation to its result
+
+    Returns:
+        results: list of results, one per operation applied
+        error: error message, None if the draft was saved
+        revision: revision of the draft
+
+    """
+    validate = _is_validated_on_edit()
+    revision = _get_revision(request)
+
+    with draft_utils.lock_draft(request):
+        compose_draft = draft_utils.get_draft(request)
+        # operations sent for an outdated revision may still be applicable
+        draft_utils.check_draft_revision(compose_draft, revision)
+        xsd_tree = draft_utils.get_draft_tree(compose_draft)
+        try:
+            xsd_tree, results, error = operations_utils.apply_operations(xsd_tree, operations, validate=validate)
+            # render before saving, so an edit is never saved when its response is an error
+            if error is None and render:
+                for result in results:
+                    if 'xpath' in result:
+                        element = composer_xml_utils.find_element(xsd_tree, result['xpath'])
+                        result['element'] = rendering_utils.render_xsd_element(xsd_tree, element)
+        except Exception:
+            draft_utils.discard_draft_tree(compose_draft)
+            raise
+
+        if error is not None:
+            # the cached tree may have been partially modified
+            draft_utils.discard_draft_tree(compose_draft)
+            return results, error, compose_draft.version
+
+        draft_utils.save_draft_operations(compose_draft, xsd_tree, operations, validated=validate)
+
+    return results, None, compose_draft.version
+
+
+def _get_revision(request):
+    """Return the revision of the draft known by the client, None if not sent.
+
+    Args:
+        request:
+
+    Returns:
+
+    """
+    revision = request.META.get('HTTP_X_COMPOSE_DRAFT_REVISION') or request.POST.get('revision')
+    return int(revision) if revision else None
+
+
+def _conflict_response(request, error):
+    """Return the response of a request conflicting with another modification of the draft, with the current
+    rendering and revision of the draft so the client can resume from it.
+
+    Args:
+        request:
+        error:
+
+    Returns:
+
+    """
+    response_dict = {'error': error.message, 'revision': error.revision}
+    try:
+        with draft_utils.lock_draft(request):
+            compose_draft = draft_utils.get_draft(request)
+            response_dict['revision'] = compose_draft.version
+            response_dict['xsd_form'] = rendering_utils.render_xsd_tree(draft_utils.get_draft_tree(compose_draft))
+    except Exception:
+        pass
+    return HttpResponse(json.dumps(response_dict), content_type='application/json', status=409)
+
+
+def _is_validated_on_edit():
+    """Return True if the schema is validated after each edit.
+
+    Returns:
+
+    """
+    # in deferred mode, the schema is validated on save or on demand
+    return COMPOSER_VALIDATION_MODE != operations_utils.DEFERRED_VALIDATION
+
+
 def _get_dependencies_ids(list_dependencies):
     """Return list of type ids from list of dependencies.
 
@@ -350,26 +697,22 @@ def _get_dependencies_ids(list_dependencies):
     Returns:
 
     """
-    # declare list of dependencies
-    dependencies = []
+    # declare list of type ids
+    type_ids = []
     # get pattern to match a template download
     pattern = get_template_download_pattern()
     # get all type ids
     for uri in list_dependencies:
         # parse dependency url
         url = urlparse(uri)
-        try:
-            # get object id from url
-            object_id = pattern.match(url.path).group('pk')
-            # get type by id, exception raised if not found
-            type_object = type_api.get(object_id)
-            # add id to list of internal dependencies
-            dependencies.append(type_object)
-        except:
-            # id not found, don't add it to list of dependencies
-            pass
-
-    return dependencies
+        match = pattern.match(url.path)
+        # get object id from url
+        if match is not None and ObjectId.is_valid(match.group('pk')):
+            type_ids.append(ObjectId(match.group('pk')))
+
+    # get all types at once, without their content (ids not found are not added to the list of dependencies)
+    types = dict((type_object.id, type_object) for type_object in type_api.get_summaries_by_ids(type_ids))
+    return [types[type_id] for type_id in type_ids if type_id in types]
 
 
 def _error_response(error):
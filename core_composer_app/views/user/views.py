@@ -1,29 +1,22 @@
 """Composer app user views
 """
-from os.path import join
-
 from django.conf import settings
-from django.contrib.staticfiles import finders
 from django.core.urlresolvers import reverse_lazy
 
-from core_composer_app.components.bucket import api as bucket_api
 from core_composer_app.components.type_version_manager import api as type_version_manager_api
 from core_composer_app.permissions import rights
+from core_composer_app.settings import COMPOSER_VALIDATION_MODE, COMPOSER_DEFERRED_VALIDATION_DELAY
+from core_composer_app.utils import catalog as catalog_utils
+from core_composer_app.utils import draft as draft_utils
+from core_composer_app.utils import rendering as rendering_utils
+from core_composer_app.utils import resources as resources_utils
 from core_main_app.components.template import api as template_api
 from core_main_app.components.template_version_manager import api as template_version_manager_api
 from core_main_app.components.version_manager import api as version_manager_api
 from core_main_app.utils import decorators as decorators
-from core_main_app.utils.file import read_file_content, get_file_http_response
+from core_main_app.utils.file import get_file_http_response
 from core_main_app.utils.rendering import render
-from core_main_app.utils.xml import xsl_transform
 from core_main_app.views.user.views import get_context_manage_template_versions
-from xml_utils.commons.constants import LXML_SCHEMA_NAMESPACE
-from xml_utils.xsd_tree.operations.annotation import remove_annotations
-from xml_utils.xsd_tree.xsd_tree import XSDTree
-from xml_utils.xsd_types.xsd_types import get_xsd_types
-
-
-# TODO: see if sessions are problematic
 
 
 @decorators.permission_required(content_type=rights.composer_content_type,
@@ -74,52 +67,25 @@ def build_template(request, template_id):
 
     """
     if template_id == "new":
-        base_template_path = finders.find(join('core_composer_app', 'user', 'xsd', 'new_base_template.xsd'))
-        xsd_string = read_file_content(base_template_path)
+        xsd_string = resources_utils.get_new_base_template()
     else:
         template = template_api.get(template_id)
         xsd_string = template.content
 
-    request.session['newXmlTemplateCompose'] = xsd_string
-    request.session['includedTypesCompose'] = []
-
-    # store the current includes/imports
-    xsd_tree = XSDTree.build_tree(xsd_string)
-    includes = xsd_tree.findall("{}include".format(LXML_SCHEMA_NAMESPACE))
-    for el_include in includes:
-        if 'schemaLocation' in el_include.attrib:
-            request.session['includedTypesCompose'].append(el_include.attrib['schemaLocation'])
-    imports = xsd_tree.findall("{}import".format(LXML_SCHEMA_NAMESPACE))
-    for el_import in imports:
-        if 'schemaLocation' in el_import.attrib:
-            request.session['includedTypesCompose'].append(el_import.attrib['schemaLocation'])
-
-    # remove annotations from the tree
-    remove_annotations(xsd_tree)
-    xsd_string = XSDTree.tostring(xsd_tree)
-
-    # loads XSLT
-    xslt_path = finders.find(join('core_composer_app', 'user', 'xsl', 'xsd2html.xsl'))
-    # reads XSLT
-    xslt_string = read_file_content(xslt_path)
-    # transform XML to HTML
-    xsd_to_html_string = xsl_transform(xsd_string, xslt_string)
-
-    # 1) Get user defined types
-    user_types = type_version_manager_api.get_version_managers_by_user(str(request.user.id))
-    # 2) Get buckets
-    buckets = bucket_api.get_all()
-
-    # 3) no_buckets_types: list of types that are not assigned to a specific bucket
-    no_buckets_types = type_version_manager_api.get_no_buckets_types()
-
-    # 4) Build list of built-in types
-    built_in_types = []
-    for built_in_type in get_xsd_types():
-        built_in_types.append({'current': 'built_in_type', 'title': built_in_type})
+    # transform XML to HTML, and get the current includes/imports
+    xsd_tree, xsd_to_html_string, included_types = rendering_utils.render_template(template_id, xsd_string)
+
+    compose_draft = draft_utils.create_draft(request, xsd_string, included_types, xsd_tree=xsd_tree)
+
+    # get the buckets, the types without bucket, the built-in types and the user defined types
+    catalog = catalog_utils.get_catalog(request.user.id)
 
     assets = {
         "js": [
+            {
+                "path": 'core_composer_app/common/js/jobs.js',
+                "is_raw": False
+            },
             {
                 "path": 'core_composer_app/user/js/build_template.js',
                 "is_raw": False
@@ -148,12 +114,16 @@ def build_template(request, template_id):
                 'core_composer_app/user/css/xsd_tree.css']
     }
     context = {
-        'buckets': buckets,
-        'built_in_types': built_in_types,
-        'no_buckets_types': no_buckets_types,
-        'user_types': user_types,
+        'buckets': catalog['buckets'],
+        'built_in_types': catalog['built_in_types'],
+        'no_buckets_types': catalog['no_buckets_types'],
+        'user_types': catalog['user_types'],
         'xsd_form': xsd_to_html_string,
         'template_id': template_id,
+        'draft_id': str(compose_draft.id),
+        'draft_revision': compose_draft.version,
+        'validation_mode': COMPOSER_VALIDATION_MODE,
+        'validation_delay': COMPOSER_DEFERRED_VALIDATION_DELAY,
     }
 
     modals = [
@@ -191,7 +161,8 @@ def download_xsd(request):
     Returns:
 
     """
-    xsd_string = request.session['newXmlTemplateCompose']
+    with draft_utils.lock_draft(request):
+        xsd_string = draft_utils.get_draft_string(draft_utils.get_draft(request))
 
     # return the file
     return get_file_http_response(file_content=xsd_string,
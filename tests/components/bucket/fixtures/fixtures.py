@@ -30,6 +30,12 @@ class BucketFixtures(TypeVersionManagerFixtures):
                                color='#000002',
                                types=[self.type_vm_1, self.type_vm_2]).save()
 
+        # reverse index of the types of the buckets
+        self.type_vm_1.buckets = [self.bucket_1.id, self.bucket_2.id]
+        self.type_vm_1.save()
+        self.type_vm_2.buckets = [self.bucket_2.id]
+        self.type_vm_2.save()
+
         self.bucket_collection = [self.bucket_empty,
                                   self.bucket_1,
                                   self.bucket_2]
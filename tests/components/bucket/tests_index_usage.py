@@ -0,0 +1,98 @@
+"""Check that the frequent queries on the composer documents use an index
+
+Usage:
+    COMPOSER_BENCHMARK_MONGODB_URI=mongodb://localhost/composer_benchmark python -m unittest \
+tests.components.bucket.tests_index_usage
+
+Requires a MongoDB server (the tests are skipped if COMPOSER_BENCHMARK_MONGODB_URI is not set): the database is
+created, then dropped. The plans of the queries are read with explain(), and the test fails if a query scans a whole
+collection.
+"""
+import os
+from unittest.case import TestCase, skipUnless
+
+from bson.objectid import ObjectId
+from mongoengine import connect
+from mongoengine.connection import disconnect, get_db
+
+from core_composer_app.components.bucket.models import Bucket
+from core_composer_app.components.type.models import Type
+from core_composer_app.components.type_version_manager import api as type_version_manager_api
+from core_composer_app.components.type_version_manager.models import TypeVersionManager
+
+MONGODB_URI = os.environ.get('COMPOSER_BENCHMARK_MONGODB_URI')
+
+COLLECTION_SCAN = 'COLLSCAN'
+
+
+def _get_hot_queries():
+    """Return the frequent queries of the composer, by name.
+
+    Returns:
+
+    """
+    return [
+        ('global type version managers', TypeVersionManager.get_global_version_managers()),
+        ('active global type version managers', TypeVersionManager.get_active_global_version_manager()),
+        ('type version managers of a user', TypeVersionManager.get_version_managers_by_user('1')),
+        ('active type version managers of a user', TypeVersionManager.get_active_version_manager_by_user_id('1')),
+        ('type version managers of other users', TypeVersionManager.get_all_type_version_manager_except_user_id('1')),
+        ('all type version managers', TypeVersionManager.get_all_type_version_manager()),
+        ('types without bucket', TypeVersionManager.get_global_version_managers_without_bucket(
+            fields=type_version_manager_api.SUMMARY_FIELDS)),
+        ('types by id or title', TypeVersionManager.get_global_version_managers_by_ids_or_titles([ObjectId()],
+                                                                                                 ['type0'])),
+        ('types of a bucket', TypeVersionManager.objects(buckets=ObjectId())),
+        ('complex types', Type.get_all_complex_type()),
+        ('buckets of a type', Bucket.objects(types=ObjectId())),
+        ('buckets by label', Bucket.get_by_labels(['bucket0'])),
+    ]
+
+
+def _get_stages(plan):
+    """Return the stages of a query plan and of its input plans.
+
+    Args:
+        plan:
+
+    Returns:
+
+    """
+    stages = [plan.get('stage')]
+    for input_plan in [plan.get('inputStage')] + plan.get('inputStages', []):
+        if input_plan is not None:
+            stages += _get_stages(input_plan)
+    return stages
+
+
+@skipUnless(MONGODB_URI, 'COMPOSER_BENCHMARK_MONGODB_URI is not set')
+class TestIndexUsage(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        connect(host=MONGODB_URI)
+        # a few documents, so the query planner compares the plans
+        version_managers = TypeVersionManager.objects.insert([
+            TypeVersionManager(title='type{}'.format(index), user=None if index % 2 else str(index),
+                               versions=[], disabled_versions=[], current=None, is_disabled=False)
+            for index in range(20)
+        ])
+        Bucket.objects.insert([
+            Bucket(label='bucket{}'.format(index), color='#{:06X}'.format(index), types=version_managers[:index])
+            for index in range(5)
+        ])
+        Type.objects.insert([
+            Type(filename='type{}.xsd'.format(index), content='<schema/>', hash=str(index), is_complex=index % 2 == 0)
+            for index in range(20)
+        ])
+
+    @classmethod
+    def tearDownClass(cls):
+        db = get_db()
+        db.client.drop_database(db.name)
+        disconnect()
+
+    def test_hot_queries_do_not_scan_collections(self):
+        collection_scans = [name for name, queryset in _get_hot_queries()
+                            if COLLECTION_SCAN in _get_stages(queryset.explain()['queryPlanner']['winningPlan'])]
+
+        self.assertEqual(collection_scans, [])
@@ -0,0 +1,181 @@
+""" Integration Test for Bucket API
+"""
+from bson.objectid import ObjectId
+
+from core_composer_app.components.bucket import api as bucket_api
+from core_composer_app.components.bucket.models import Bucket
+from core_composer_app.components.type_version_manager.models import TypeVersionManager
+from core_main_app.commons.exceptions import ApiError
+from core_main_app.utils.integration_tests.integration_base_test_case import \
+    MongoIntegrationBaseTestCase
+from tests.components.bucket.fixtures.fixtures import BucketFixtures
+
+fixture_bucket = BucketFixtures()
+
+
+class TestAddTypeToBuckets(MongoIntegrationBaseTestCase):
+    fixture = fixture_bucket
+
+    def test_add_type_to_buckets_adds_type_once(self):
+        # Act
+        bucket_api.add_type_to_buckets(self.fixture.type_vm_2, [str(self.fixture.bucket_empty.id),
+                                                                str(self.fixture.bucket_2.id)])
+
+        # Assert
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_empty.id).types, [self.fixture.type_vm_2])
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_2.id).types,
+                         [self.fixture.type_vm_1, self.fixture.type_vm_2])
+
+    def test_add_type_to_buckets_updates_buckets_of_type(self):
+        # Act
+        bucket_api.add_type_to_buckets(self.fixture.type_vm_2, [str(self.fixture.bucket_empty.id),
+                                                                str(self.fixture.bucket_2.id)])
+
+        # Assert
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_2),
+                         [self.fixture.bucket_2.label, self.fixture.bucket_empty.label])
+
+    def test_add_type_to_missing_bucket_raises_error(self):
+        # Act + Assert
+        with self.assertRaises(ApiError):
+            bucket_api.add_type_to_buckets(self.fixture.type_vm_2, [str(self.fixture.bucket_empty.id),
+                                                                    str(ObjectId())])
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_empty.id).types, [])
+
+
+class TestUpdateTypeBuckets(MongoIntegrationBaseTestCase):
+    fixture = fixture_bucket
+
+    def test_update_type_buckets_moves_type(self):
+        # Act
+        bucket_api.update_type_buckets(self.fixture.type_vm_1, [str(self.fixture.bucket_empty.id),
+                                                                str(self.fixture.bucket_2.id)])
+
+        # Assert
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_empty.id).types, [self.fixture.type_vm_1])
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_1.id).types, [])
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_2.id).types,
+                         [self.fixture.type_vm_1, self.fixture.type_vm_2])
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_1),
+                         [self.fixture.bucket_2.label, self.fixture.bucket_empty.label])
+
+
+class TestRemoveTypeFromBuckets(MongoIntegrationBaseTestCase):
+    fixture = fixture_bucket
+
+    def test_remove_type_from_buckets_removes_type_from_all_buckets(self):
+        # Act
+        bucket_api.remove_type_from_buckets(self.fixture.type_vm_1)
+
+        # Assert
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_1.id).types, [])
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_2.id).types, [self.fixture.type_vm_2])
+
+    def test_remove_type_from_buckets_updates_buckets_of_type(self):
+        # Act
+        bucket_api.remove_type_from_buckets(self.fixture.type_vm_1)
+
+        # Assert
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_1), [])
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_2), [self.fixture.bucket_2.label])
+
+    def test_remove_absent_type_from_buckets_does_not_modify_buckets(self):
+        # Act
+        bucket_api.remove_type_from_buckets(self.fixture.type_vm_2)
+        bucket_api.remove_type_from_buckets(self.fixture.type_vm_2)
+
+        # Assert
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_2.id).types, [self.fixture.type_vm_1])
+
+
+class TestTypeBuckets(MongoIntegrationBaseTestCase):
+    fixture = fixture_bucket
+
+    def test_get_by_type_version_manager_returns_buckets_of_type(self):
+        # Act
+        result = bucket_api.get_by_type_version_manager(self.fixture.type_vm_1)
+
+        # Assert
+        self.assertEqual(sorted(bucket.label for bucket in result),
+                         [self.fixture.bucket_1.label, self.fixture.bucket_2.label])
+
+    def test_upsert_bucket_updates_buckets_of_types(self):
+        # Arrange
+        bucket = self.fixture.bucket_2
+        bucket.types = [self.fixture.type_vm_2]
+
+        # Act
+        bucket_api.upsert(bucket)
+
+        # Assert
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_1), [self.fixture.bucket_1.label])
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_2), [self.fixture.bucket_2.label])
+
+    def test_delete_bucket_removes_bucket_from_types(self):
+        # Act
+        bucket_api.delete(self.fixture.bucket_2)
+
+        # Assert
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_1), [self.fixture.bucket_1.label])
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_2), [])
+
+    def test_init_type_buckets_sets_buckets_of_types_without_buckets_field(self):
+        # Arrange
+        TypeVersionManager.objects(id=self.fixture.type_vm_1.id).update(unset__buckets=True)
+
+        # Act
+        bucket_api.init_type_buckets()
+
+        # Assert
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_1),
+                         [self.fixture.bucket_1.label, self.fixture.bucket_2.label])
+
+
+class TestImportBuckets(MongoIntegrationBaseTestCase):
+    fixture = fixture_bucket
+
+    def test_import_buckets_creates_and_updates_buckets(self):
+        # Act
+        result = bucket_api.import_buckets([{'label': self.fixture.bucket_1.label,
+                                             'types': [self.fixture.type_vm_1.title]},
+                                            {'label': 'new', 'types': [str(self.fixture.type_vm_1.id)]}])
+
+        # Assert
+        self.assertEqual(result, {'created': ['new'], 'updated': [self.fixture.bucket_1.label]})
+        self.assertEqual(len(Bucket.objects(label='new').first().types), 1)
+        self.assertEqual(Bucket.get_by_id(self.fixture.bucket_1.id).color, self.fixture.bucket_1.color)
+        self.assertEqual(_get_bucket_labels(self.fixture.type_vm_1),
+                         [self.fixture.bucket_1.label, self.fixture.bucket_2.label, 'new'])
+
+    def test_import_buckets_with_missing_type_raises_error(self):
+        # Act + Assert
+        with self.assertRaises(ApiError):
+            bucket_api.import_buckets([{'label': 'new', 'types': ['missing type']}])
+        self.assertIsNone(Bucket.objects(label='new').first())
+
+    def test_export_buckets_can_be_imported(self):
+        # Arrange
+        # only global types can be imported
+        bucket_api.remove_type_from_buckets(self.fixture.type_vm_2)
+        exported_buckets = bucket_api.export_buckets()
+        for bucket in self.fixture.bucket_collection:
+            bucket_api.delete(bucket)
+
+        # Act
+        bucket_api.import_buckets(exported_buckets)
+
+        # Assert
+        self.assertEqual(bucket_api.export_buckets(), exported_buckets)
+
+
+def _get_bucket_labels(version_manager):
+    """Return the sorted labels of the buckets of a type version manager, read from the database.
+
+    Args:
+        version_manager:
+
+    Returns:
+
+    """
+    version_manager = TypeVersionManager.objects.get(id=version_manager.id)
+    return sorted(bucket.label for bucket in bucket_api.get_by_type_version_manager(version_manager))
@@ -8,6 +8,7 @@ from core_main_app.commons import exceptions
 from core_composer_app.components.bucket.models import Bucket
 from core_composer_app.components.bucket import api as bucket_api
 from core_composer_app.components.type_version_manager.models import TypeVersionManager
+from core_composer_app.utils import colors as colors_utils
 
 
 class TestBucketGetById(TestCase):
@@ -36,9 +37,17 @@ class TestBucketGetById(TestCase):
 
 
 class TestBucketUpsert(TestCase):
+    def setUp(self):
+        colors_utils.clear()
+
+    def tearDown(self):
+        colors_utils.clear()
+
+    @patch.object(TypeVersionManager, 'add_bucket')
+    @patch.object(TypeVersionManager, 'remove_bucket')
     @patch.object(Bucket, 'get_colors')
     @patch.object(Bucket, 'save')
-    def test_upsert_bucket_returns_bucket(self, mock_save, mock_get_colors):
+    def test_upsert_bucket_returns_bucket(self, mock_save, mock_get_colors, mock_remove_bucket, mock_add_bucket):
         bucket = _create_bucket()
 
         mock_save.return_value = bucket
@@ -46,6 +55,100 @@ class TestBucketUpsert(TestCase):
         result = bucket_api.upsert(bucket)
         self.assertIsInstance(result, Bucket)
 
+    @patch.object(TypeVersionManager, 'add_bucket')
+    @patch.object(TypeVersionManager, 'remove_bucket')
+    @patch.object(Bucket, 'get_colors')
+    @patch.object(Bucket, 'save')
+    def test_upsert_bucket_updates_buckets_of_types(self, mock_save, mock_get_colors, mock_remove_bucket,
+                                                    mock_add_bucket):
+        bucket = _create_bucket()
+        mock_version_manager = _create_mock_type_version_manager()
+        bucket.types = [mock_version_manager]
+
+        mock_save.return_value = bucket
+        mock_get_colors.return_value = []
+        bucket_api.upsert(bucket)
+
+        mock_remove_bucket.assert_called_once_with(bucket.id, excluded_ids=[mock_version_manager.id])
+        mock_add_bucket.assert_called_once_with([mock_version_manager.id], bucket.id)
+
+    @patch.object(TypeVersionManager, 'add_bucket')
+    @patch.object(TypeVersionManager, 'remove_bucket')
+    @patch.object(Bucket, 'get_colors')
+    @patch.object(Bucket, 'save')
+    def test_upsert_bucket_with_color_does_not_load_colors(self, mock_save, mock_get_colors, mock_remove_bucket,
+                                                           mock_add_bucket):
+        bucket = _create_bucket()
+
+        mock_save.return_value = bucket
+        bucket_api.upsert(bucket)
+
+        self.assertEqual(mock_get_colors.call_count, 0)
+
+    @patch.object(TypeVersionManager, 'add_bucket')
+    @patch.object(TypeVersionManager, 'remove_bucket')
+    @patch.object(Bucket, 'get_colors')
+    @patch.object(Bucket, 'save_object')
+    def test_upsert_new_bucket_tries_next_color_if_color_taken(self, mock_save_object, mock_get_colors,
+                                                               mock_remove_bucket, mock_add_bucket):
+        bucket = _create_bucket()
+        bucket.color = None
+        taken_color = colors_utils.get_palette_color(0)
+
+        def _save_object():
+            if bucket.color == taken_color:
+                mock_get_colors.return_value = [taken_color]
+                raise exceptions.NotUniqueError('')
+            return bucket
+
+        mock_get_colors.return_value = []
+        mock_save_object.side_effect = _save_object
+        result = bucket_api.upsert(bucket)
+
+        self.assertEqual(mock_save_object.call_count, 2)
+        self.assertEqual(result.color, colors_utils.get_palette_color(1))
+
+    @patch.object(TypeVersionManager, 'add_bucket')
+    @patch.object(TypeVersionManager, 'remove_bucket')
+    @patch.object(Bucket, 'get_colors')
+    @patch.object(Bucket, 'save_object')
+    def test_upsert_new_bucket_raises_exception_if_label_not_unique(self, mock_save_object, mock_get_colors,
+                                                                    mock_remove_bucket, mock_add_bucket):
+        bucket = _create_bucket()
+        bucket.color = None
+
+        mock_get_colors.return_value = []
+        mock_save_object.side_effect = exceptions.NotUniqueError('')
+        with self.assertRaises(exceptions.NotUniqueError):
+            bucket_api.upsert(bucket)
+
+        self.assertEqual(mock_save_object.call_count, 1)
+        self.assertIsNone(bucket.color)
+
+
+class TestBucketDelete(TestCase):
+    @patch.object(TypeVersionManager, 'remove_bucket')
+    def test_delete_bucket_removes_bucket_from_types(self, mock_remove_bucket):
+        mock_bucket = _create_mock_bucket()
+
+        bucket_api.delete(mock_bucket)
+
+        mock_bucket.delete.assert_called_once_with()
+        mock_remove_bucket.assert_called_once_with(mock_bucket.id)
+
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(TypeVersionManager, 'remove_bucket')
+    def test_delete_bucket_invalidates_catalog_after_updating_types(self, mock_remove_bucket,
+                                                                    mock_invalidate_catalog):
+        mock_bucket = _create_mock_bucket()
+        calls = Mock()
+        calls.attach_mock(mock_remove_bucket, 'remove_bucket')
+        calls.attach_mock(mock_invalidate_catalog, 'invalidate_catalog')
+
+        bucket_api.delete(mock_bucket)
+
+        self.assertEqual([call[0] for call in calls.mock_calls], ['remove_bucket', 'invalidate_catalog'])
+
 
 class TestBucketGetAll(TestCase):
     @patch.object(Bucket, 'get_all')
@@ -64,92 +167,230 @@ class TestBucketGetAll(TestCase):
 
 
 class TestAddTypeToBuckets(TestCase):
-    @patch.object(Bucket, 'get_by_id')
-    @patch.object(Bucket, 'get_colors')
-    @patch.object(Bucket, 'save')
-    def test_add_type_to_buckets_adds_one_to_list(self, mock_save, mock_get_colors, mock_get_by_id):
-        bucket = _create_bucket()
-        mock_save.return_value = bucket
-        mock_get_by_id.return_value = bucket
-        mock_get_colors.return_value = []
-
+    @patch.object(TypeVersionManager, 'add_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'add_type')
+    @patch.object(Bucket, 'get_existing_ids')
+    def test_add_type_to_buckets_updates_buckets_once(self, mock_get_existing_ids, mock_add_type,
+                                                      mock_invalidate_catalog, mock_add_buckets):
+        bucket_ids = [ObjectId(), ObjectId()]
+        mock_get_existing_ids.return_value = bucket_ids
         mock_version_manager = _create_mock_type_version_manager()
 
-        self.assertTrue(len(bucket.types) == 0)
-        bucket_api.add_type_to_buckets(mock_version_manager, [bucket.id])
-        self.assertTrue(len(bucket.types) == 1)
+        bucket_api.add_type_to_buckets(mock_version_manager, [str(bucket_id) for bucket_id in bucket_ids])
 
-    @patch.object(Bucket, 'get_by_id')
-    @patch.object(Bucket, 'get_colors')
-    @patch.object(Bucket, 'save')
-    def test_add_no_type_to_buckets_does_not_update_bucket(self, mock_save, mock_get_colors, mock_get_by_id):
-        bucket = _create_bucket()
-        mock_save.return_value = bucket
-        mock_get_by_id.return_value = bucket
-        mock_get_colors.return_value = []
+        self.assertEqual(mock_add_type.call_count, 1)
+        self.assertEqual(set(mock_add_type.call_args[0][1]), set(bucket_ids))
+        self.assertEqual(set(mock_add_buckets.call_args[0][1]), set(bucket_ids))
+        self.assertEqual(mock_invalidate_catalog.call_count, 1)
 
+    @patch.object(TypeVersionManager, 'add_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'add_type')
+    @patch.object(Bucket, 'get_existing_ids')
+    def test_add_no_type_to_buckets_does_not_update_bucket(self, mock_get_existing_ids, mock_add_type,
+                                                           mock_invalidate_catalog, mock_add_buckets):
         mock_version_manager = _create_mock_type_version_manager()
 
-        self.assertTrue(len(bucket.types) == 0)
         bucket_api.add_type_to_buckets(mock_version_manager, [])
-        self.assertTrue(len(bucket.types) == 0)
 
-    @patch.object(Bucket, 'get_by_id')
-    @patch.object(Bucket, 'get_colors')
-    @patch.object(Bucket, 'save')
-    def test_add_type_to_buckets_raises_exception_if_bucket_id_not_found(self, mock_save, mock_get_colors,
-                                                                         mock_get_by_id):
+        self.assertEqual(mock_add_type.call_count, 0)
 
-        mock_get_by_id.side_effect = exceptions.DoesNotExist
-        mock_get_colors.return_value = []
+    @patch.object(TypeVersionManager, 'add_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'add_type')
+    @patch.object(Bucket, 'get_existing_ids')
+    def test_add_type_to_buckets_raises_exception_if_bucket_id_not_found(self, mock_get_existing_ids, mock_add_type,
+                                                                         mock_invalidate_catalog, mock_add_buckets):
+        existing_id = ObjectId()
+        mock_get_existing_ids.return_value = [existing_id]
+        mock_version_manager = _create_mock_type_version_manager()
 
+        with self.assertRaises(exceptions.ApiError):
+            bucket_api.add_type_to_buckets(mock_version_manager, [existing_id, ObjectId()])
+        self.assertEqual(mock_add_type.call_count, 0)
+
+    @patch.object(TypeVersionManager, 'add_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'add_type')
+    @patch.object(Bucket, 'get_existing_ids')
+    def test_add_type_to_buckets_raises_exception_if_bucket_id_not_valid(self, mock_get_existing_ids, mock_add_type,
+                                                                         mock_invalidate_catalog, mock_add_buckets):
         mock_version_manager = _create_mock_type_version_manager()
 
         with self.assertRaises(exceptions.ApiError):
-            bucket_api.add_type_to_buckets(mock_version_manager, [ObjectId()])
+            bucket_api.add_type_to_buckets(mock_version_manager, ['not an id'])
+
+
+class TestUpdateTypeBuckets(TestCase):
+    @patch.object(TypeVersionManager, 'set_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'set_type_buckets')
+    @patch.object(Bucket, 'get_existing_ids')
+    def test_update_type_buckets_writes_once(self, mock_get_existing_ids, mock_set_type_buckets,
+                                             mock_invalidate_catalog, mock_set_buckets):
+        bucket_id = ObjectId()
+        mock_get_existing_ids.return_value = [bucket_id]
+        mock_version_manager = _create_mock_type_version_manager()
+
+        bucket_api.update_type_buckets(mock_version_manager, [str(bucket_id)])
+
+        mock_set_type_buckets.assert_called_once_with(mock_version_manager, [bucket_id])
+        mock_set_buckets.assert_called_once_with(mock_version_manager.id, [bucket_id])
+
+    @patch.object(TypeVersionManager, 'set_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'set_type_buckets')
+    @patch.object(Bucket, 'get_existing_ids')
+    def test_update_type_buckets_does_not_write_if_bucket_id_not_found(self, mock_get_existing_ids,
+                                                                       mock_set_type_buckets,
+                                                                       mock_invalidate_catalog, mock_set_buckets):
+        mock_get_existing_ids.return_value = []
+        mock_version_manager = _create_mock_type_version_manager()
+
+        with self.assertRaises(exceptions.ApiError):
+            bucket_api.update_type_buckets(mock_version_manager, [ObjectId()])
+        self.assertEqual(mock_set_type_buckets.call_count, 0)
 
 
 class TestRemoveTypeFromBuckets(TestCase):
-    @patch.object(Bucket, 'get_all')
-    @patch.object(Bucket, 'get_by_id')
-    @patch.object(Bucket, 'get_colors')
-    @patch.object(Bucket, 'save')
-    def test_remove_type_from_buckets_substracts_one_to_list(self, mock_save, mock_get_colors,
-                                                             mock_get_by_id, mock_get_all):
-        bucket = _create_bucket()
+    @patch.object(TypeVersionManager, 'set_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'remove_type')
+    def test_remove_type_from_buckets_updates_buckets_once(self, mock_remove_type, mock_invalidate_catalog,
+                                                           mock_set_buckets):
         mock_version_manager = _create_mock_type_version_manager()
+        mock_remove_type.return_value = 2
 
-        bucket.types = [mock_version_manager]
-        mock_get_all.return_value = [bucket]
+        bucket_api.remove_type_from_buckets(mock_version_manager)
 
-        mock_save.return_value = bucket
-        mock_get_by_id.return_value = bucket
+        mock_remove_type.assert_called_once_with(mock_version_manager)
+        mock_set_buckets.assert_called_once_with(mock_version_manager.id, [])
+        self.assertEqual(mock_invalidate_catalog.call_count, 1)
+
+    @patch.object(TypeVersionManager, 'set_buckets')
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(Bucket, 'remove_type')
+    def test_removes_absent_type_from_buckets_does_not_invalidate_catalog(self, mock_remove_type,
+                                                                          mock_invalidate_catalog, mock_set_buckets):
+        mock_absent_version_manager = _create_mock_type_version_manager()
+        mock_remove_type.return_value = 0
+
+        bucket_api.remove_type_from_buckets(mock_absent_version_manager)
+
+        self.assertEqual(mock_invalidate_catalog.call_count, 0)
+
+
+class TestImportBuckets(TestCase):
+    def setUp(self):
+        colors_utils.clear()
+
+    def tearDown(self):
+        colors_utils.clear()
+
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(TypeVersionManager, 'set_bucket_types')
+    @patch.object(Bucket, 'get_colors')
+    @patch.object(Bucket, 'upsert_by_label')
+    @patch.object(Bucket, 'get_by_labels')
+    def test_import_buckets_writes_once(self, mock_get_by_labels, mock_upsert_by_label, mock_get_colors,
+                                        mock_set_bucket_types, mock_invalidate_catalog):
+        existing_bucket = _create_mock_bucket()
+        mock_get_by_labels.return_value = [existing_bucket]
+        mock_upsert_by_label.return_value = {'new': ObjectId()}
         mock_get_colors.return_value = []
 
-        self.assertTrue(len(bucket.types) == 1)
-        bucket_api.remove_type_from_buckets(mock_version_manager)
-        self.assertTrue(len(bucket.types) == 0)
+        result = bucket_api.import_buckets([{'label': existing_bucket.label}, {'label': 'new'}])
 
-    @patch.object(Bucket, 'get_all')
-    @patch.object(Bucket, 'get_by_id')
+        self.assertEqual(mock_upsert_by_label.call_count, 1)
+        self.assertEqual(result, {'created': ['new'], 'updated': [existing_bucket.label]})
+
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(TypeVersionManager, 'set_bucket_types')
     @patch.object(Bucket, 'get_colors')
-    @patch.object(Bucket, 'save')
-    def test_removes_absent_type_from_buckets_does_not_update_bucket(self, mock_save, mock_get_colors,
-                                                                     mock_get_by_id, mock_get_all):
-        bucket = _create_bucket()
-        mock_version_manager = _create_mock_type_version_manager()
-        mock_absent_version_manager = _create_mock_type_version_manager()
+    @patch.object(Bucket, 'upsert_by_label')
+    @patch.object(Bucket, 'get_by_labels')
+    def test_import_buckets_sets_color_of_new_buckets_only(self, mock_get_by_labels, mock_upsert_by_label,
+                                                           mock_get_colors, mock_set_bucket_types,
+                                                           mock_invalidate_catalog):
+        existing_bucket = _create_mock_bucket()
+        mock_get_by_labels.return_value = [existing_bucket]
+        mock_upsert_by_label.return_value = {'new': ObjectId()}
+        mock_get_colors.return_value = []
 
-        bucket.types = [mock_version_manager]
-        mock_get_all.return_value = [bucket]
+        bucket_api.import_buckets([{'label': existing_bucket.label}, {'label': 'new'}])
 
-        mock_save.return_value = bucket
-        mock_get_by_id.return_value = bucket
+        buckets_fields = mock_upsert_by_label.call_args[0][0]
+        self.assertNotIn('color', buckets_fields[0])
+        self.assertEqual(buckets_fields[1]['color'], colors_utils.get_palette_color(0))
+
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(TypeVersionManager, 'set_bucket_types')
+    @patch.object(Bucket, 'get_colors')
+    @patch.object(Bucket, 'upsert_by_label')
+    @patch.object(Bucket, 'get_by_labels')
+    def test_import_buckets_does_not_allocate_requested_colors(self, mock_get_by_labels, mock_upsert_by_label,
+                                                               mock_get_colors, mock_set_bucket_types,
+                                                               mock_invalidate_catalog):
+        mock_get_by_labels.return_value = []
+        mock_upsert_by_label.return_value = {'new': ObjectId(), 'colored': ObjectId()}
         mock_get_colors.return_value = []
+        requested_color = colors_utils.get_palette_color(0).lower()
+
+        bucket_api.import_buckets([{'label': 'new'}, {'label': 'colored', 'color': requested_color}])
+
+        buckets_fields = mock_upsert_by_label.call_args[0][0]
+        self.assertEqual(buckets_fields[0]['color'], colors_utils.get_palette_color(1))
+        self.assertEqual(buckets_fields[1]['color'], requested_color)
+
+    @patch.object(bucket_api, '_invalidate_catalog')
+    @patch.object(TypeVersionManager, 'set_bucket_types')
+    @patch.object(TypeVersionManager, 'get_global_version_managers_by_ids_or_titles')
+    @patch.object(Bucket, 'upsert_by_label')
+    @patch.object(Bucket, 'get_by_labels')
+    def test_import_buckets_sets_types_by_id_or_title(self, mock_get_by_labels, mock_upsert_by_label,
+                                                      mock_get_version_managers, mock_set_bucket_types,
+                                                      mock_invalidate_catalog):
+        bucket = _create_mock_bucket()
+        version_manager_1 = _create_mock_type_version_manager(title='type 1')
+        version_manager_2 = _create_mock_type_version_manager(title='type 2')
+        mock_get_by_labels.return_value = [bucket]
+        mock_get_version_managers.return_value = [version_manager_1, version_manager_2]
+
+        bucket_api.import_buckets([{'label': bucket.label,
+                                    'types': [str(version_manager_1.id), 'type 2', 'type 1']}])
+
+        self.assertEqual(mock_upsert_by_label.call_args[0][0][0]['types'],
+                         [version_manager_1.id, version_manager_2.id])
+        mock_set_bucket_types.assert_called_once_with({bucket.id: [version_manager_1.id, version_manager_2.id]})
+
+    @patch.object(TypeVersionManager, 'get_global_version_managers_by_ids_or_titles')
+    @patch.object(Bucket, 'upsert_by_label')
+    @patch.object(Bucket, 'get_by_labels')
+    def test_import_buckets_raises_exception_if_type_not_found(self, mock_get_by_labels, mock_upsert_by_label,
+                                                               mock_get_version_managers):
+        mock_get_by_labels.return_value = []
+        mock_get_version_managers.return_value = []
 
-        self.assertTrue(len(bucket.types) == 1)
-        bucket_api.remove_type_from_buckets(mock_absent_version_manager)
-        self.assertTrue(len(bucket.types) == 1)
+        with self.assertRaises(exceptions.ApiError):
+            bucket_api.import_buckets([{'label': 'new', 'types': ['missing type']}])
+        self.assertEqual(mock_upsert_by_label.call_count, 0)
+
+    @patch.object(Bucket, 'upsert_by_label')
+    @patch.object(Bucket, 'get_by_labels')
+    def test_import_buckets_raises_exception_if_labels_not_unique(self, mock_get_by_labels, mock_upsert_by_label):
+        with self.assertRaises(exceptions.ApiError):
+            bucket_api.import_buckets([{'label': 'label'}, {'label': 'label'}])
+        self.assertEqual(mock_upsert_by_label.call_count, 0)
+
+    @patch.object(Bucket, 'upsert_by_label')
+    @patch.object(Bucket, 'get_by_labels')
+    def test_import_buckets_raises_exception_if_color_not_valid(self, mock_get_by_labels, mock_upsert_by_label):
+        mock_get_by_labels.return_value = []
+
+        with self.assertRaises(exceptions.ApiError):
+            bucket_api.import_buckets([{'label': 'label', 'color': 'red'}])
+        self.assertEqual(mock_upsert_by_label.call_count, 0)
 
 
 def _create_mock_bucket():
@@ -0,0 +1,87 @@
+"""Compose Draft unit tests
+"""
+from unittest.case import TestCase
+
+from bson.objectid import ObjectId
+from mock.mock import patch
+
+from core_composer_app.commons.exceptions import DraftConflictError
+from core_composer_app.components.compose_draft import api as compose_draft_api
+from core_composer_app.components.compose_draft.models import ComposeDraft
+from core_main_app.commons import exceptions
+
+
+class TestComposeDraftGetById(TestCase):
+    @patch.object(ComposeDraft, 'get_by_id_and_user')
+    def test_get_by_id_returns_compose_draft(self, mock_get_by_id_and_user):
+        # Arrange
+        compose_draft = _create_compose_draft()
+        mock_get_by_id_and_user.return_value = compose_draft
+
+        # Act
+        result = compose_draft_api.get_by_id(compose_draft.id, '1')
+
+        # Assert
+        self.assertIsInstance(result, ComposeDraft)
+
+    @patch.object(ComposeDraft, 'get_by_id_and_user')
+    def test_get_by_id_raises_exception_if_object_does_not_exist(self, mock_get_by_id_and_user):
+        # Arrange
+        mock_get_by_id_and_user.side_effect = exceptions.DoesNotExist('')
+
+        # Act + Assert
+        with self.assertRaises(exceptions.DoesNotExist):
+            compose_draft_api.get_by_id(ObjectId(), '1')
+
+
+class TestComposeDraftUpdate(TestCase):
+    @patch.object(ComposeDraft, 'update_version')
+    def test_update_increments_version(self, mock_update_version):
+        # Arrange
+        compose_draft = _create_compose_draft()
+        mock_update_version.return_value = 1
+
+        # Act
+        compose_draft_api.update(compose_draft, {'$set': {'validated': False}})
+
+        # Assert
+        self.assertEqual(compose_draft.version, 1)
+
+    @patch.object(ComposeDraft, 'update_version')
+    def test_update_is_conditioned_on_loaded_version(self, mock_update_version):
+        # Arrange
+        compose_draft = _create_compose_draft()
+        mock_update_version.return_value = 1
+
+        # Act
+        compose_draft_api.update(compose_draft, {'$set': {'validated': False}})
+
+        # Assert
+        draft_id, version, update_document = mock_update_version.call_args[0]
+        self.assertEqual(version, 0)
+        self.assertEqual(update_document['$inc'], {'version': 1})
+
+    @patch.object(ComposeDraft, 'update_version')
+    def test_update_of_modified_draft_raises_conflict_error(self, mock_update_version):
+        # Arrange
+        compose_draft = _create_compose_draft()
+        mock_update_version.return_value = 0
+
+        # Act + Assert
+        with self.assertRaises(DraftConflictError):
+            compose_draft_api.update(compose_draft, {'$set': {'validated': False}})
+
+
+class TestComposeDraftCompression(TestCase):
+    def test_decompress_returns_compressed_content(self):
+        content = u"<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'/>"
+        self.assertEqual(ComposeDraft.decompress(ComposeDraft.compress(content)), content)
+
+
+def _create_compose_draft():
+    """Returns a compose draft
+
+    Returns:
+
+    """
+    return ComposeDraft(id=ObjectId(), user='1', content=ComposeDraft.compress('<schema/>'))
@@ -0,0 +1,27 @@
+""" Fixtures files for compose job
+"""
+from datetime import datetime, timedelta
+
+from core_composer_app.components.compose_job.models import ComposeJob
+from core_main_app.utils.integration_tests.fixture_interface import FixtureInterface
+
+
+class ComposeJobFixtures(FixtureInterface):
+    """ Compose Job fixtures
+    """
+    running_job = None
+    interrupted_job = None
+
+    def insert_data(self):
+        """ Insert a set of Compose Jobs.
+
+        Returns:
+
+        """
+        self.running_job = ComposeJob(user='1',
+                                      status='running',
+                                      message='Running.').save()
+        self.interrupted_job = ComposeJob(user='1',
+                                          status='running',
+                                          message='Running.',
+                                          last_modified=datetime.utcnow() - timedelta(days=1)).save()
@@ -0,0 +1,46 @@
+"""Compose Job unit tests
+"""
+from unittest.case import TestCase
+
+from bson.objectid import ObjectId
+from mock.mock import patch
+
+from core_composer_app.components.compose_job import api as compose_job_api
+from core_composer_app.components.compose_job.models import ComposeJob
+from core_main_app.commons import exceptions
+
+
+class TestComposeJobGetById(TestCase):
+    @patch.object(ComposeJob, 'get_by_id_and_user')
+    def test_get_by_id_returns_compose_job(self, mock_get_by_id_and_user):
+        # Arrange
+        compose_job = ComposeJob(id=ObjectId(), user='1', status='pending')
+        mock_get_by_id_and_user.return_value = compose_job
+
+        # Act
+        result = compose_job_api.get_by_id(compose_job.id, '1')
+
+        # Assert
+        self.assertIsInstance(result, ComposeJob)
+
+    @patch.object(ComposeJob, 'get_by_id_and_user')
+    def test_get_by_id_raises_exception_if_object_does_not_exist(self, mock_get_by_id_and_user):
+        # Arrange
+        mock_get_by_id_and_user.side_effect = exceptions.DoesNotExist('')
+
+        # Act + Assert
+        with self.assertRaises(exceptions.DoesNotExist):
+            compose_job_api.get_by_id(ObjectId(), '1')
+
+
+class TestComposeJobUpdateStatus(TestCase):
+    @patch.object(ComposeJob, 'update_status')
+    def test_update_status_updates_given_values(self, mock_update_status):
+        # Arrange
+        job_id = ObjectId()
+
+        # Act
+        compose_job_api.update_status(job_id, status='success', result={})
+
+        # Assert
+        mock_update_status.assert_called_once_with(job_id, {'status': 'success', 'result': {}})
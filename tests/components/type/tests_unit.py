@@ -37,6 +37,31 @@ class TestTypeGet(TestCase):
             type_api.get(mock_absent_id)
 
 
+class TestTypeGetSummary(TestCase):
+    @patch.object(Type, 'get_summary_by_id')
+    def test_type_get_summary_returns_type(self, mock_get_summary_by_id):
+        # Arrange
+        mock_type = _create_mock_type("Schema")
+
+        mock_get_summary_by_id.return_value = mock_type
+
+        # Act
+        result = type_api.get_summary(mock_type.id)
+
+        # Assert
+        self.assertIsInstance(result, Type)
+
+    @patch.object(Type, 'get_summary_by_id')
+    def test_type_get_summary_raises_exception_if_object_does_not_exist(self, mock_get_summary_by_id):
+        # Arrange
+        mock_absent_id = ObjectId()
+        mock_get_summary_by_id.side_effect = exceptions.DoesNotExist('')
+
+        # Act + Assert
+        with self.assertRaises(exceptions.DoesNotExist):
+            type_api.get_summary(mock_absent_id)
+
+
 class TestTypeGetAll(TestCase):
     @patch.object(Type, 'get_all')
     def test_get_all_types_returns_types(self, mock_get_all):
@@ -94,6 +119,58 @@ class TestTypeUpsert(TestCase):
         with self.assertRaises(exceptions.CoreError):
             type_api.upsert(type_object)
 
+    @override_settings(ROOT_URLCONF="core_main_app.urls")
+    @patch.object(Type, 'save')
+    def test_type_upsert_stores_metadata(self, mock_save):
+        type_object = _create_type()
+
+        mock_save.return_value = type_object
+        type_api.upsert(type_object)
+
+        self.assertFalse(type_object.is_complex)
+        self.assertEqual(type_object.root_type_name, 'type')
+        self.assertIsNone(type_object.target_namespace)
+        self.assertEqual(type_object.schema_locations, [])
+        self.assertEqual(type_object.element_count, 0)
+        self.assertIsNotNone(type_object.content_hash)
+
+
+class TestTypeGetWithMetadata(TestCase):
+    @patch.object(Type, 'set_metadata')
+    @patch.object(Type, 'get_by_id')
+    @patch.object(Type, 'get_summary_by_id')
+    def test_get_with_metadata_does_not_load_content(self, mock_get_summary_by_id, mock_get_by_id,
+                                                     mock_set_metadata):
+        # Arrange
+        type_object = _create_type()
+        type_object.root_type_name = 'type'
+        mock_get_summary_by_id.return_value = type_object
+
+        # Act
+        result = type_api.get_with_metadata(type_object.id)
+
+        # Assert
+        self.assertEqual(result, type_object)
+        self.assertFalse(mock_get_by_id.called)
+        self.assertFalse(mock_set_metadata.called)
+
+    @patch.object(Type, 'set_metadata')
+    @patch.object(Type, 'get_by_id')
+    @patch.object(Type, 'get_summary_by_id')
+    def test_get_with_metadata_stores_missing_metadata(self, mock_get_summary_by_id, mock_get_by_id,
+                                                       mock_set_metadata):
+        # Arrange
+        type_object = _create_type()
+        mock_get_summary_by_id.return_value = _create_type(content="")
+        mock_get_by_id.return_value = type_object
+
+        # Act
+        result = type_api.get_with_metadata(type_object.id)
+
+        # Assert
+        self.assertEqual(result.root_type_name, 'type')
+        mock_set_metadata.assert_called_once_with(type_object)
+
 
 def _create_mock_type(filename="", content=""):
     """Returns a mock type
@@ -0,0 +1,51 @@
+""" Integration Test for Type Version Manager API
+"""
+from core_composer_app.components.bucket import api as bucket_api
+from core_composer_app.components.type.models import Type
+from core_composer_app.components.type_version_manager import api as type_version_manager_api
+from core_composer_app.components.type_version_manager.models import TypeVersionManager
+from core_main_app.utils.integration_tests.integration_base_test_case import \
+    MongoIntegrationBaseTestCase
+from tests.components.bucket.fixtures.fixtures import BucketFixtures
+
+fixture_bucket = BucketFixtures()
+
+
+class TestGetNoBucketsTypes(MongoIntegrationBaseTestCase):
+    fixture = fixture_bucket
+
+    def test_get_no_buckets_types_excludes_types_in_buckets(self):
+        # Act
+        result = type_version_manager_api.get_no_buckets_types()
+
+        # Assert
+        self.assertEqual(len(result), 0)
+
+    def test_get_no_buckets_types_returns_global_types_not_in_buckets(self):
+        # Arrange
+        bucket_api.remove_type_from_buckets(self.fixture.type_vm_1)
+
+        # Act
+        result = type_version_manager_api.get_no_buckets_types()
+
+        # Assert
+        self.assertEqual([version_manager.title for version_manager in result], [self.fixture.type_vm_1.title])
+
+    def test_get_no_buckets_types_returns_only_global_types_in_no_bucket(self):
+        # Arrange
+        type_3_1 = Type(filename="type3_1.xsd",
+                        content="content3_1",
+                        hash="hash3_1",
+                        is_complex=True).save()
+        type_vm_3 = TypeVersionManager(title="type 3",
+                                       user=None,
+                                       versions=[str(type_3_1.id)],
+                                       current=str(type_3_1.id),
+                                       is_disabled=False,
+                                       disabled_versions=[]).save()
+
+        # Act
+        result = type_version_manager_api.get_no_buckets_types()
+
+        # Assert
+        self.assertEqual([version_manager.title for version_manager in result], [type_vm_3.title])
@@ -5,7 +5,6 @@ from bson.objectid import ObjectId
 from django.test import override_settings
 from mock.mock import Mock, patch
 
-from core_composer_app.components.bucket.models import Bucket
 from core_composer_app.components.type.models import Type
 from core_composer_app.components.type_version_manager.api import get_no_buckets_types
 from core_composer_app.components.type_version_manager.models import TypeVersionManager
@@ -145,62 +144,24 @@ class TestTypeVersionManagerGetVersionManagersByUser(TestCase):
 
 
 class TestGetNoBucketsTypes(TestCase):
-    @patch.object(TypeVersionManager, 'get_global_version_managers')
-    @patch.object(Bucket, 'get_all')
-    def test_get_no_buckets_types_returns_types(self, mock_get_all_buckets, mock_get_global_version_managers):
+    @patch.object(TypeVersionManager, 'get_global_version_managers_without_bucket')
+    def test_get_no_buckets_types_returns_types(self, mock_get_global_version_managers_without_bucket):
         # Arrange
         mock_type1 = _create_mock_type_version_manager()
         mock_type2 = _create_mock_type_version_manager()
-        mock_get_global_version_managers.return_value = [mock_type1, mock_type2]
-        mock_get_all_buckets.return_value = []
+        mock_get_global_version_managers_without_bucket.return_value = [mock_type1, mock_type2]
 
         result = get_no_buckets_types()
         self.assertTrue(all(isinstance(item, TypeVersionManager) for item in result))
 
-    @patch.object(TypeVersionManager, 'get_global_version_managers')
-    @patch.object(Bucket, 'get_all')
-    def test_get_no_buckets_types_returns_all_types_if_no_buckets(self, mock_get_all_buckets,
-                                                                  mock_get_global_version_managers):
-        # Arrange
-        mock_type1 = _create_mock_type_version_manager()
-        mock_type2 = _create_mock_type_version_manager()
-        mock_get_global_version_managers.return_value = [mock_type1, mock_type2]
-        mock_get_all_buckets.return_value = []
-
-        self.assertTrue(len(get_no_buckets_types()) == 2)
-
-    @patch.object(TypeVersionManager, 'get_global_version_managers')
-    @patch.object(Bucket, 'get_all')
-    def test_get_no_buckets_types_returns_all_types_not_in_buckets(self, mock_get_all_buckets,
-                                                                   mock_get_global_version_managers):
+    @patch.object(TypeVersionManager, 'get_global_version_managers_without_bucket')
+    def test_get_no_buckets_types_loads_summary_fields(self, mock_get_global_version_managers_without_bucket):
         # Arrange
-        mock_type1 = _create_mock_type_version_manager()
-        mock_type2 = _create_mock_type_version_manager()
+        mock_get_global_version_managers_without_bucket.return_value = []
 
-        mock_bucket = _create_mock_bucket(types=[mock_type1])
-
-        mock_get_global_version_managers.return_value = [mock_type1, mock_type2]
-        mock_get_all_buckets.return_value = [mock_bucket]
-
-        self.assertTrue(len(get_no_buckets_types()) == 1)
-
-
-def _create_mock_bucket(types=None):
-    """Returns a mock bucket
-
-    Args:
-        types:
-
-    Returns:
-
-    """
-    if types is None:
-        types = []
-    mock_bucket = Mock(spec=Bucket)
-    mock_bucket.label = 'bucket'
-    mock_bucket.label = '#000000'
-    mock_bucket.types = types
-    return mock_bucket
+        get_no_buckets_types()
+        self.assertEqual(mock_get_global_version_managers_without_bucket.call_args[1]['fields'],
+                         version_manager_api.SUMMARY_FIELDS)
 
 
 def _create_mock_type(filename="", content="", is_disable=False):
@@ -2,6 +2,7 @@
 """
 
 from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
 
 from core_composer_app.rest.bucket import views
 from core_main_app.utils.integration_tests.integration_base_test_case import \
@@ -285,12 +286,89 @@ class TestBucketDetail(MongoIntegrationBaseTestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class TestBucketBulk(MongoIntegrationBaseTestCase):
+    fixture = fixture_bucket
+
+    def setUp(self):
+        super(TestBucketBulk, self).setUp()
+        self.data = [{'label': self.fixture.bucket_1.label}, {'label': 'new'}]
+
+    def test_get_returns_all_buckets(self):
+        # Arrange
+        user = create_mock_user('1')
+
+        # Act
+        response = RequestMock.do_request_get(views.BucketBulk.as_view(), user)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+
+    def test_post_returns_created_and_updated_buckets(self):
+        # Arrange
+        user = create_mock_user('1', is_staff=True)
+
+        # Act
+        response = _do_json_request_post(views.BucketBulk.as_view(), user, self.data)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'created': ['new'], 'updated': [self.fixture.bucket_1.label]})
+
+    def test_post_missing_type_returns_http_400(self):
+        # Arrange
+        user = create_mock_user('1', is_staff=True)
+        self.data = [{'label': 'new', 'types': ['missing type']}]
+
+        # Act
+        response = _do_json_request_post(views.BucketBulk.as_view(), user, self.data)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_post_as_user_returns_http_403(self):
+        # Arrange
+        user = create_mock_user('1')
+
+        # Act
+        response = _do_json_request_post(views.BucketBulk.as_view(), user, self.data)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class TestTypeVersionManagerBuckets(MongoIntegrationBaseTestCase):
     fixture = fixture_bucket
 
     def setUp(self):
         super(TestTypeVersionManagerBuckets, self).setUp()
 
+    def test_get_returns_buckets_of_type(self):
+        # Arrange
+        user = create_mock_user('1')
+
+        # Act
+        response = RequestMock.do_request_get(views.TypeVersionManagerBuckets.as_view(),
+                                              user,
+                                              param={'pk': self.fixture.type_vm_1.id})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(bucket['label'] for bucket in response.data),
+                         [self.fixture.bucket_1.label, self.fixture.bucket_2.label])
+
+    def test_get_wrong_template_version_manager_id_returns_http_404(self):
+        # Arrange
+        user = create_mock_user('1')
+
+        # Act
+        response = RequestMock.do_request_get(views.TypeVersionManagerBuckets.as_view(),
+                                              user,
+                                              param={'pk': '507f1f77bcf86cd799439011'})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_patch_returns_http_200(self):
         # Arrange
         user = create_mock_user('1', is_staff=True)
@@ -375,3 +453,19 @@ class TestTypeVersionManagerBuckets(MongoIntegrationBaseTestCase):
 
         # Assert
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+def _do_json_request_post(view, user, data):
+    """Send a POST request with a JSON body (RequestMock form-encodes the data, which can not be a list).
+
+    Args:
+        view:
+        user:
+        data:
+
+    Returns:
+
+    """
+    request = APIRequestFactory().post('/dummy_url', data=data, format='json')
+    force_authenticate(request, user=user)
+    return view(request)
@@ -0,0 +1,55 @@
+"""Unit tests for composer cache utils
+"""
+from unittest.case import TestCase
+
+from core_composer_app.utils.cache import LRUCache
+
+
+class TestLRUCache(TestCase):
+    def test_get_returns_stored_value(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('key', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+
+    def test_get_absent_key_returns_default(self):
+        cache = LRUCache(max_entries=2)
+        self.assertEqual(cache.get('key', 'default'), 'default')
+
+    def test_set_evicts_least_recently_used_entry(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('key1', 1)
+        cache.set('key2', 2)
+        # key1 becomes the most recently used
+        cache.get('key1')
+        cache.set('key3', 3)
+        self.assertTrue('key1' in cache)
+        self.assertFalse('key2' in cache)
+        self.assertTrue('key3' in cache)
+
+    def test_set_evicts_entries_above_max_size(self):
+        cache = LRUCache(max_entries=10, max_size=10)
+        cache.set('key1', 1, size=6)
+        cache.set('key2', 2, size=6)
+        self.assertFalse('key1' in cache)
+        self.assertEqual(cache.size, 6)
+
+    def test_set_entry_larger_than_max_size_is_not_stored(self):
+        cache = LRUCache(max_entries=10, max_size=10)
+        cache.set('key1', 1, size=5)
+        cache.set('key2', 2, size=11)
+        self.assertTrue('key1' in cache)
+        self.assertFalse('key2' in cache)
+
+    def test_set_existing_key_updates_size(self):
+        cache = LRUCache(max_entries=10, max_size=10)
+        cache.set('key', 1, size=5)
+        cache.set('key', 2, size=3)
+        self.assertEqual(cache.size, 3)
+        self.assertEqual(cache.get('key'), 2)
+
+    def test_pop_removes_entry(self):
+        cache = LRUCache(max_entries=10, max_size=10)
+        cache.set('key', 1, size=5)
+        self.assertEqual(cache.pop('key'), 1)
+        self.assertFalse('key' in cache)
+        self.assertEqual(cache.size, 0)
@@ -0,0 +1,85 @@
+"""Unit tests for composer catalog utils
+"""
+from unittest.case import TestCase
+
+from mock import Mock, patch
+
+from core_composer_app.utils import catalog as catalog_utils
+
+
+def _create_version_manager(title, user=None):
+    return Mock(id='{}_vm_id'.format(title), current='{}_id'.format(title), title=title, is_disabled=False,
+                user=user)
+
+
+@patch.object(catalog_utils, 'type_version_manager_api')
+@patch.object(catalog_utils, 'bucket_api')
+class TestGetCatalog(TestCase):
+    def setUp(self):
+        catalog_utils._get_cache().clear()
+
+    def _mock_apis(self, mock_bucket_api, mock_type_version_manager_api):
+        bucket_type = _create_version_manager('bucket_type')
+        mock_bucket_api.get_all_descriptions.return_value = [{'label': 'bucket', 'color': '#000000',
+                                                              'types': [bucket_type.id]}]
+        mock_type_version_manager_api.get_summaries_by_ids.return_value = [bucket_type]
+        mock_type_version_manager_api.get_no_buckets_types.return_value = [_create_version_manager('other_type')]
+        mock_type_version_manager_api.get_summaries_by_user.return_value = [
+            _create_version_manager('user_type', user='1')
+        ]
+
+    def test_get_catalog_returns_types(self, mock_bucket_api, mock_type_version_manager_api):
+        self._mock_apis(mock_bucket_api, mock_type_version_manager_api)
+
+        catalog = catalog_utils.get_catalog('1')
+
+        self.assertEqual(catalog['buckets'][0]['types'][0]['current'], 'bucket_type_id')
+        self.assertEqual(catalog['no_buckets_types'][0]['title'], 'other_type')
+        self.assertEqual(catalog['user_types'][0]['title'], 'user_type')
+        self.assertTrue(len(catalog['built_in_types']) > 0)
+
+    def test_get_catalog_loads_types_of_buckets_at_once(self, mock_bucket_api, mock_type_version_manager_api):
+        self._mock_apis(mock_bucket_api, mock_type_version_manager_api)
+
+        catalog_utils.get_catalog('1')
+
+        mock_type_version_manager_api.get_summaries_by_ids.assert_called_once_with(['bucket_type_vm_id'])
+
+    def test_get_catalog_reads_database_once(self, mock_bucket_api, mock_type_version_manager_api):
+        self._mock_apis(mock_bucket_api, mock_type_version_manager_api)
+
+        catalog_utils.get_catalog('1')
+        catalog_utils.get_catalog('1')
+
+        self.assertEqual(mock_bucket_api.get_all_descriptions.call_count, 1)
+        self.assertEqual(mock_type_version_manager_api.get_summaries_by_user.call_count, 1)
+
+    def test_global_catalog_is_shared_by_users(self, mock_bucket_api, mock_type_version_manager_api):
+        self._mock_apis(mock_bucket_api, mock_type_version_manager_api)
+
+        catalog_utils.get_catalog('1')
+        catalog_utils.get_catalog('2')
+
+        self.assertEqual(mock_bucket_api.get_all_descriptions.call_count, 1)
+        self.assertEqual(mock_type_version_manager_api.get_summaries_by_user.call_count, 2)
+
+    def test_saved_bucket_invalidates_global_catalog(self, mock_bucket_api, mock_type_version_manager_api):
+        self._mock_apis(mock_bucket_api, mock_type_version_manager_api)
+
+        catalog_utils.get_catalog('1')
+        catalog_utils._on_catalog_document_changed(None, Mock())
+        catalog_utils.get_catalog('1')
+
+        self.assertEqual(mock_bucket_api.get_all_descriptions.call_count, 2)
+        self.assertEqual(mock_type_version_manager_api.get_summaries_by_user.call_count, 1)
+
+    def test_saved_user_type_invalidates_types_of_user(self, mock_bucket_api, mock_type_version_manager_api):
+        self._mock_apis(mock_bucket_api, mock_type_version_manager_api)
+
+        catalog_utils.get_catalog('1')
+        catalog_utils.get_catalog('2')
+        catalog_utils._on_type_version_manager_changed(None, _create_version_manager('user_type', user='1'))
+        catalog_utils.get_catalog('1')
+        catalog_utils.get_catalog('2')
+
+        self.assertEqual(mock_type_version_manager_api.get_summaries_by_user.call_count, 3)
@@ -0,0 +1,89 @@
+"""Unit tests for composer colors utils
+"""
+from unittest.case import TestCase
+
+from mock import Mock
+
+from core_composer_app.utils import colors as colors_utils
+
+
+class TestGetPaletteColor(TestCase):
+    def test_palette_is_deterministic(self):
+        self.assertEqual(colors_utils.get_palette_color(5), colors_utils.get_palette_color(5))
+
+    def test_palette_colors_are_hexadecimal(self):
+        color = colors_utils.get_palette_color(0)
+
+        self.assertEqual(len(color), 7)
+        self.assertTrue(color.startswith('#'))
+        int(color[1:], 16)
+
+    def test_first_palette_colors_are_distinct(self):
+        colors = [colors_utils.get_palette_color(index) for index in range(100)]
+
+        self.assertEqual(len(set(colors)), len(colors))
+
+
+class TestAllocateColor(TestCase):
+    def setUp(self):
+        colors_utils.clear()
+
+    def tearDown(self):
+        colors_utils.clear()
+
+    def test_used_colors_are_loaded_once(self):
+        get_used_colors = Mock(return_value=[])
+
+        colors_utils.allocate_color(get_used_colors)
+        colors_utils.allocate_color(get_used_colors)
+
+        self.assertEqual(get_used_colors.call_count, 1)
+
+    def test_allocated_colors_are_distinct(self):
+        get_used_colors = Mock(return_value=[])
+
+        colors = [colors_utils.allocate_color(get_used_colors) for _ in range(20)]
+
+        self.assertEqual(len(set(colors)), 20)
+
+    def test_used_colors_are_skipped(self):
+        get_used_colors = Mock(return_value=[colors_utils.get_palette_color(0).lower()])
+
+        color = colors_utils.allocate_color(get_used_colors)
+
+        self.assertEqual(color, colors_utils.get_palette_color(1))
+
+    def test_released_color_is_allocated_after_reload(self):
+        get_used_colors = Mock(return_value=[])
+        color = colors_utils.allocate_color(get_used_colors)
+        colors_utils.release_color(color)
+
+        self.assertFalse(colors_utils.is_used(color, get_used_colors))
+        self.assertEqual(colors_utils.allocate_color(get_used_colors), color)
+
+
+    def test_released_color_is_allocated_again(self):
+        get_used_colors = Mock(return_value=[])
+        colors = [colors_utils.allocate_color(get_used_colors) for _ in range(3)]
+
+        colors_utils.release_color(colors[1])
+
+        self.assertEqual(colors_utils.allocate_color(get_used_colors), colors[1])
+        self.assertEqual(colors_utils.allocate_color(get_used_colors), colors_utils.get_palette_color(3))
+        self.assertEqual(get_used_colors.call_count, 1)
+
+
+class TestIsUsed(TestCase):
+    def setUp(self):
+        colors_utils.clear()
+
+    def tearDown(self):
+        colors_utils.clear()
+
+    def test_colors_are_reloaded(self):
+        get_used_colors = Mock(return_value=[])
+        color = colors_utils.allocate_color(get_used_colors)
+        get_used_colors.return_value = [color]
+
+        self.assertTrue(colors_utils.is_used(color, get_used_colors))
+        self.assertEqual(get_used_colors.call_count, 2)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for composer compression utils
+"""
+from unittest.case import TestCase
+
+from mock import patch
+
+from core_composer_app.utils import compression as compression_utils
+
+XSD_STRING = u"<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" + \
+             u"<xs:element name='élément' type='xs:string'/>" * 100 + \
+             u"</xs:schema>"
+
+
+class TestCompression(TestCase):
+    def test_decompress_returns_content(self):
+        self.assertEqual(compression_utils.decompress(compression_utils.compress(XSD_STRING)), XSD_STRING)
+
+    def test_large_content_is_compressed(self):
+        stored_content = compression_utils.compress(XSD_STRING)
+        self.assertTrue(stored_content.startswith(compression_utils.ZLIB_FORMAT))
+        self.assertTrue(len(stored_content) < len(XSD_STRING))
+
+    @patch.object(compression_utils, 'COMPOSER_DRAFT_COMPRESSION_THRESHOLD', 100000)
+    def test_small_content_is_not_compressed(self):
+        stored_content = compression_utils.compress(XSD_STRING)
+        self.assertTrue(stored_content.startswith(compression_utils.RAW_FORMAT))
+        self.assertEqual(compression_utils.decompress(stored_content), XSD_STRING)
+
+    @patch.object(compression_utils, 'COMPOSER_DRAFT_COMPRESSION_LEVEL', 0)
+    def test_compression_level_zero_disables_compression(self):
+        stored_content = compression_utils.compress(XSD_STRING)
+        self.assertTrue(stored_content.startswith(compression_utils.RAW_FORMAT))
+
+    def test_decompress_unknown_format_raises_error(self):
+        with self.assertRaises(ValueError):
+            compression_utils.decompress(b'x')
@@ -0,0 +1,235 @@
+"""Unit tests for composer draft utils
+"""
+from unittest.case import TestCase
+
+from bson.objectid import ObjectId
+from mock.mock import Mock, patch
+
+from core_composer_app.commons.exceptions import DraftConflictError
+from core_composer_app.components.compose_draft.models import ComposeDraft
+from core_composer_app.utils import draft as draft_utils
+from core_composer_app.utils import operations as operations_utils
+from core_composer_app.utils.xml import rename_element_in_tree
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+XSD_STRING = "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" \
+             "<xs:element name='root' type='xs:string'/></xs:schema>"
+
+
+class DraftTestCase(TestCase):
+    def setUp(self):
+        # drafts are kept in memory
+        patcher = patch.object(draft_utils, 'compose_draft_api')
+        mock_compose_draft_api = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_compose_draft_api.insert.side_effect = _insert
+        mock_compose_draft_api.update.side_effect = _update
+        mock_compose_draft_api.load_contents.side_effect = lambda compose_draft: compose_draft
+
+        self.request = _create_mock_request()
+        self.compose_draft = draft_utils.create_draft(self.request, XSD_STRING, [])
+
+    def _get_root_name(self):
+        return draft_utils.get_draft_tree(self.compose_draft).getroot().find('*').attrib['name']
+
+
+class TestGetDraftTree(DraftTestCase):
+    def test_create_draft_sets_current_draft_of_session(self):
+        self.assertEqual(self.request.session[draft_utils.DRAFT_ID_KEY], str(self.compose_draft.id))
+
+    def test_get_draft_tree_returns_tree_of_the_draft(self):
+        self.assertEqual(self._get_root_name(), 'root')
+
+    @patch.object(draft_utils, 'build_xsd_tree')
+    def test_get_draft_tree_parses_draft_once(self, mock_build_xsd_tree):
+        mock_build_xsd_tree.return_value = XSDTree.build_tree(XSD_STRING)
+        draft_utils.get_draft_tree(self.compose_draft)
+        draft_utils.get_draft_tree(self.compose_draft)
+        self.assertEqual(mock_build_xsd_tree.call_count, 1)
+
+    @patch.object(draft_utils, 'build_xsd_tree')
+    def test_create_draft_with_tree_does_not_parse_draft(self, mock_build_xsd_tree):
+        xsd_tree = XSDTree.build_tree(XSD_STRING)
+        compose_draft = draft_utils.create_draft(self.request, XSD_STRING, [], xsd_tree=xsd_tree)
+        self.assertIs(draft_utils.get_draft_tree(compose_draft), xsd_tree)
+        self.assertEqual(mock_build_xsd_tree.call_count, 0)
+
+    def test_save_draft_operations_updates_draft_content(self):
+        _rename(self.compose_draft, 'new_root')
+        self.assertTrue('new_root' in draft_utils.get_draft_string(self.compose_draft))
+
+    def test_save_draft_operations_writes_only_the_operations(self):
+        _rename(self.compose_draft, 'new_root')
+        update_document = draft_utils.compose_draft_api.update.call_args[0][1]
+        self.assertEqual(update_document['$push'], {'operations': [_rename_operation('new_root')]})
+        self.assertFalse('content' in update_document['$set'])
+
+    def test_get_draft_tree_replays_operations_since_checkpoint(self):
+        _rename(self.compose_draft, 'new_root')
+        # tree not in the cache of the process
+        draft_utils.discard_draft_tree(self.compose_draft)
+        self.assertEqual(self._get_root_name(), 'new_root')
+
+    def test_get_draft_tree_rebuilds_draft_modified_by_another_process(self):
+        draft_utils.get_draft_tree(self.compose_draft)
+        # draft modified by another process
+        self.compose_draft.content = ComposeDraft.compress(XSD_STRING.replace('root', 'other'))
+        self.compose_draft.version += 1
+        self.assertEqual(self._get_root_name(), 'other')
+
+    def test_edited_draft_is_cached_with_size_of_tree(self):
+        draft_utils._tree_cache.clear()
+        draft_utils.get_draft_tree(self.compose_draft)
+        size = draft_utils._tree_cache.size
+        # the content of the draft is not loaded by the edits
+        self.compose_draft.content = None
+        _rename(self.compose_draft, 'new_root')
+        self.assertEqual(size, 2 * draft_utils.TREE_NODE_SIZE)
+        self.assertEqual(draft_utils._tree_cache.size, size)
+
+    def test_discard_draft_tree_reloads_draft_content(self):
+        xsd_tree = draft_utils.get_draft_tree(self.compose_draft)
+        rename_element_in_tree(xsd_tree, 'xs:element', 'new_root')
+        draft_utils.discard_draft_tree(self.compose_draft)
+        self.assertEqual(self._get_root_name(), 'root')
+
+
+class TestDraftHistory(DraftTestCase):
+    def test_undo_without_edit_returns_none(self):
+        self.assertIsNone(draft_utils.undo_draft(self.compose_draft))
+
+    def test_redo_without_undone_edit_returns_none(self):
+        _rename(self.compose_draft, 'first')
+        self.assertIsNone(draft_utils.redo_draft(self.compose_draft))
+
+    def test_undo_cancels_last_edit(self):
+        _rename(self.compose_draft, 'first')
+        _rename(self.compose_draft, 'second')
+        draft_utils.undo_draft(self.compose_draft)
+        self.assertEqual(self._get_root_name(), 'first')
+
+    def test_redo_applies_undone_edit(self):
+        _rename(self.compose_draft, 'first')
+        draft_utils.undo_draft(self.compose_draft)
+        draft_utils.redo_draft(self.compose_draft)
+        self.assertEqual(self._get_root_name(), 'first')
+
+    def test_new_edit_cancels_undone_edits(self):
+        _rename(self.compose_draft, 'first')
+        draft_utils.undo_draft(self.compose_draft)
+        _rename(self.compose_draft, 'second')
+        self.assertFalse(draft_utils.can_redo_draft(self.compose_draft))
+
+    @patch.object(draft_utils, 'COMPOSER_DRAFT_CHECKPOINT_INTERVAL', 2)
+    def test_checkpoint_stores_draft_content(self):
+        _rename(self.compose_draft, 'first')
+        _rename(self.compose_draft, 'second')
+        self.assertTrue('second' in ComposeDraft.decompress(self.compose_draft.content))
+        self.assertEqual(self.compose_draft.operations, [])
+
+    @patch.object(draft_utils, 'COMPOSER_DRAFT_CHECKPOINT_INTERVAL', 2)
+    def test_undo_goes_back_to_previous_checkpoint(self):
+        _rename(self.compose_draft, 'first')
+        _rename(self.compose_draft, 'second')
+        draft_utils.undo_draft(self.compose_draft)
+        self.assertEqual(self._get_root_name(), 'first')
+        draft_utils.undo_draft(self.compose_draft)
+        self.assertEqual(self._get_root_name(), 'root')
+        self.assertFalse(draft_utils.can_undo_draft(self.compose_draft))
+
+
+class TestCheckDraftRevision(DraftTestCase):
+    def test_current_revision_is_accepted(self):
+        _rename(self.compose_draft, 'first')
+        draft_utils.check_draft_revision(self.compose_draft, self.compose_draft.version)
+
+    def test_outdated_revision_without_structural_change_is_rebased(self):
+        revision = self.compose_draft.version
+        _rename(self.compose_draft, 'first')
+        draft_utils.check_draft_revision(self.compose_draft, revision)
+
+    def test_outdated_revision_of_undo_raises_conflict_error(self):
+        revision = self.compose_draft.version
+        _rename(self.compose_draft, 'first')
+        with self.assertRaises(DraftConflictError):
+            draft_utils.check_draft_revision(self.compose_draft, revision, rebase=False)
+
+    def test_outdated_revision_with_structural_change_raises_conflict_error(self):
+        revision = self.compose_draft.version
+        xsd_tree = draft_utils.get_draft_tree(self.compose_draft)
+        draft_utils.save_draft_operations(self.compose_draft, xsd_tree,
+                                          [{'action': operations_utils.DELETE, 'xpath': 'xs:element'}])
+        with self.assertRaises(DraftConflictError):
+            draft_utils.check_draft_revision(self.compose_draft, revision)
+
+    def test_outdated_revision_before_undo_raises_conflict_error(self):
+        _rename(self.compose_draft, 'first')
+        revision = self.compose_draft.version
+        draft_utils.undo_draft(self.compose_draft)
+        with self.assertRaises(DraftConflictError):
+            draft_utils.check_draft_revision(self.compose_draft, revision)
+
+
+def _rename(compose_draft, name):
+    """Renames the root element of the draft
+
+    Args:
+        compose_draft:
+        name:
+
+    Returns:
+
+    """
+    xsd_tree = draft_utils.get_draft_tree(compose_draft)
+    rename_element_in_tree(xsd_tree, 'xs:element', name)
+    draft_utils.save_draft_operations(compose_draft, xsd_tree, [_rename_operation(name)])
+
+
+def _rename_operation(name):
+    """Returns an operation renaming the root element
+
+    Args:
+        name:
+
+    Returns:
+
+    """
+    return {'action': operations_utils.RENAME, 'xpath': 'xs:element', 'newName': name}
+
+
+def _insert(compose_draft):
+    """Sets the id of a new draft
+
+    Args:
+        compose_draft:
+
+    Returns:
+
+    """
+    compose_draft.id = ObjectId()
+    return compose_draft
+
+
+def _update(compose_draft, update_document):
+    """Increments the version of an updated draft
+
+    Args:
+        compose_draft:
+        update_document:
+
+    Returns:
+
+    """
+    compose_draft.version += 1
+
+
+def _create_mock_request():
+    """Returns a mock request with a session
+
+    Returns:
+
+    """
+    mock_request = Mock()
+    mock_request.session = {}
+    mock_request.user.id = 1
+    return mock_request
@@ -0,0 +1,68 @@
+"""Integration tests for composer jobs utils
+"""
+from mock import patch
+
+from core_composer_app.utils import jobs as jobs_utils
+from core_main_app.utils.integration_tests.integration_base_test_case import \
+    MongoIntegrationBaseTestCase
+from tests.components.compose_job.fixtures.fixtures import ComposeJobFixtures
+
+fixture_compose_job = ComposeJobFixtures()
+
+
+def _successful_job(job, value):
+    job.set_progress('Working.')
+    return {'value': value}
+
+
+def _failing_job(job):
+    raise jobs_utils.JobError('error')
+
+
+class TestRunJob(MongoIntegrationBaseTestCase):
+    fixture = fixture_compose_job
+
+    def setUp(self):
+        super(TestRunJob, self).setUp()
+        # run the jobs in the test thread
+        patcher = patch.object(jobs_utils, '_start_workers')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _submit_and_run(self, func, *args):
+        job_id = jobs_utils.submit('1', func, *args)
+        job_id, func, args, kwargs = jobs_utils._queue.get()
+        jobs_utils.run_job(job_id, func, *args, **kwargs)
+        return job_id
+
+    def test_submitted_job_is_pending(self):
+        job_id = jobs_utils.submit('1', _successful_job, 'value')
+        jobs_utils._queue.get()
+        self.assertEqual(jobs_utils.get_status(job_id, '1')['status'], jobs_utils.PENDING)
+
+    def test_successful_job_stores_result(self):
+        job_id = self._submit_and_run(_successful_job, 'value')
+        status = jobs_utils.get_status(job_id, '1')
+        self.assertEqual(status['status'], jobs_utils.SUCCESS)
+        self.assertEqual(status['result'], {'value': 'value'})
+
+    def test_failing_job_stores_error(self):
+        job_id = self._submit_and_run(_failing_job)
+        status = jobs_utils.get_status(job_id, '1')
+        self.assertEqual(status['status'], jobs_utils.FAILURE)
+        self.assertEqual(status['error'], 'error')
+
+    def test_status_of_job_of_other_user_returns_none(self):
+        job_id = self._submit_and_run(_successful_job, 'value')
+        self.assertIsNone(jobs_utils.get_status(job_id, '2'))
+
+    def test_status_of_unknown_job_returns_none(self):
+        self.assertIsNone(jobs_utils.get_status('unknown', '1'))
+
+    def test_status_of_running_job_is_running(self):
+        status = jobs_utils.get_status(str(self.fixture.running_job.id), '1')
+        self.assertEqual(status['status'], jobs_utils.RUNNING)
+
+    def test_status_of_interrupted_job_is_failure(self):
+        status = jobs_utils.get_status(str(self.fixture.interrupted_job.id), '1')
+        self.assertEqual(status['status'], jobs_utils.FAILURE)
@@ -0,0 +1,180 @@
+"""Unit tests for composer operations
+"""
+from unittest.case import TestCase
+
+from mock import Mock, patch
+
+from core_composer_app.utils import operations as operations_utils
+from core_composer_app.utils.xml import get_element_occurrences_from_tree
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+XSD_STRING = "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" \
+             "<xs:element name='root'><xs:complexType><xs:sequence>" \
+             "<xs:element name='first' type='xs:string'/>" \
+             "<xs:element name='second' type='xs:string'/>" \
+             "</xs:sequence></xs:complexType></xs:element></xs:schema>"
+SEQUENCE_XPATH = 'xs:element/xs:complexType/xs:sequence'
+INCLUDE_URL = 'http://127.0.0.1:8000/rest/template/download?pk=5a0d9b2f4e0c4b1f2c3d4e5f'
+
+
+class TestApplyOperations(TestCase):
+    def setUp(self):
+        self.xsd_tree = XSDTree.build_tree(XSD_STRING)
+
+    def test_apply_operations_applies_all_operations(self):
+        operations = [
+            {'action': operations_utils.RENAME, 'xpath': SEQUENCE_XPATH + '/xs:element[1]', 'newName': 'renamed'},
+            {'action': operations_utils.SET_OCCURRENCES, 'xpath': SEQUENCE_XPATH + '/xs:element[2]',
+             'minOccurs': '0', 'maxOccurs': 'unbounded'},
+            {'action': operations_utils.INSERT, 'typeID': operations_utils.BUILT_IN_TYPE, 'typeName': 'int',
+             'xpath': SEQUENCE_XPATH},
+        ]
+
+        xsd_tree, results, error = operations_utils.apply_operations(self.xsd_tree, operations)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(results), 3)
+        self.assertTrue('renamed' in XSDTree.tostring(xsd_tree))
+        self.assertEqual(get_element_occurrences_from_tree(xsd_tree, SEQUENCE_XPATH + '/xs:element[2]'),
+                         ('0', 'unbounded'))
+        self.assertEqual(len(xsd_tree.find('*/*/*')), 3)
+
+    def test_apply_operations_stops_at_failed_operation(self):
+        operations = [
+            {'action': operations_utils.DELETE, 'xpath': SEQUENCE_XPATH + '/xs:element[5]'},
+            {'action': operations_utils.DELETE, 'xpath': SEQUENCE_XPATH + '/xs:element[1]'},
+        ]
+
+        _, results, error = operations_utils.apply_operations(self.xsd_tree, operations)
+
+        self.assertIsNotNone(error)
+        self.assertEqual(len(results), 1)
+        self.assertTrue('error' in results[0])
+
+    def test_apply_operations_returns_error_if_result_is_not_valid(self):
+        operations = [
+            {'action': operations_utils.RENAME, 'xpath': SEQUENCE_XPATH + '/xs:element[1]', 'newName': '1 2'},
+        ]
+
+        _, results, error = operations_utils.apply_operations(self.xsd_tree, operations)
+
+        self.assertIsNotNone(error)
+        self.assertEqual(len(results), 1)
+
+    def test_apply_unknown_operation_returns_error(self):
+        _, results, error = operations_utils.apply_operations(self.xsd_tree, [{'action': 'unknown'}])
+
+        self.assertIsNotNone(error)
+
+    def test_apply_operations_without_validation_rejects_invalid_name(self):
+        operations = [
+            {'action': operations_utils.RENAME, 'xpath': SEQUENCE_XPATH + '/xs:element[1]', 'newName': '1 2'},
+        ]
+
+        _, results, error = operations_utils.apply_operations(self.xsd_tree, operations, validate=False)
+
+        self.assertIsNotNone(error)
+        self.assertTrue('error' in results[0])
+
+    def test_apply_operations_without_validation_applies_all_operations(self):
+        operations = [
+            {'action': operations_utils.RENAME, 'xpath': SEQUENCE_XPATH + '/xs:element[1]', 'newName': 'renamed'},
+            {'action': operations_utils.DELETE, 'xpath': SEQUENCE_XPATH + '/xs:element[2]'},
+        ]
+
+        xsd_tree, results, error = operations_utils.apply_operations(self.xsd_tree, operations, validate=False)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(xsd_tree.find('*/*/*')), 1)
+
+    def test_apply_operations_returns_xpath_of_inserted_element(self):
+        operations = [
+            {'action': operations_utils.INSERT, 'typeID': operations_utils.BUILT_IN_TYPE, 'typeName': 'int',
+             'xpath': SEQUENCE_XPATH},
+        ]
+
+        _, results, error = operations_utils.apply_operations(self.xsd_tree, operations)
+
+        self.assertIsNone(error)
+        self.assertEqual(results[0]['xpath'], SEQUENCE_XPATH + '/xs:element[3]')
+
+    def test_apply_operations_returns_new_xpath_of_changed_element(self):
+        operations = [
+            {'action': operations_utils.CHANGE_TYPE, 'xpath': SEQUENCE_XPATH, 'newType': 'choice'},
+        ]
+
+        _, results, error = operations_utils.apply_operations(self.xsd_tree, operations)
+
+        self.assertIsNone(error)
+        self.assertEqual(results[0]['xpath'], 'xs:element/xs:complexType/xs:choice')
+
+    def test_apply_operations_drops_xpaths_outdated_by_structural_operation(self):
+        operations = [
+            {'action': operations_utils.RENAME, 'xpath': SEQUENCE_XPATH + '/xs:element[2]', 'newName': 'renamed'},
+            {'action': operations_utils.DELETE, 'xpath': SEQUENCE_XPATH + '/xs:element[1]'},
+        ]
+
+        _, results, error = operations_utils.apply_operations(self.xsd_tree, operations)
+
+        self.assertIsNone(error)
+        self.assertFalse('xpath' in results[0])
+
+
+class TestApplyInsertTypeOperation(TestCase):
+    def setUp(self):
+        self.xsd_tree = XSDTree.build_tree(XSD_STRING)
+        self.operation = {'action': operations_utils.INSERT, 'typeID': '5a0d9b2f4e0c4b1f2c3d4e5f',
+                          'typeName': 'third', 'xpath': SEQUENCE_XPATH}
+
+    @patch('core_composer_app.utils.operations.get_include_url')
+    @patch('core_composer_app.components.type.api.get_with_metadata')
+    def test_apply_operations_stores_metadata_of_type_in_operation(self, get_with_metadata, get_include_url):
+        get_include_url.return_value = INCLUDE_URL
+        get_with_metadata.return_value = _get_type_summary()
+
+        _, _, error = operations_utils.apply_operations(self.xsd_tree, [self.operation], validate=False)
+
+        self.assertIsNone(error)
+        self.assertEqual(self.operation[operations_utils.ROOT_TYPE_NAME], 'ThirdType')
+        self.assertEqual(self.operation[operations_utils.TARGET_NAMESPACE], 'http://example.com/third')
+        self.assertEqual(self.operation[operations_utils.TARGET_NAMESPACE_PREFIX], 'third')
+
+    @patch('core_composer_app.utils.operations.get_include_url')
+    @patch('core_composer_app.components.type.api.get_with_metadata')
+    def test_apply_operation_with_stored_metadata_does_not_get_type(self, get_with_metadata, get_include_url):
+        get_include_url.return_value = INCLUDE_URL
+        get_with_metadata.side_effect = Exception('the type was deleted')
+        self.operation.update({operations_utils.ROOT_TYPE_NAME: 'ThirdType',
+                               operations_utils.TARGET_NAMESPACE: 'http://example.com/third',
+                               operations_utils.TARGET_NAMESPACE_PREFIX: 'third'})
+
+        xsd_tree = operations_utils.apply_operation(self.xsd_tree, self.operation)
+
+        self.assertFalse(get_with_metadata.called)
+        self.assertEqual(xsd_tree.xpath("//xs:element[@name='third']/@type",
+                                        namespaces={'xs': 'http://www.w3.org/2001/XMLSchema'}),
+                         ['third:ThirdType'])
+
+
+class TestGetIncludeUrl(TestCase):
+    def test_get_include_url_of_built_in_type_returns_none(self):
+        operation = {'action': operations_utils.INSERT, 'typeID': operations_utils.BUILT_IN_TYPE}
+        self.assertIsNone(operations_utils.get_include_url(operation))
+
+    def test_get_include_url_of_other_operation_returns_none(self):
+        operation = {'action': operations_utils.DELETE, 'xpath': SEQUENCE_XPATH}
+        self.assertIsNone(operations_utils.get_include_url(operation))
+
+
+def _get_type_summary():
+    """Return the summary of a type, with the metadata used to insert it.
+
+    Returns:
+
+    """
+    type_summary = Mock()
+    type_summary.root_type_name = 'ThirdType'
+    type_summary.target_namespace = 'http://example.com/third'
+    type_summary.target_namespace_prefix = 'third'
+    return type_summary
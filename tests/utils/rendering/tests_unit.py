@@ -0,0 +1,131 @@
+"""Unit tests for composer rendering utils
+"""
+from os.path import join, dirname, abspath
+from unittest.case import TestCase
+
+from lxml import etree
+from mock import patch
+
+from core_composer_app.utils import rendering as rendering_utils
+from core_composer_app.utils import resources as resources_utils
+from core_composer_app.utils.xml import find_element
+from xml_utils.xsd_tree.xsd_tree import XSDTree
+
+STATIC_PATH = join(dirname(dirname(dirname(dirname(abspath(__file__))))), 'core_composer_app', 'static')
+
+XSD_STRING = "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" \
+             "<xs:include schemaLocation='type.xsd'/>" \
+             "<xs:element name='root'><xs:annotation><xs:documentation>root</xs:documentation></xs:annotation>" \
+             "<xs:complexType><xs:sequence>" \
+             "<xs:element name='first' type='xs:string' minOccurs='0' maxOccurs='unbounded'/>" \
+             "<xs:element name='second' type='xs:int'>" \
+             "<xs:annotation><xs:documentation>second</xs:documentation></xs:annotation></xs:element>" \
+             "<xs:element ref='first'/>" \
+             "<xs:sequence/>" \
+             "<xs:choice><xs:element name='third' type='xs:string' maxOccurs='3'/></xs:choice>" \
+             "</xs:sequence></xs:complexType></xs:element>" \
+             "<xs:simpleType name='values'><xs:restriction base='xs:string'>" \
+             "<xs:enumeration value='a'/><xs:enumeration value='b &amp; c'/>" \
+             "</xs:restriction></xs:simpleType>" \
+             "</xs:schema>"
+SEQUENCE_XPATH = 'xs:element/xs:complexType/xs:sequence'
+
+
+def _normalize(html):
+    """Return the HTML with normalized whitespaces, to compare renderings.
+
+    Args:
+        html:
+
+    Returns:
+
+    """
+    tree = etree.HTML(html)
+    for element in tree.iter():
+        element.text = ' '.join(element.text.split()) or None if element.text else None
+        element.tail = ' '.join(element.tail.split()) or None if element.tail else None
+    return etree.tostring(tree)
+
+
+@patch.object(resources_utils.finders, 'find', side_effect=lambda path: join(STATIC_PATH, path))
+class TestRenderers(TestCase):
+    def setUp(self):
+        resources_utils.clear()
+        self.xsd_tree = XSDTree.build_tree(XSD_STRING)
+
+    def _render_tree(self, renderer):
+        with patch.object(rendering_utils, 'COMPOSER_RENDERER', renderer):
+            return _normalize(rendering_utils.render_xsd_tree(self.xsd_tree))
+
+    def _render_element(self, renderer, xpath):
+        with patch.object(rendering_utils, 'COMPOSER_RENDERER', renderer):
+            return _normalize(rendering_utils.render_xsd_element(self.xsd_tree,
+                                                                 find_element(self.xsd_tree, xpath)))
+
+    def test_python_renderer_renders_same_tree_as_xslt(self, mock_find):
+        self.assertEqual(self._render_tree(rendering_utils.PYTHON_RENDERER),
+                         self._render_tree(rendering_utils.XSLT_RENDERER))
+
+    def test_python_renderer_renders_same_element_as_xslt(self, mock_find):
+        xpath = SEQUENCE_XPATH + '/xs:element[2]'
+        self.assertEqual(self._render_element(rendering_utils.PYTHON_RENDERER, xpath),
+                         self._render_element(rendering_utils.XSLT_RENDERER, xpath))
+
+    def test_python_renderer_renders_same_sequence_as_xslt(self, mock_find):
+        self.assertEqual(self._render_element(rendering_utils.PYTHON_RENDERER, SEQUENCE_XPATH),
+                         self._render_element(rendering_utils.XSLT_RENDERER, SEQUENCE_XPATH))
+
+    def test_xslt_renderer_renders_element_of_prefixed_schema(self, mock_find):
+        html = self._render_element(rendering_utils.XSLT_RENDERER, SEQUENCE_XPATH + '/xs:element[2]')
+        self.assertTrue('<span class="name">second</span>' in html)
+
+    def test_rendering_does_not_modify_tree(self, mock_find):
+        xsd_string = XSDTree.tostring(self.xsd_tree)
+        for renderer in [rendering_utils.PYTHON_RENDERER, rendering_utils.XSLT_RENDERER]:
+            self._render_tree(renderer)
+            self._render_element(renderer, SEQUENCE_XPATH)
+        self.assertEqual(XSDTree.tostring(self.xsd_tree), xsd_string)
+
+    def test_element_path_has_position_among_siblings(self, mock_find):
+        html = self._render_element(rendering_utils.PYTHON_RENDERER, SEQUENCE_XPATH + '/xs:element[3]')
+        self.assertTrue('<span class="path">xs:element[3]</span>' in html)
+
+
+@patch.object(rendering_utils, 'COMPOSER_RENDERER', rendering_utils.PYTHON_RENDERER)
+class TestRenderTemplate(TestCase):
+    def setUp(self):
+        rendering_utils._get_cache().clear()
+
+    def test_render_template_returns_tree_rendering_and_includes(self):
+        xsd_tree, xsd_form, includes = rendering_utils.render_template('new', XSD_STRING)
+
+        self.assertIsNotNone(xsd_tree)
+        self.assertTrue(xsd_form.startswith('<ul class="tree">'))
+        self.assertEqual(includes, ['type.xsd'])
+
+    @patch.object(rendering_utils.composer_xml_utils, 'build_xsd_tree', side_effect=XSDTree.build_tree)
+    def test_render_template_skips_rendered_template(self, mock_build_xsd_tree):
+        _, xsd_form, _ = rendering_utils.render_template('new', XSD_STRING)
+        xsd_tree, cached_xsd_form, includes = rendering_utils.render_template('new', XSD_STRING)
+
+        self.assertIsNone(xsd_tree)
+        self.assertEqual(cached_xsd_form, xsd_form)
+        self.assertEqual(includes, ['type.xsd'])
+        self.assertEqual(mock_build_xsd_tree.call_count, 1)
+
+    @patch.object(rendering_utils.composer_xml_utils, 'build_xsd_tree', side_effect=XSDTree.build_tree)
+    def test_render_template_renders_modified_content(self, mock_build_xsd_tree):
+        rendering_utils.render_template('new', XSD_STRING)
+        _, xsd_form, _ = rendering_utils.render_template('new', XSD_STRING.replace('first', 'renamed'))
+
+        self.assertTrue('renamed' in xsd_form)
+        self.assertEqual(mock_build_xsd_tree.call_count, 2)
+
+    @patch.object(rendering_utils.composer_xml_utils, 'build_xsd_tree', side_effect=XSDTree.build_tree)
+    def test_invalidate_template_renders_template_again(self, mock_build_xsd_tree):
+        rendering_utils.render_template('template1', XSD_STRING)
+        rendering_utils.invalidate_template('template1')
+        xsd_tree, _, _ = rendering_utils.render_template('template1', XSD_STRING)
+
+        self.assertIsNotNone(xsd_tree)
+        self.assertEqual(mock_build_xsd_tree.call_count, 2)
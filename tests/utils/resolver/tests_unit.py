@@ -0,0 +1,255 @@
+"""Unit tests for composer resolver utils
+"""
+import re
+import threading
+from unittest.case import TestCase
+
+from mock.mock import Mock, patch
+
+from core_composer_app.components.type.models import Type
+from core_composer_app.utils import resolver as resolver_utils
+from core_main_app.commons import exceptions
+from core_main_app.components.template import api as template_api
+
+DOWNLOAD_PATTERN = re.compile(r'^/rest/template/(?P<pk>\w+)/download/$')
+TYPE_URL = 'http://localhost/rest/template/type1/download/'
+BASE_TYPE_URL = 'http://localhost/rest/template/type0/download/'
+TYPE_CONTENT = u"<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" \
+               u"<xs:simpleType name='type1'><xs:restriction base='xs:string'/></xs:simpleType></xs:schema>"
+
+
+class TestGetTemplateContentFromUrl(TestCase):
+    def setUp(self):
+        resolver_utils._content_cache.clear()
+        resolver_utils._download_pattern = None
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_download_url_returns_template_content(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash1')]
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT)
+
+        self.assertEqual(resolver_utils.get_template_content_from_url(TYPE_URL), TYPE_CONTENT.encode('utf-8'))
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_download_url_reads_content_once(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash1')]
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT)
+
+        resolver_utils.get_template_content_from_url(TYPE_URL)
+        resolver_utils.get_template_content_from_url(TYPE_URL)
+
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_modified_type_is_read_again(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash1')]
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT)
+        resolver_utils.get_template_content_from_url(TYPE_URL)
+
+        # type modified by another process
+        modified_content = TYPE_CONTENT.replace('type1', 'type2')
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash2')]
+        mock_get.return_value = _create_mock_template(modified_content)
+
+        self.assertEqual(resolver_utils.get_template_content_from_url(TYPE_URL), modified_content.encode('utf-8'))
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_template_without_content_hash_is_not_cached(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = []
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT)
+
+        resolver_utils.get_template_content_from_url(TYPE_URL)
+        resolver_utils.get_template_content_from_url(TYPE_URL)
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(template_api, 'get')
+    def test_other_url_returns_none(self, mock_get, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+
+        self.assertIsNone(resolver_utils.get_template_content_from_url('http://example.com/type.xsd'))
+        self.assertFalse(mock_get.called)
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_absent_template_returns_none(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = []
+        mock_get.side_effect = exceptions.DoesNotExist('')
+
+        self.assertIsNone(resolver_utils.get_template_content_from_url(TYPE_URL))
+
+
+class TestTemplateResolver(TestCase):
+    def setUp(self):
+        resolver_utils._content_cache.clear()
+        resolver_utils._download_pattern = None
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    def test_resolver_error_does_not_fail_parse(self, mock_get_pattern):
+        mock_get_pattern.side_effect = Exception('no urlconf')
+
+        self.assertIsNone(resolver_utils.TemplateResolver().resolve(TYPE_URL, None, None))
+
+    def test_each_thread_uses_its_own_parser(self):
+        parsers = []
+        thread = threading.Thread(target=lambda: parsers.append(resolver_utils._get_thread_resolver_parser()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(parsers[0], resolver_utils._get_thread_resolver_parser())
+
+
+class TestValidateXmlSchema(TestCase):
+    def setUp(self):
+        resolver_utils._content_cache.clear()
+        resolver_utils._download_pattern = None
+        resolver_utils._schema_cache.clear()
+        self.xsd_string = "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" \
+                          "<xs:include schemaLocation='{}'/>" \
+                          "<xs:element name='root' type='type1'/></xs:schema>".format(TYPE_URL)
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_schema_including_stored_type_is_valid(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash1')]
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT)
+
+        self.assertIsNone(resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string)))
+
+    def test_invalid_schema_returns_error(self):
+        xsd_tree = resolver_utils.build_tree("<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+                                             "<xs:element name='root' type='undefined'/></xs:schema>")
+
+        self.assertIsNotNone(resolver_utils.validate_xml_schema(xsd_tree))
+
+    @patch.object(resolver_utils.etree, 'XMLSchema')
+    def test_same_schema_is_compiled_once(self, mock_xml_schema):
+        xsd_string = "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" \
+                     "<xs:element name='root' type='xs:string'/></xs:schema>"
+
+        resolver_utils.validate_xml_schema(resolver_utils.build_tree(xsd_string))
+        resolver_utils.validate_xml_schema(resolver_utils.build_tree(xsd_string))
+
+        self.assertEqual(mock_xml_schema.call_count, 1)
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(resolver_utils.etree, 'XMLSchema')
+    def test_same_schema_with_same_types_is_compiled_once(self, mock_xml_schema, mock_get_summaries,
+                                                          mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash1')]
+
+        resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string))
+        resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string))
+
+        self.assertEqual(mock_xml_schema.call_count, 1)
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(resolver_utils.etree, 'XMLSchema')
+    def test_schema_is_compiled_again_if_type_included_by_type_is_modified(self, mock_xml_schema,
+                                                                            mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.side_effect = _get_mock_type_summaries('hash0')
+        resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string))
+
+        # type included by the type modified by another process
+        mock_get_summaries.side_effect = _get_mock_type_summaries('hash2')
+        resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string))
+
+        self.assertEqual(mock_xml_schema.call_count, 2)
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_schema_with_missing_include_is_validated_again(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = []
+        mock_get.side_effect = exceptions.DoesNotExist('')
+        self.assertIsNotNone(resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string)))
+
+        # type available
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash1')]
+        mock_get.side_effect = None
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT)
+
+        self.assertIsNone(resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string)))
+
+    @patch.object(resolver_utils, 'get_template_download_pattern')
+    @patch.object(Type, 'get_summaries_by_ids')
+    @patch.object(template_api, 'get')
+    def test_modified_type_is_validated_again(self, mock_get, mock_get_summaries, mock_get_pattern):
+        mock_get_pattern.return_value = DOWNLOAD_PATTERN
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash1')]
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT)
+        resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string))
+
+        # type modified by another process
+        mock_get_summaries.return_value = [_create_mock_type_summary('type1', 'hash2')]
+        mock_get.return_value = _create_mock_template(TYPE_CONTENT.replace('type1', 'type2'))
+
+        self.assertIsNotNone(resolver_utils.validate_xml_schema(resolver_utils.build_tree(self.xsd_string)))
+
+
+def _create_mock_template(content):
+    """Returns a mock template
+
+    Args:
+        content:
+
+    Returns:
+
+    """
+    mock_template = Mock()
+    mock_template.content = content
+    return mock_template
+
+
+def _create_mock_type_summary(type_id, content_hash, schema_locations=None):
+    """Returns a mock type, without content
+
+    Args:
+        type_id:
+        content_hash:
+        schema_locations:
+
+    Returns:
+
+    """
+    mock_type = Mock()
+    mock_type.id = type_id
+    mock_type.content_hash = content_hash
+    mock_type.schema_locations = schema_locations or []
+    return mock_type
+
+
+def _get_mock_type_summaries(base_type_hash):
+    """Returns a function returning the summaries of type1, including type0, and of type0
+
+    Args:
+        base_type_hash: content hash of type0
+
+    Returns:
+
+    """
+    types = {'type1': _create_mock_type_summary('type1', 'hash1', [BASE_TYPE_URL]),
+             'type0': _create_mock_type_summary('type0', base_type_hash)}
+    return lambda type_ids: [types[type_id] for type_id in type_ids]
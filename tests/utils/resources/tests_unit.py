@@ -0,0 +1,68 @@
+"""Unit tests for composer resources utils
+"""
+import os
+import shutil
+import tempfile
+from os.path import join
+from unittest.case import TestCase
+
+from mock import patch, Mock
+
+from core_composer_app.utils import resources as resources_utils
+
+XSL_STRING = "<xsl:stylesheet xmlns:xsl='http://www.w3.org/1999/XSL/Transform' version='1.0'>" \
+             "<xsl:template match='/'><ul class='tree'/></xsl:template></xsl:stylesheet>"
+
+
+class TestGetXslt(TestCase):
+    def setUp(self):
+        resources_utils.clear()
+        self.directory = tempfile.mkdtemp()
+        self.file_path = join(self.directory, 'test.xsl')
+        with open(self.file_path, 'w') as xsl_file:
+            xsl_file.write(XSL_STRING)
+
+    def tearDown(self):
+        resources_utils.clear()
+        shutil.rmtree(self.directory)
+
+    def _touch(self):
+        mtime = os.path.getmtime(self.file_path) + 10
+        os.utime(self.file_path, (mtime, mtime))
+
+    @patch.object(resources_utils, 'settings', Mock(DEBUG=False))
+    @patch.object(resources_utils.finders, 'find')
+    def test_stylesheet_is_compiled_once(self, mock_find):
+        mock_find.return_value = self.file_path
+
+        xslt = resources_utils.get_xslt('test.xsl')
+
+        self.assertIs(resources_utils.get_xslt('test.xsl'), xslt)
+        self.assertEqual(mock_find.call_count, 1)
+
+    @patch.object(resources_utils, 'settings', Mock(DEBUG=False))
+    @patch.object(resources_utils.finders, 'find')
+    def test_modified_stylesheet_is_not_reloaded_without_debug(self, mock_find):
+        mock_find.return_value = self.file_path
+
+        xslt = resources_utils.get_xslt('test.xsl')
+        self._touch()
+
+        self.assertIs(resources_utils.get_xslt('test.xsl'), xslt)
+
+    @patch.object(resources_utils, 'settings', Mock(DEBUG=True))
+    @patch.object(resources_utils.finders, 'find')
+    def test_modified_stylesheet_is_reloaded_in_debug(self, mock_find):
+        mock_find.return_value = self.file_path
+
+        xslt = resources_utils.get_xslt('test.xsl')
+        self._touch()
+
+        self.assertIsNot(resources_utils.get_xslt('test.xsl'), xslt)
+
+    @patch.object(resources_utils.finders, 'find')
+    def test_missing_file_raises_error(self, mock_find):
+        mock_find.return_value = None
+
+        with self.assertRaises(IOError):
+            resources_utils.get_xslt('missing.xsl')
@@ -5,9 +5,10 @@
 from unittest.case import TestCase
 from os.path import join, dirname, abspath
 from core_composer_app.utils.xml import _insert_element_type, check_type_core_support, \
-    COMPLEX_TYPE, SIMPLE_TYPE
+    COMPLEX_TYPE, SIMPLE_TYPE, find_element, get_element_xpath, get_type_metadata
 from core_main_app.commons.exceptions import CoreError
 from core_main_app.utils.xml import validate_xml_schema
+from xml_utils.xsd_tree.xsd_tree import XSDTree
 
 RESOURCES_PATH = join(dirname(abspath(__file__)), 'data')
 
@@ -177,4 +178,70 @@ class TestTypeDefinition(TestCase):
 
         type_content = check_type_core_support(type_content)
 
-        self.assertEqual(type_content, COMPLEX_TYPE)
\ No newline at end of file
+        self.assertEqual(type_content, COMPLEX_TYPE)
+
+
+class TestTypeMetadata(TestCase):
+    def test_complex_type_metadata(self):
+        type_filename = 'type_complex.xsd'
+        # load test resources
+        with open(join(RESOURCES_PATH, type_filename), 'r') as type_file:
+            type_content = type_file.read()
+
+        metadata = get_type_metadata(type_content)
+
+        self.assertEqual(metadata['root_type_name'], 'new')
+        self.assertEqual(metadata['type_definition'], COMPLEX_TYPE)
+        self.assertIsNone(metadata['target_namespace'])
+        self.assertEqual(metadata['schema_locations'], [])
+        self.assertEqual(metadata['element_count'], 0)
+
+    def test_type_with_target_namespace_metadata(self):
+        type_filename = 'type_target_ns_prefix.xsd'
+        # load test resources
+        with open(join(RESOURCES_PATH, type_filename), 'r') as type_file:
+            type_content = type_file.read()
+
+        metadata = get_type_metadata(type_content)
+
+        self.assertEqual(metadata['root_type_name'], 'new')
+        self.assertEqual(metadata['type_definition'], SIMPLE_TYPE)
+        self.assertEqual(metadata['target_namespace'], 'inc-namespace')
+        self.assertEqual(metadata['target_namespace_prefix'], 'incns')
+
+    def test_type_with_include_and_elements_metadata(self):
+        type_content = "<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>" \
+                       "<xs:include schemaLocation='inc.xsd'/>" \
+                       "<xs:complexType name='new'><xs:sequence>" \
+                       "<xs:element name='a' type='xs:string'/><xs:element name='b' type='xs:string'/>" \
+                       "</xs:sequence></xs:complexType></xs:schema>"
+
+        metadata = get_type_metadata(type_content)
+
+        self.assertEqual(metadata['schema_locations'], ['inc.xsd'])
+        self.assertEqual(metadata['element_count'], 2)
+
+    def test_unsupported_type_raises_core_error(self):
+        with self.assertRaises(CoreError):
+            get_type_metadata("<schema xmlns='http://www.w3.org/2001/XMLSchema'></schema>")
+
+
+class TestElementXPath(TestCase):
+    def setUp(self):
+        self.xsd_tree = XSDTree.build_tree("<xs:schema xmlns:xs='http://www.w3.org/2001/XMLSchema'>"
+                                           "<xs:element name='root'><xs:complexType><xs:sequence>"
+                                           "<xs:element name='first' type='xs:string'/>"
+                                           "<xs:element name='second' type='xs:string'/>"
+                                           "</xs:sequence></xs:complexType></xs:element></xs:schema>")
+
+    def test_xpath_of_first_element_has_no_index(self):
+        element = self.xsd_tree.getroot()[0][0][0][0]
+        self.assertEqual(get_element_xpath(element), 'xs:element/xs:complexType/xs:sequence/xs:element')
+
+    def test_xpath_of_following_element_has_index(self):
+        element = self.xsd_tree.getroot()[0][0][0][1]
+        self.assertEqual(get_element_xpath(element), 'xs:element/xs:complexType/xs:sequence/xs:element[2]')
+
+    def test_find_element_returns_element_at_xpath(self):
+        element = self.xsd_tree.getroot()[0][0][0][1]
+        self.assertEqual(find_element(self.xsd_tree, get_element_xpath(element)), element)